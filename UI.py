@@ -1,26 +1,91 @@
 from PyQt6.QtGui import QPixmap, QKeyEvent
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QComboBox,
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QComboBox, QFileDialog, QHeaderView, QTableView,
                             QLineEdit, QLabel, QGridLayout, QWidget, QTextEdit, QPushButton, QFrame, QVBoxLayout)
-from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QTimer, QObject, QThread
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
 # Import circuit simulation modules
 from circuit import Circuit
+from case_import import import_case
 from jacobian import Jacobian
 from powerflow import PowerFlow
 from solution import Solution
 from load import Load
 from solution_symmetric import Solution_Faults
+from results_model import ResultsTableModel, ResultsFilterProxyModel
 import numpy as np
 import logging
+import re
+import threading
 
 WIDTH = 200
 INPUT_HEIGHT = 50
 
 OUTPUT_HEIGHT = 100
 
+# Filter keys mapped to (proxy attribute, column) of the result tables
+FILTER_COLUMNS = {
+    'v': ('voltage_proxy', 1),
+    'voltage': ('voltage_proxy', 1),
+    'loading': ('branch_proxy', 3),
+    'fault': ('fault_proxy', 1),
+    'current': ('fault_proxy', 1)
+}
+
+def calc_fault_display(circuit):
+    """
+    Fault results shown in the fault panel
+
+    Only the fault currents are swept over every bus; post-fault voltages are
+    solved for a fault at the first bus, so memory stays O(N).
+
+    Returns:
+        fault_currents: Complex array (N,) of fault currents in per unit
+        fault_voltages: Complex array (N,) of bus voltages during a fault at the first bus
+    """
+    faults = Solution_Faults(circuit)
+    fault_currents, _ = faults.calculate_fault_currents_all(voltages=False)
+    _, fault_voltages = faults.calculate_fault_currents_all([next(iter(circuit.buses))])
+    return fault_currents, fault_voltages[0]
+
+class SimulationWorker(QObject):
+    """Runs the Y-bus, power flow and fault calculations off the GUI thread"""
+    iteration = pyqtSignal(int, float)
+    finished = pyqtSignal(dict, object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, circuit):
+        super().__init__()
+        self.circuit = circuit
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            logging.debug("Calculating Y-bus matrix...")
+            self.circuit.calc_ybus()
+
+            logging.debug("Initializing powerflow solver...")
+            powerflow = PowerFlow(self.circuit, progress_callback=self.iteration.emit, cancel_event=self.cancel_event)
+            results = powerflow.solve_circuit(self.circuit)
+        except Exception as e:
+            self.failed.emit(e)
+            return
+
+        # Fault errors are shown in the fault panel only, so they are passed on instead of raised
+        faults = None
+        if not results["cancelled"]:
+            try:
+                faults = calc_fault_display(self.circuit)
+            except Exception as e:
+                faults = e
+        self.finished.emit(results, faults)
+
+    def cancel(self):
+        # Called from the GUI thread; the solver checks the event between iterations
+        self.cancel_event.set()
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -165,61 +230,57 @@ class MainWindow(QMainWindow):
         self.clear_button.setFixedWidth(WIDTH)
         self.clear_button.setFixedHeight(INPUT_HEIGHT)
 
-        self.output1 = QTextEdit(central_widget)
-        self.output1.setStyleSheet("""
-            QTextEdit {
+        # Import case file button
+        self.import_button = QPushButton('Import Case')
+        self.import_button.setStyleSheet("""
+            QPushButton {
                 background-color: #ededed;
                 border-style: solid;
                 border-color: black;
                 border-width: 2px;
+                border-radius: 5px;
                 color: black;
             }
-        """)
-        self.output1.setFixedWidth(WIDTH)
-        self.output1.setFixedHeight(OUTPUT_HEIGHT)
-        self.output1.setPlaceholderText("Circuit Elements")
-
-        self.output2 = QTextEdit(central_widget)
-        self.output2.setStyleSheet("""
-            QTextEdit {
-                background-color: #ededed;
-                border-style: solid;
-                border-color: black;
-                border-width: 2px;
-                color: black;
+            QPushButton:focus {
+                border: 2px solid blue;
             }
         """)
-        self.output2.setFixedWidth(WIDTH)
-        self.output2.setFixedHeight(OUTPUT_HEIGHT)
-        self.output2.setPlaceholderText("Bus Voltages")
+        self.import_button.clicked.connect(lambda: self.import_case_file())
+        self.import_button.setFixedWidth(WIDTH)
+        self.import_button.setFixedHeight(INPUT_HEIGHT)
 
-        self.output3 = QTextEdit(central_widget)
-        self.output3.setStyleSheet("""
-            QTextEdit {
+        # Cancel running simulation button
+        self.cancel_button = QPushButton('Cancel')
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
                 background-color: #ededed;
                 border-style: solid;
                 border-color: black;
                 border-width: 2px;
+                border-radius: 5px;
                 color: black;
             }
-        """)
-        self.output3.setFixedWidth(WIDTH)
-        self.output3.setFixedHeight(OUTPUT_HEIGHT)
-        self.output3.setPlaceholderText("Power Injections")
-
-        self.output4 = QTextEdit(central_widget)
-        self.output4.setStyleSheet("""
-            QTextEdit {
-                background-color: #ededed;
-                border-style: solid;
-                border-color: black;
-                border-width: 2px;
-                color: black;
+            QPushButton:focus {
+                border: 2px solid blue;
             }
         """)
-        self.output4.setFixedWidth(WIDTH)
-        self.output4.setFixedHeight(OUTPUT_HEIGHT)
-        self.output4.setPlaceholderText("Mismatch")
+        self.cancel_button.clicked.connect(self.cancel_simulation)
+        self.cancel_button.setFixedWidth(WIDTH)
+        self.cancel_button.setFixedHeight(INPUT_HEIGHT)
+        self.cancel_button.setEnabled(False)
+
+        # Result tables: models hold the arrays, proxies sort and filter without recomputing
+        self.elements_model = ResultsTableModel(["Type", "Element"])
+        self.voltage_model = ResultsTableModel(["Bus", "V (pu)", "Angle (deg)"], [None, ".4f", ".2f"])
+        self.injection_model = ResultsTableModel(["Bus", "P (pu)", "Q (pu)"], [None, ".4f", ".4f"])
+        self.branch_model = ResultsTableModel(["Branch", "From", "To", "Loading (%)", "S (MVA)"],
+                                              [None, None, None, ".1f", ".2f"])
+        self.fault_model = ResultsTableModel(["Bus", "Fault I (pu)", "V (pu)"], [None, ".4f", ".4f"])
+
+        self.output1 = self._create_table(central_widget, self.elements_model, "Circuit Elements")
+        self.output2 = self._create_table(central_widget, self.voltage_model, "Bus Voltages")
+        self.output3 = self._create_table(central_widget, self.injection_model, "Power Injections")
+        self.output4 = self._create_table(central_widget, self.branch_model, "Branch Loading")
 
         self.output5 = QTextEdit(central_widget)
         self.output5.setStyleSheet("""
@@ -235,19 +296,34 @@ class MainWindow(QMainWindow):
         self.output5.setFixedHeight(OUTPUT_HEIGHT)
         self.output5.setPlaceholderText("Iterations")
 
-        self.output6 = QTextEdit(central_widget)
-        self.output6.setStyleSheet("""
-            QTextEdit {
+        self.output6 = self._create_table(central_widget, self.fault_model, "Fault Analysis")
+
+        self.elements_proxy = self.output1.model()
+        self.elements_proxy.setFilterKeyColumn(-1)  # Element names are in the second column
+        self.voltage_proxy = self.output2.model()
+        self.injection_proxy = self.output3.model()
+        self.branch_proxy = self.output4.model()
+        self.fault_proxy = self.output6.model()
+
+        # Filter for the result tables, e.g. "v < 0.95", "loading > 100", "fault > 5" or a name
+        self.filter_field = QLineEdit(central_widget)
+        self.filter_field.setStyleSheet("""
+            QLineEdit {
                 background-color: #ededed;
                 border-style: solid;
                 border-color: black;
                 border-width: 2px;
+                border-radius: 5px;
                 color: black;
             }
+            QLineEdit:focus {
+                border: 2px solid blue;
+            }
         """)
-        self.output6.setFixedWidth(WIDTH)
-        self.output6.setFixedHeight(OUTPUT_HEIGHT)
-        self.output6.setPlaceholderText("Fault Analysis")
+        self.filter_field.setFixedWidth(WIDTH)
+        self.filter_field.setFixedHeight(INPUT_HEIGHT)
+        self.filter_field.setPlaceholderText("Filter: v < 0.95, loading > 100")
+        self.filter_field.textChanged.connect(self.apply_filter)
 
         self.figure_frame = QFrame(central_widget)
         self.figure_frame.setFrameShape(QFrame.Shape.Box)
@@ -282,6 +358,9 @@ class MainWindow(QMainWindow):
         grid.addWidget(self.run_button, 3, 1)
         grid.addWidget(self.clear_button, 3, 2)
         grid.addWidget(self.status_label, 4, 0)
+        grid.addWidget(self.cancel_button, 4, 1)
+        grid.addWidget(self.filter_field, 4, 2)
+        grid.addWidget(self.import_button, 5, 0)
 
         # Output textbox fields
         grid.addWidget(self.output1, 0, 3)
@@ -294,19 +373,9 @@ class MainWindow(QMainWindow):
         # Graph output 
         grid.addWidget(self.figure_frame, 2, 3, 4, 3)
 
-        # First, set all output text boxes to read-only and disable focus
-        self.output1.setReadOnly(True)
-        self.output1.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.output2.setReadOnly(True)
-        self.output2.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.output3.setReadOnly(True)
-        self.output3.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.output4.setReadOnly(True)
-        self.output4.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        # First, set the output text box to read-only and disable focus
         self.output5.setReadOnly(True)
         self.output5.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-        self.output6.setReadOnly(True)
-        self.output6.setFocusPolicy(Qt.FocusPolicy.NoFocus)
 
         # Set explicit tab order for focusable elements
         self.combo_box.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
@@ -321,7 +390,8 @@ class MainWindow(QMainWindow):
         self.setTabOrder(self.text_value, self.add_button)
         self.setTabOrder(self.add_button, self.run_button)
         self.setTabOrder(self.run_button, self.clear_button)
-        self.setTabOrder(self.clear_button, self.combo_box) # Cycle back to start
+        self.setTabOrder(self.clear_button, self.filter_field)
+        self.setTabOrder(self.filter_field, self.combo_box) # Cycle back to start
         
         # Initialize additional component fields
         self.additional_fields = {}
@@ -342,6 +412,72 @@ class MainWindow(QMainWindow):
         # Update circuit elements display
         self.update_circuit_elements_display()
 
+        # Background solver thread and worker while a simulation runs
+        self.solver_thread = None
+        self.worker = None
+
+    def _create_table(self, parent, model, title):
+        """Read-only sortable table view over model through a filter proxy (table.model())"""
+        proxy = ResultsFilterProxyModel(self)
+        proxy.setSourceModel(model)
+
+        table = QTableView(parent)
+        table.setStyleSheet("""
+            QTableView {
+                background-color: #ededed;
+                border-style: solid;
+                border-color: black;
+                border-width: 2px;
+                color: black;
+            }
+        """)
+        table.setModel(proxy)
+        table.setSortingEnabled(True)
+        table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)  # Keep the circuit order until a header is clicked
+        table.verticalHeader().setVisible(False)
+        # Interactive sizing never measures the contents of every row
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setToolTip(title)
+        table.setFixedWidth(WIDTH)
+        table.setFixedHeight(OUTPUT_HEIGHT)
+        table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        return table
+
+    def apply_filter(self, text):
+        """
+        Filter the result tables from comma separated terms: "<key> <op> <number>"
+        with key v/voltage, loading or fault/current and op <, <=, > or >=;
+        any other term filters every table by name
+        """
+        proxies = [self.elements_proxy, self.voltage_proxy, self.injection_proxy, self.branch_proxy, self.fault_proxy]
+        for proxy in proxies:
+            proxy.clear_ranges()
+
+        names = []
+        for term in filter(None, (term.strip() for term in text.split(','))):
+            match = re.fullmatch(r'(\w+)\s*(<=|>=|<|>)\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)', term)
+            if match and match.group(1).lower() in FILTER_COLUMNS:
+                key, op, number = match.group(1).lower(), match.group(2), float(match.group(3))
+                proxy_name, column = FILTER_COLUMNS[key]
+                low, high = getattr(self, proxy_name).ranges.get(column, (-np.inf, np.inf))
+                if op.startswith('<'):
+                    high = min(high, number)
+                else:
+                    low = max(low, number)
+                getattr(self, proxy_name).set_range(column, low, high)
+            else:
+                names.append(term)
+
+        for proxy in proxies:
+            proxy.setFilterFixedString(" ".join(names))
+
+    def panel_text(self, panel):
+        """Plain text of an output panel (all rows of a result table)"""
+        if isinstance(panel, QTableView):
+            return panel.model().sourceModel().to_text()
+        return panel.toPlainText()
+
     def update_value_field_placeholder(self):
         """Update the placeholder text based on the selected component type"""
         component_type = self.combo_box.currentText()
@@ -492,48 +628,129 @@ class MainWindow(QMainWindow):
             self.status_label.setText(f"Error: {str(e)}")
             print(f"Error adding {selected_option}: {str(e)}")
 
+    def import_case_file(self, path=None):
+        """
+        Replace the circuit with a case read from a file
+
+        Parameters:
+            path: MATPOWER (.m), IEEE common data format or CSV case (bus.csv of a
+                  case directory); asks with a file dialog when not given
+        """
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Import Case", "",
+                                                  "Case Files (*.m *.cdf *.txt *.csv);;All Files (*)")
+            if not path:
+                return
+
+        try:
+            self.circuit = import_case(path)
+        except Exception as e:
+            self.status_label.setText(f"Import error: {str(e)}")
+            print(f"Error importing {path}: {str(e)}")
+            return
+
+        bus_names = list(self.circuit.buses.keys())
+        branches = self.circuit.branches
+        self.circuit_elements = {key: [] for key in self.circuit_elements}
+        self.circuit_elements['Bus'] = [f"{name} ({bus.base_kv} kV, {bus.bus_type})"
+                                        for name, bus in self.circuit.buses.items()]
+        for name, from_index, to_index, transformer in zip(branches.names, branches.from_index, branches.to_index,
+                                                           branches.is_transformer):
+            category = 'Transformer' if transformer else 'Transmission Line'
+            self.circuit_elements[category].append(f"{name} ({bus_names[from_index]}-{bus_names[to_index]})")
+        self.circuit_elements['Load'] = [f"{name} ({load.bus.name}, {load.real_power}MW, {load.reactive_power}MVAR)"
+                                         for name, load in self.circuit.loads.items()]
+        self.circuit_elements['Generator'] = [f"{name} ({generator.bus.name}, {generator.mw_setpoint}MW)"
+                                              for name, generator in self.circuit.generators.items()]
+        self.update_circuit_elements_display()
+
+        self.status_label.setText(f"Imported {self.circuit.name}: {len(bus_names)} buses, {len(branches)} branches")
+
     def update_circuit_elements_display(self):
         """Update the display of circuit elements in output1"""
-        elements_text = "Circuit Elements:\n\n"
-        
-        for category, items in self.circuit_elements.items():
-            if items:
-                elements_text += f"{category}:\n"
-                for item in items:
-                    elements_text += f"  - {item}\n"
-                elements_text += "\n"
-        
-        self.output1.setText(elements_text)
+        categories = [category for category, items in self.circuit_elements.items() for _ in items]
+        elements = [item for items in self.circuit_elements.values() for item in items]
+        self.elements_model.set_columns(categories, elements)
 
     def run_simulation(self):
+        if self.solver_thread is not None:
+            return
         try:
-            self.status_label.setText("Running simulation...")
             self._validate_circuit()
-            self._setup_simulation()
-            results = self._execute_powerflow()
-            self._update_results(results)
-            self._plot_results(results)
-            self.status_label.setText("Simulation completed successfully")
         except Exception as e:
             self._handle_error(e)
+            return
+
+        self.status_label.setText("Running simulation...")
+        self.output5.setText("Convergence History:\n\n")
+        self._set_running(True)
+
+        # The worker lives in its own thread; its signals are queued back to the GUI thread
+        self.solver_thread = QThread()
+        self.worker = SimulationWorker(self.circuit)
+        self.worker.moveToThread(self.solver_thread)
+        self.solver_thread.started.connect(self.worker.run)
+        self.worker.iteration.connect(self._show_iteration)
+        self.worker.finished.connect(self._simulation_finished)
+        self.worker.failed.connect(self._handle_error)
+        # quit() is thread safe and must not wait for a (possibly blocked) GUI event loop
+        self.worker.finished.connect(self.solver_thread.quit, Qt.ConnectionType.DirectConnection)
+        self.worker.failed.connect(self.solver_thread.quit, Qt.ConnectionType.DirectConnection)
+        self.solver_thread.finished.connect(self._simulation_stopped)
+        self.solver_thread.start()
+
+    def cancel_simulation(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.status_label.setText("Cancelling simulation...")
+
+    def wait_for_simulation(self):
+        """Block until the solver thread exits, then deliver its queued signals"""
+        if self.solver_thread is not None:
+            self.solver_thread.wait()
+            QApplication.processEvents()
+
+    def closeEvent(self, event):
+        self.cancel_simulation()
+        self.wait_for_simulation()
+        super().closeEvent(event)
 
     def _validate_circuit(self):
         if not self.circuit.buses:
             raise ValueError("No buses in the circuit. Add at least one bus before running the simulation.")
 
-    def _setup_simulation(self):
-        logging.debug("Calculating Y-bus matrix...")
-        self.circuit.calc_ybus()
+    def _set_running(self, running):
+        self.run_button.setEnabled(not running)
+        self.add_button.setEnabled(not running)
+        self.clear_button.setEnabled(not running)
+        self.import_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def _show_iteration(self, iteration, mismatch):
+        self.output5.append(f"Iter {iteration}: Mismatch = {mismatch:.6f}")
+
+    def _simulation_finished(self, results, faults):
+        self._update_results(results, faults)
+        self._plot_results(results)
+        if results["cancelled"]:
+            self.status_label.setText("Simulation cancelled")
+        else:
+            self.status_label.setText("Simulation completed successfully")
 
-    def _execute_powerflow(self):
-        logging.debug("Initializing powerflow solver...")
-        powerflow = PowerFlow(self.circuit)
-        return powerflow.solve_circuit(self.circuit)
+    def _simulation_stopped(self):
+        self.solver_thread.deleteLater()
+        self.worker.deleteLater()
+        self.solver_thread = None
+        self.worker = None
+        self._set_running(False)
 
-    def _update_results(self, results):
+    def _update_results(self, results, faults=None):
         self.update_simulation_results(results)
-        if self.circuit.buses:
-            self.run_fault_analysis()
+        if results.get("cancelled"):
+            self.fault_model.clear()
+            self.output5.append("\nFault analysis skipped: simulation cancelled")
+        elif self.circuit.buses:
+            self.run_fault_analysis(faults)
 
     def _plot_results(self, results):
         self.figure.clear()
@@ -584,38 +801,28 @@ class MainWindow(QMainWindow):
 
     def _handle_error(self, e):
         self.status_label.setText(f"Simulation error: {str(e)}")
-        logging.error(f"Error running simulation: {str(e)}", exc_info=True)
+        logging.error(f"Error running simulation: {str(e)}", exc_info=e)
 
     def update_simulation_results(self, results):
-        """Update the output text fields with simulation results"""
+        """Update the output panels with simulation results"""
+        bus_names = list(self.circuit.buses.keys())
+
         # Output 2: Bus Voltages
-        voltage_text = "Bus Voltages:\n\n"
-        for i, (bus_name, bus) in enumerate(self.circuit.buses.items()):
-            if i < len(results['v_mag']) and i < len(results['v_ang']):
-                v_mag = results['v_mag'][i]
-                v_ang_deg = np.degrees(results['v_ang'][i])
-                voltage_text += f"{bus_name}: {v_mag:.4f} ∠{v_ang_deg:.2f}°\n"
-        self.output2.setText(voltage_text)
-        
+        self.voltage_model.set_columns(bus_names, results['v_mag'], np.degrees(results['v_ang']))
+
         # Output 3: Power Injections
-        power_text = "Power Injections:\n\n"
-        if 'p_calc' in results and 'q_calc' in results:
-            for i, (bus_name, bus) in enumerate(self.circuit.buses.items()):
-                if i < len(results['p_calc']) and i < len(results['q_calc']):
-                    p = results['p_calc'][i]
-                    q = results['q_calc'][i]
-                    power_text += f"{bus_name}: P = {p:.4f} p.u., Q = {q:.4f} p.u.\n"
-        self.output3.setText(power_text)
-        
-        # Output 4: Mismatch
-        mismatch_text = "Final Mismatch:\n\n"
-        mismatch_text += f"Maximum Mismatch: {results['final_mismatch']:.6f}\n"
-        self.output4.setText(mismatch_text)
-        
-        # Output 5: Iterations
+        self.injection_model.set_columns(bus_names, results['p_calc'], results['q_calc'])
+
+        # Output 4: Branch Loading
+        flows = results['branch_flows']
+        self.branch_model.set_columns(flows['branch'], flows['from_bus'], flows['to_bus'], flows['loading'],
+                                      flows['s_max'])
+
+        # Output 5: Iterations and final mismatch
         iteration_text = "Convergence History:\n\n"
         iteration_text += f"Converged: {results['converged']}\n"
-        iteration_text += f"Iterations: {results['iterations']}\n\n"
+        iteration_text += f"Iterations: {results['iterations']}\n"
+        iteration_text += f"Maximum Mismatch: {results['final_mismatch']:.6f}\n\n"
         if len(results['mismatch_history']) > 0:
             for i, mismatch in enumerate(results['mismatch_history']):
                 iteration_text += f"Iter {i+1}: Mismatch = {mismatch:.6f}\n"
@@ -623,33 +830,29 @@ class MainWindow(QMainWindow):
             iteration_text += "No iterations performed\n"
         self.output5.setText(iteration_text)
 
-    def run_fault_analysis(self):
-        """Run fault analysis and display results"""
+    def run_fault_analysis(self, faults=None):
+        """
+        Run fault analysis and display results
+
+        Parameters:
+            faults: Optional calc_fault_display result already computed by the
+                    solver worker, or the exception it raised
+        """
         try:
-            fault_text = "Fault Analysis:\n\n"
-            
-            # Select first bus as example fault location
+            # Fault currents at every bus and the voltages for a fault at the first bus
+            if faults is None:
+                faults = calc_fault_display(self.circuit)
+            if isinstance(faults, Exception):
+                raise faults
+            fault_currents, fault_voltages = faults
+
             fault_bus_name = next(iter(self.circuit.buses))
-            fault_bus = self.circuit.buses[fault_bus_name]
-            
-            # Run fault analysis
-            faults = Solution_Faults(self.circuit)
-            fault_results = faults.calculate_fault_currents_2(fault_bus)
-            
-            # Display results
-            fault_text += f"Fault at {fault_bus_name}:\n"
-            fault_text += f"Fault Current: {abs(fault_results[0]):.4f} pu\n\n"
-            
-            # Show voltage drops at each bus during fault
-            fault_text += "Bus Voltages During Fault:\n"
-            for i, (bus_name, bus) in enumerate(self.circuit.buses.items()):
-                if i < len(fault_results[1]):
-                    fault_text += f"{bus_name}: {abs(fault_results[1][i]):.4f} pu\n"
-                    
-            self.output6.setText(fault_text)
-            
+            self.fault_model.set_columns(list(self.circuit.buses), np.abs(fault_currents), np.abs(fault_voltages),
+                                         headers=["Bus", "Fault I (pu)", f"V, {fault_bus_name} fault (pu)"])
+
         except Exception as e:
-            self.output6.setText(f"Fault analysis error: {str(e)}")
+            self.fault_model.clear()
+            self.output5.append(f"\nFault analysis error: {str(e)}")
             print(f"Error running fault analysis: {str(e)}")
 
     def remove_objects(self):
@@ -663,13 +866,10 @@ class MainWindow(QMainWindow):
         # Update the display
         self.update_circuit_elements_display()
         
-        # Clear output text boxes
-        self.output1.setText("Circuit Elements:")
-        self.output2.setText("")
-        self.output3.setText("")
-        self.output4.setText("")
+        # Clear output panels
+        for model in (self.voltage_model, self.injection_model, self.branch_model, self.fault_model):
+            model.clear()
         self.output5.setText("")
-        self.output6.setText("")
         
         # Clear the graph
         self.figure.clear()
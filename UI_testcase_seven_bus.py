@@ -98,27 +98,27 @@ def main():
         
         # Extract text from each output box
         f.write("OUTPUT 1 (Circuit Elements):\n")
-        f.write(window.output1.toPlainText())
+        f.write(window.panel_text(window.output1))
         f.write("\n\n")
         
         f.write("OUTPUT 2 (Bus Voltages):\n")
-        f.write(window.output2.toPlainText())
+        f.write(window.panel_text(window.output2))
         f.write("\n\n")
         
         f.write("OUTPUT 3 (Power Injections):\n")
-        f.write(window.output3.toPlainText())
+        f.write(window.panel_text(window.output3))
         f.write("\n\n")
         
-        f.write("OUTPUT 4 (Mismatch):\n")
-        f.write(window.output4.toPlainText())
+        f.write("OUTPUT 4 (Branch Loading):\n")
+        f.write(window.panel_text(window.output4))
         f.write("\n\n")
         
         f.write("OUTPUT 5 (Iterations):\n")
-        f.write(window.output5.toPlainText())
+        f.write(window.panel_text(window.output5))
         f.write("\n\n")
         
         f.write("OUTPUT 6 (Fault Analysis):\n")
-        f.write(window.output6.toPlainText())
+        f.write(window.panel_text(window.output6))
         f.write("\n\n")
         
     # Keep the application running
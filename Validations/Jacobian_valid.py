@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+
+# Import classes
+from circuit import Circuit
+from jacobian import Jacobian
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = Circuit("Test Circuit")
+        self.circuit.add_bus("Bus1", 230)
+        self.circuit.add_bus("Bus2", 230)
+        self.circuit.add_bus("Bus3", 230)
+        self.circuit.add_bus("Bus4", 230)
+        self.circuit.buses["Bus1"].bus_type = 'Slack Bus'
+        self.circuit.buses["Bus2"].bus_type = 'PQ Bus'
+        self.circuit.buses["Bus3"].bus_type = 'PV Bus'
+        self.circuit.buses["Bus4"].bus_type = 'PQ Bus'
+        self.circuit.add_conductor("C1", 0.642, 0.0217, 0.385, 460)
+        self.circuit.add_bundle("B1", 2, 1.5, "C1")
+        self.circuit.add_geometry("G1", 0, 0, 18.5, 0, 37, 0)
+        self.circuit.add_transmission_line("L1", "Bus1", "Bus2", "B1", "C1", "G1", 10)
+        self.circuit.add_transmission_line("L2", "Bus2", "Bus3", "B1", "C1", "G1", 25)
+        self.circuit.add_transmission_line("L3", "Bus3", "Bus4", "B1", "C1", "G1", 20)
+        self.circuit.add_transmission_line("L4", "Bus4", "Bus1", "B1", "C1", "G1", 15)
+        self.circuit.calc_ybus()
+
+        self.buses = list(self.circuit.buses.values())
+        self.angles = np.radians([0.0, -2.5, 1.0, -3.0])
+        self.voltages = np.array([1.0, 0.97, 1.02, 0.95])
+
+    def test_vectorized_matches_loop(self):
+        output1 = Jacobian(self.circuit, "vectorized").calc_jacobian(self.buses, self.circuit.ybus, self.angles, self.voltages)
+        expected1 = Jacobian(self.circuit, "loop").calc_jacobian(self.buses, self.circuit.ybus, self.angles, self.voltages)
+        np.testing.assert_allclose(output1, expected1, atol=1e-9)
+
+        output2 = output1.shape
+        expected2 = (5, 5)
+        self.assertEqual(output2, expected2)
+
+    def test_loop_index_sets(self):
+        # Bus3 switched to PQ at a reactive limit keeps its 'PV Bus' type; only the index sets change
+        pvpq_index, pq_index = np.array([1, 2, 3]), np.array([1, 2, 3])
+        output1 = Jacobian(self.circuit, "loop").calc_jacobian(self.buses, self.circuit.ybus, self.angles, self.voltages,
+                                                              pvpq_index, pq_index)
+        expected1 = Jacobian(self.circuit, "vectorized").calc_jacobian(self.buses, self.circuit.ybus, self.angles,
+                                                                      self.voltages, pvpq_index, pq_index)
+        np.testing.assert_allclose(output1, expected1, atol=1e-9)
+
+        output2 = output1.shape
+        expected2 = (6, 6)
+        self.assertEqual(output2, expected2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            Jacobian(self.circuit, "symbolic")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,261 @@
+import threading
+import unittest
+import numpy as np
+
+# Import classes
+from seven_bus_case import seven_bus_circuit
+from powerflow import PowerFlow
+from batch_powerflow import BatchPowerFlow
+from continuation import ContinuationPowerFlow
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.circuit.calc_ybus()
+
+    def test_newton_converges(self):
+        results = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8)
+
+        output1 = results["converged"]
+        expected1 = True
+        self.assertEqual(output1, expected1)
+
+        output2 = np.round(results["v_mag"], 4)
+        expected2 = np.array([1.0, 0.9369, 0.9205, 0.9298, 0.9267, 0.9397, 1.0])
+        np.testing.assert_allclose(output2, expected2, atol=1e-4)
+
+    def test_sparse_matches_dense(self):
+        dense = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8)
+        sparse = PowerFlow(self.circuit, sparse_threshold=0).solve_circuit(self.circuit, tol=1e-8)
+
+        np.testing.assert_allclose(sparse["v_mag"], dense["v_mag"], atol=1e-10)
+        np.testing.assert_allclose(sparse["v_ang"], dense["v_ang"], atol=1e-10)
+
+        output1 = [stats["method"] for stats in sparse["factorization_stats"]]
+        expected1 = ["sparse_lu"] * len(sparse["factorization_stats"])
+        self.assertEqual(output1, expected1)
+
+    def test_fast_decoupled_matches_newton(self):
+        newton = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8)
+        for method in ["fdxb", "fdbx"]:
+            progress = []
+            results = PowerFlow(self.circuit, progress_callback=lambda i, m: progress.append(m)).solve_circuit(
+                self.circuit, tol=1e-8, method=method, initializer="flat")
+
+            output1 = results["converged"]
+            expected1 = True
+            self.assertEqual(output1, expected1)
+
+            output2 = sorted(results.keys())
+            expected2 = sorted(newton.keys())
+            self.assertEqual(output2, expected2)
+
+            np.testing.assert_allclose(results["v_mag"], newton["v_mag"], atol=1e-6)
+            np.testing.assert_allclose(results["v_ang"], newton["v_ang"], atol=1e-6)
+
+            # One history entry, step length and progress report per iteration, as for Newton
+            output3 = (len(results["mismatch_history"]), len(results["step_lengths"]), len(progress))
+            expected3 = (results["iterations"],) * 3
+            self.assertEqual(output3, expected3)
+            self.assertEqual(progress, results["mismatch_history"])
+
+    def test_fast_decoupled_shunts(self):
+        # A 50 MVAr capacitor at Bus4 (0.5 pu) belongs in B'' as in the Y-bus
+        self.circuit.add_shunt("Bus4", 0, 50)
+        self.circuit.calc_ybus()
+        b_double_prime = PowerFlow(self.circuit).calc_b_matrices(self.circuit, "fdxb")[1]
+        np.testing.assert_allclose(b_double_prime.toarray(), -self.circuit.ybus.toarray().imag, atol=1e-12)
+
+        newton = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, initializer="flat")
+        fast = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, method="fdxb", initializer="flat")
+        np.testing.assert_allclose(fast["v_mag"], newton["v_mag"], atol=1e-6)
+
+    def test_initializers(self):
+        powerflow = PowerFlow(self.circuit)
+        flat = powerflow.solve_circuit(self.circuit, tol=1e-8, initializer="flat")
+        dc = powerflow.solve_circuit(self.circuit, tol=1e-8, initializer="dc")
+        warm = powerflow.solve_circuit(self.circuit, tol=1e-8)
+
+        np.testing.assert_allclose(dc["v_mag"], flat["v_mag"], atol=1e-8)
+
+        output1 = warm["iterations"]
+        expected1 = 1
+        self.assertEqual(output1, expected1)
+
+        output2 = powerflow.solve_circuit(self.circuit, tol=1e-8, initializer=(flat["v_ang"], flat["v_mag"]))["iterations"]
+        expected2 = 1
+        self.assertEqual(output2, expected2)
+
+        with self.assertRaises(ValueError):
+            powerflow.solve_circuit(self.circuit, initializer=(np.zeros(3), np.ones(3)))
+
+    def test_batch_matches_single(self):
+        p_base = np.array([bus.real_power for bus in self.circuit.buses.values()])
+        q_base = np.array([bus.reactive_power for bus in self.circuit.buses.values()])
+        scale = np.array([[1.0], [0.8]])
+
+        results = BatchPowerFlow(self.circuit).solve(p_base * scale, q_base * scale, tol=1e-8, initializer="flat")
+        single = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, initializer="flat")
+
+        output1 = results["converged"].tolist()
+        expected1 = [True, True]
+        self.assertEqual(output1, expected1)
+
+        output2 = results["v_mag"].shape
+        expected2 = (2, 7)
+        self.assertEqual(output2, expected2)
+
+        np.testing.assert_allclose(results["v_mag"][0], single["v_mag"], atol=1e-10)
+        self.assertTrue(np.all(results["v_mag"][1] >= results["v_mag"][0] - 1e-12))
+
+    def test_q_limits(self):
+        self.circuit.generators["G7"].q_max = 80
+        dense = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, initializer="flat", enforce_q_limits=True)
+        sparse = PowerFlow(self.circuit, sparse_threshold=0).solve_circuit(self.circuit, tol=1e-8, initializer="flat",
+                                                                            enforce_q_limits=True)
+
+        output1 = dense["switched_buses"]
+        expected1 = {"Bus7": 80}
+        self.assertEqual(output1, expected1)
+
+        output2 = dense["q_calc"][6] * 100
+        expected2 = 80
+        self.assertAlmostEqual(output2, expected2, places=4)
+
+        np.testing.assert_allclose(sparse["v_mag"], dense["v_mag"], atol=1e-8)
+
+        output3 = {stats["ordering"] for stats in sparse["factorization_stats"][1:]}
+        expected3 = {"reused"}
+        self.assertEqual(output3, expected3)
+
+        # The element-by-element Jacobian follows the switched PQ set as well
+        powerflow = PowerFlow(self.circuit)
+        powerflow.jacobian.mode = "loop"
+        loop = powerflow.solve_circuit(self.circuit, tol=1e-8, initializer="flat", enforce_q_limits=True)
+
+        output4 = loop["switched_buses"]
+        expected4 = {"Bus7": 80}
+        self.assertEqual(output4, expected4)
+
+        np.testing.assert_allclose(loop["v_mag"], dense["v_mag"], atol=1e-8)
+
+    def test_q_limits_without_generator(self):
+        # A PV bus without a generator has no reactive limits and stays PV
+        self.circuit.buses["Bus4"].bus_type = 'PV Bus'
+        self.circuit.buses["Bus4"].vpu = 1.0
+        q_min, q_max = PowerFlow(self.circuit).calc_q_limits(self.circuit)
+
+        output1 = (q_min[3], q_max[3])
+        expected1 = (-np.inf, np.inf)
+        self.assertEqual(output1, expected1)
+
+        results = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, initializer="flat", enforce_q_limits=True)
+
+        output2 = results["switched_buses"]
+        expected2 = {}
+        self.assertEqual(output2, expected2)
+
+        output3 = results["v_mag"][3]
+        expected3 = 1.0
+        self.assertAlmostEqual(output3, expected3, places=8)
+
+    def test_jacobian_reuse(self):
+        honest = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, initializer="flat")
+        dishonest = PowerFlow(self.circuit, jacobian_reuse=True).solve_circuit(self.circuit, tol=1e-8, initializer="flat")
+
+        output1 = dishonest["converged"]
+        expected1 = True
+        self.assertEqual(output1, expected1)
+
+        np.testing.assert_allclose(dishonest["v_mag"], honest["v_mag"], atol=1e-8)
+
+        self.assertTrue(dishonest["refactorizations_saved"] > 0)
+        self.assertTrue(len(dishonest["factorization_stats"]) < len(honest["factorization_stats"]))
+
+    def test_step_control(self):
+        full = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8, initializer="flat")
+        for step_control in ["backtracking", "iwamoto"]:
+            results = PowerFlow(self.circuit, step_control=step_control).solve_circuit(self.circuit, tol=1e-8,
+                                                                                       initializer="flat")
+            np.testing.assert_allclose(results["v_mag"], full["v_mag"], atol=1e-8)
+            self.assertTrue(results["iterations"] <= full["iterations"])
+
+            output1 = len(results["step_lengths"])
+            expected1 = len(results["mismatch_history"])
+            self.assertEqual(output1, expected1)
+
+        with self.assertRaises(ValueError):
+            PowerFlow(self.circuit, step_control="trust_region")
+
+    def test_continuation(self):
+        trace = ContinuationPowerFlow(self.circuit).trace()
+
+        first = next(trace)
+        output1 = first["lambda"]
+        expected1 = 0.0
+        self.assertEqual(output1, expected1)
+
+        points = [first] + list(trace)
+        lambdas = np.array([point["lambda"] for point in points])
+        min_voltages = np.array([np.min(point["v_mag"]) for point in points])
+
+        # The trace stops just past the nose, where lambda starts to fall
+        self.assertTrue(lambdas[-1] < np.max(lambdas))
+        self.assertTrue(np.all(np.diff(min_voltages) < 0))
+
+        # Weighted growth only scales the listed load
+        points = list(ContinuationPowerFlow(self.circuit, direction={"Load3": 2.0}).trace(max_steps=3))
+        lam = points[-1]["lambda"]
+
+        output1 = points[-1]["load_scale"]
+        expected1 = {"Load3": 1 + 2 * lam, "Load4": 1.0, "Load5": 1.0}
+        self.assertEqual(output1, expected1)
+
+        output2 = points[-1]["total_load"]
+        expected2 = 110 * (1 + 2 * lam) + 100 + 100
+        self.assertAlmostEqual(output2, expected2, places=9)
+
+    def test_branch_flows(self):
+        results = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8)
+        flows = results["branch_flows"]
+
+        output1 = list(flows["branch"])
+        expected1 = ["T1", "T2", "L1", "L2", "L3", "L4", "L5", "L6"]
+        self.assertEqual(output1, expected1)
+
+        # Total branch losses equal the net injection of all buses
+        output2 = results["total_losses"].real
+        expected2 = np.sum(results["p_calc"]) * 100
+        self.assertAlmostEqual(output2, expected2, places=6)
+
+        output3 = list(results["overloads"]["branch"])
+        expected3 = ["T1", "T2"]
+        self.assertEqual(output3, expected3)
+
+    def test_progress_and_cancel(self):
+        progress = []
+        results = PowerFlow(self.circuit, progress_callback=lambda i, m: progress.append((i, m))).solve_circuit(
+            self.circuit, tol=1e-8, initializer="flat")
+
+        output1 = [m for i, m in progress]
+        expected1 = results["mismatch_history"]
+        self.assertEqual(output1, expected1)
+
+        output2 = results["cancelled"]
+        expected2 = False
+        self.assertEqual(output2, expected2)
+
+        # Cancelling after the second iteration stops before the third linear solve
+        cancel_event = threading.Event()
+        stop = lambda i, m: cancel_event.set() if i == 2 else None
+        for method in ["newton", "fdxb"]:
+            cancel_event.clear()
+            results = PowerFlow(self.circuit, progress_callback=stop, cancel_event=cancel_event).solve_circuit(
+                self.circuit, tol=1e-8, method=method, initializer="flat")
+
+            output3 = (results["converged"], results["cancelled"], results["iterations"])
+            expected3 = (False, True, 2)
+            self.assertEqual(output3, expected3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,61 @@
+import unittest
+import numpy as np
+
 from transmissionline import TransmissionLine
 from bus import Bus
 from bundle import Bundle
 from conductor import Conductor
 from geometry import Geometry
+from line_constants import line_constants
+from settings import use_settings
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.bus1 = Bus("Bus_1", 230)
+        self.bus2 = Bus("Bus_2", 230)
+        self.conductor = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+        self.bundle = Bundle("Bundle 1", 2, 1.5, self.conductor)
+        self.geometry = Geometry("Geometry 1", 0, 0, 18.5, 0, 37, 0)
+
+    def test_line_constant_cache(self):
+        line1 = TransmissionLine("Line 1", self.bus1, self.bus2, self.bundle, self.conductor, self.geometry, 10)
+        misses = line_constants.misses
+        line2 = TransmissionLine("Line 2", self.bus1, self.bus2, self.bundle, self.conductor, self.geometry, 20)
+
+        output1 = line_constants.misses
+        expected1 = misses
+        self.assertEqual(output1, expected1)
+
+        output2 = line2.xseries
+        expected2 = 2 * line1.xseries
+        self.assertAlmostEqual(output2, expected2)
+
+        with use_settings(frequency=50):
+            line3 = TransmissionLine("Line 3", self.bus1, self.bus2, self.bundle, self.conductor, self.geometry, 10)
+
+        output3 = line3.xseries
+        expected3 = line1.xseries * 50 / 60
+        self.assertAlmostEqual(output3, expected3)
+
+        # Equal constructions share an entry; a changed conductor gets its own
+        conductor = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+        bundle = Bundle("Bundle 2", 2, 1.5, conductor)
+        misses = line_constants.misses
+        line4 = TransmissionLine("Line 4", self.bus1, self.bus2, bundle, conductor, self.geometry, 10)
+
+        output4 = (line_constants.misses, line4.rseries)
+        expected4 = (misses, line1.rseries)
+        self.assertEqual(output4, expected4)
+
+        conductor.resistance = 0.5
+        line5 = TransmissionLine("Line 5", self.bus1, self.bus2, bundle, conductor, self.geometry, 10)
+
+        output5 = line5.rseries
+        expected5 = line1.rseries * 0.5 / 0.385
+        self.assertAlmostEqual(output5, expected5)
+
+        for key in line_constants.cache:
+            self.assertTrue(all(isinstance(value, (int, float)) for value in key))
 
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+# Import classes
+from case_import import import_case
+from powerflow import PowerFlow
+
+CASE9_M = """function mpc = case9
+%CASE9    Power flow data for 9 bus, 3 generator case.
+mpc.baseMVA = 100;
+mpc.bus = [
+	1	3	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	2	2	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	3	2	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	4	1	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	5	1	90	30	0	0	1	1	0	345	1	1.1	0.9;
+	6	1	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	7	1	100	35	0	0	1	1	0	345	1	1.1	0.9;
+	8	1	0	0	0	0	1	1	0	345	1	1.1	0.9;
+	9	1	125	50	0	0	1	1	0	345	1	1.1	0.9;
+];
+mpc.gen = [
+	1	0	0	300	-300	1	100	1	250	10;
+	2	163	0	300	-300	1	100	1	300	10;
+	3	85	0	300	-300	1	100	1	270	10;
+];
+mpc.branch = [
+	1	4	0	0.0576	0	250	250	250	0	0	1	-360	360;
+	4	5	0.017	0.092	0.158	250	250	250	0	0	1	-360	360;
+	5	6	0.039	0.17	0.358	150	150	150	0	0	1	-360	360;
+	3	6	0	0.0586	0	300	300	300	0	0	1	-360	360;
+	6	7	0.0119	0.1008	0.209	150	150	150	0	0	1	-360	360;
+	7	8	0.0085	0.072	0.149	250	250	250	0	0	1	-360	360;
+	8	2	0	0.0625	0	250	250	250	0	0	1	-360	360;
+	8	9	0.032	0.161	0.306	250	250	250	0	0	1	-360	360;
+	9	4	0.01	0.085	0.176	250	250	250	0	0	1	-360	360;
+];
+"""
+
+CASE9_CDF = """ 10/17/26 PROJECT 3 TEST        100.0 2026 S WSCC 9 Bus Test Case
+BUS DATA FOLLOWS                             9 ITEMS
+   1 Bus 1 HV      1  1  3  1.000   0.00      0.0       0.0     0.0     0.0   345.0  1.000   300.0  -300.0  0.0000  0.0000    0
+   2 Bus 2 HV      1  1  2  1.000   0.00      0.0       0.0   163.0     0.0   345.0  1.000   300.0  -300.0  0.0000  0.0000    0
+   3 Bus 3 HV      1  1  2  1.000   0.00      0.0       0.0    85.0     0.0   345.0  1.000   300.0  -300.0  0.0000  0.0000    0
+   4 Bus 4 HV      1  1  0  1.000   0.00      0.0       0.0     0.0     0.0   345.0  0.000     0.0     0.0  0.0000  0.0000    0
+   5 Bus 5 HV      1  1  0  1.000   0.00     90.0      30.0     0.0     0.0   345.0  0.000     0.0     0.0  0.0000  0.0000    0
+   6 Bus 6 HV      1  1  0  1.000   0.00      0.0       0.0     0.0     0.0   345.0  0.000     0.0     0.0  0.0000  0.0000    0
+   7 Bus 7 HV      1  1  0  1.000   0.00    100.0      35.0     0.0     0.0   345.0  0.000     0.0     0.0  0.0000  0.0000    0
+   8 Bus 8 HV      1  1  0  1.000   0.00      0.0       0.0     0.0     0.0   345.0  0.000     0.0     0.0  0.0000  0.0000    0
+   9 Bus 9 HV      1  1  0  1.000   0.00    125.0      50.0     0.0     0.0   345.0  0.000     0.0     0.0  0.0000  0.0000    0
+-999
+BRANCH DATA FOLLOWS                          9 ITEMS
+   1    4  1  1 1 0   0.00000   0.05760     0.0000   250   250   250    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   4    5  1  1 1 0   0.01700   0.09200     0.1580   250   250   250    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   5    6  1  1 1 0   0.03900   0.17000     0.3580   150   150   150    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   3    6  1  1 1 0   0.00000   0.05860     0.0000   300   300   300    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   6    7  1  1 1 0   0.01190   0.10080     0.2090   150   150   150    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   7    8  1  1 1 0   0.00850   0.07200     0.1490   250   250   250    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   8    2  1  1 1 0   0.00000   0.06250     0.0000   250   250   250    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   8    9  1  1 1 0   0.03200   0.16100     0.3060   250   250   250    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+   9    4  1  1 1 0   0.01000   0.08500     0.1760   250   250   250    0 0  0.000      0.0 0.0    0.0     0.0    0.0   0.0
+-999
+LOSS ZONES FOLLOWS                     1 ITEMS
+"""
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def solve(self, circuit):
+        circuit.calc_ybus()
+        return PowerFlow(circuit).solve_circuit(circuit, tol=1e-8)
+
+    def test_matpower(self):
+        circuit = import_case(self.write("case9.m", CASE9_M))
+
+        output1 = (circuit.name, len(circuit.buses), len(circuit.branches), len(circuit.generators))
+        expected1 = ("case9", 9, 9, 3)
+        self.assertEqual(output1, expected1)
+
+        results = self.solve(circuit)
+        output2 = np.round(results["v_mag"], 4)
+        expected2 = np.array([1.0, 1.0, 1.0, 0.987, 0.9755, 1.0034, 0.9856, 0.9962, 0.9576])
+        np.testing.assert_allclose(output2, expected2, atol=1e-4)
+
+    def test_ieee_cdf(self):
+        matpower = self.solve(import_case(self.write("case9.m", CASE9_M)))
+        cdf = self.solve(import_case(self.write("case9.cdf", CASE9_CDF)))
+
+        np.testing.assert_allclose(cdf["v_mag"], matpower["v_mag"], atol=1e-10)
+        np.testing.assert_allclose(cdf["v_ang"], matpower["v_ang"], atol=1e-10)
+
+    def test_csv(self):
+        self.write("bus.csv", "bus_i,type,Pd,Qd,Bs,baseKV\n1,3,0,0,0,230\n2,1,50,20,10,230\n3,1,30,10,0,20\n4,4,0,0,0,20\n")
+        self.write("branch.csv", "fbus,tbus,r,x,b,rateA,ratio,status\n1,2,0.01,0.1,0.02,100,0,1\n"
+                                 "2,3,0,0.08,0,80,0.98,1\n1,2,0.01,0.1,0.02,100,0,0\n3,4,0.01,0.1,0,0,0,1\n")
+        circuit = import_case(os.path.join(self.directory.name, "bus.csv"))
+
+        output1 = list(circuit.buses.keys())
+        expected1 = ["Bus1", "Bus2", "Bus3"]
+        self.assertEqual(output1, expected1)
+
+        output2 = (circuit.branch_names(), list(circuit.branches.is_transformer), list(circuit.branches.tap))
+        expected2 = (["L1", "T2"], [False, True], [1.0, 0.98])
+        self.assertEqual(output2, expected2)
+
+        # Bus2 is the to end of L1, the tapped end of T2 and has a 10 MVAr shunt
+        circuit.calc_ybus()
+        yprim = circuit.branches.yprim()
+        output3 = circuit.ybus[1, 1]
+        expected3 = yprim[0, 1, 1] + yprim[1, 0, 0] + 0.1j
+        self.assertAlmostEqual(output3, expected3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 import unittest
+import numpy as np
+from scipy import sparse
 
 # Import classes
 import bus
 from circuit import Circuit
+from settings import Settings, current_settings, use_settings
 
 class TestMethods(unittest.TestCase):
     def setUp(self):
@@ -84,5 +87,116 @@ class TestMethods(unittest.TestCase):
         expected4 = ["Bus1"]
         self.assertEqual(output4, expected4)
 
+    def test_ybus(self):
+        self.circuit.add_bus("Bus1", 230)
+        self.circuit.add_bus("Bus2", 230)
+        self.circuit.add_bus("Bus3", 230)
+        self.circuit.add_conductor("C1", 0.642, 0.0217, 0.385, 460)
+        self.circuit.add_bundle("B1", 2, 1.5, "C1")
+        self.circuit.add_geometry("G1", 0, 0, 18.5, 0, 37, 0)
+        self.circuit.add_transmission_line("L1", "Bus1", "Bus2", "B1", "C1", "G1", 10)
+        self.circuit.add_transmission_line("L2", "Bus2", "Bus3", "B1", "C1", "G1", 20)
+        self.circuit.add_transmission_line("L3", "Bus1", "Bus2", "B1", "C1", "G1", 15)
+        self.circuit.calc_ybus()
+
+        output1 = sparse.issparse(self.circuit.ybus)
+        expected1 = True
+        self.assertEqual(output1, expected1)
+
+        names = list(self.circuit.buses.keys())
+        expected2 = np.zeros((3, 3), dtype=complex)
+        for line in self.circuit.transmission_lines.values():
+            i, j = names.index(line.bus1.name), names.index(line.bus2.name)
+            expected2[np.ix_([i, j], [i, j])] += line.yprim
+        np.testing.assert_allclose(self.circuit.ybus.toarray(), expected2)
+
+        output3 = self.circuit.ybus_df.loc["Bus2", "Bus3"]
+        expected3 = expected2[1, 2]
+        self.assertAlmostEqual(output3, expected3)
+
+    def test_bus_index(self):
+        self.circuit.add_bus("Bus1", 230)
+        self.circuit.add_bus("Bus2", 230)
+        other = Circuit("Other Circuit")
+        other.add_bus("Bus9", 115)
+        self.circuit.add_bus("Bus1", 115)
+
+        output1 = self.circuit.bus_index
+        expected1 = {"Bus1": 0, "Bus2": 1}
+        self.assertEqual(output1, expected1)
+
+        output2 = [self.circuit.buses["Bus1"].index, other.buses["Bus9"].index]
+        expected2 = [0, 0]
+        self.assertEqual(output2, expected2)
+
+    def test_circuit_settings(self):
+        other = Circuit("Other Circuit", Settings(frequency=50, base_power=1000))
+        for circuit in (self.circuit, other):
+            circuit.add_bus("Bus1", 230)
+            circuit.add_bus("Bus2", 230)
+            circuit.add_transformer("T1", "Bus1", "Bus2", 125, 8.5, 10)
+
+        output1 = other.transformers["T1"].zpu
+        expected1 = 10 * self.circuit.transformers["T1"].zpu
+        self.assertAlmostEqual(output1, expected1)
+
+        with use_settings(base_power=500):
+            output2 = Circuit("Third Circuit").settings.base_power
+        expected2 = 500
+        self.assertEqual(output2, expected2)
+
+        output3 = current_settings().base_power
+        expected3 = 100
+        self.assertEqual(output3, expected3)
+
+    def test_branch_table(self):
+        self.circuit.add_bus("Bus1", 230)
+        self.circuit.add_bus("Bus2", 20)
+        self.circuit.add_conductor("C1", 0.642, 0.0217, 0.385, 460)
+        self.circuit.add_bundle("B1", 2, 1.5, "C1")
+        self.circuit.add_geometry("G1", 0, 0, 18.5, 0, 37, 0)
+        self.circuit.add_transmission_line("L1", "Bus1", "Bus2", "B1", "C1", "G1", 10)
+        self.circuit.add_transformer("T1", "Bus1", "Bus2", 125, 8.5, 10)
+
+        output1 = self.circuit.branch_names()
+        expected1 = ["L1", "T1"]
+        self.assertEqual(output1, expected1)
+
+        line = self.circuit.transmission_lines["L1"]
+        transformer = self.circuit.transformers["T1"]
+        np.testing.assert_allclose(line.yprim, line.calc_matrix())
+        np.testing.assert_allclose(transformer.yprim, transformer.calc_matrix())
+
+        output2 = list(self.circuit.branches.is_transformer)
+        expected2 = [False, True]
+        self.assertEqual(output2, expected2)
+
+    def test_branch_name_clash(self):
+        self.circuit.add_bus("BusA", 230)
+        self.circuit.add_bus("BusB", 230)
+        self.circuit.add_bus("BusC", 230)
+        self.circuit.add_conductor("C1", 0.642, 0.0217, 0.385, 460)
+        self.circuit.add_bundle("B1", 2, 1.5, "C1")
+        self.circuit.add_geometry("G1", 0, 0, 18.5, 0, 37, 0)
+        self.circuit.add_transformer("X", "BusA", "BusB", 125, 8.5, 10)
+
+        # A line may not take over the row of a transformer with the same name
+        with self.assertRaises(ValueError):
+            self.circuit.add_transmission_line("X", "BusB", "BusC", "B1", "C1", "G1", 10)
+
+        output1 = (len(self.circuit.branches), list(self.circuit.transmission_lines))
+        expected1 = (1, [])
+        self.assertEqual(output1, expected1)
+
+        output2 = list(self.circuit.branches.from_index)
+        expected2 = [self.circuit.bus_index["BusA"]]
+        self.assertEqual(output2, expected2)
+
+        # Re-adding a branch of the same kind still replaces it in place
+        self.circuit.add_transformer("X", "BusA", "BusC", 125, 8.5, 10)
+        output3 = (len(self.circuit.branches), self.circuit.transformers["X"].branch_row)
+        expected3 = (1, 0)
+        self.assertEqual(output3, expected3)
+
 if __name__ == '__main__':
     unittest.main()
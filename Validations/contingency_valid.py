@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+# Import classes
+from powerflow import PowerFlow
+from contingency import ContingencyAnalysis, outage_ybus
+from seven_bus_case import LINES, seven_bus_circuit
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.circuit.calc_ybus()
+
+    def test_outage_ybus(self):
+        from_index, to_index, yprim = self.circuit.branch_arrays()
+        for name in LINES:
+            k = self.circuit.branch_names().index(name)
+            output1 = outage_ybus(self.circuit.ybus, from_index[k], to_index[k], yprim[k]).toarray()
+
+            removed = seven_bus_circuit(removed=name)
+            removed.calc_ybus()
+            expected1 = removed.ybus.toarray()
+            np.testing.assert_allclose(output1, expected1, atol=1e-9)
+
+    def test_overloads(self):
+        violations = ContingencyAnalysis(self.circuit, tol=1e-8, workers=1).run(["L6"])
+        overloads = violations[violations["violation"] == "overload"]
+
+        # Post-outage loading matches a full solve of the circuit without the line
+        removed = seven_bus_circuit(removed="L6")
+        removed.calc_ybus()
+        flows = PowerFlow(removed).solve_circuit(removed, tol=1e-8)["branch_flows"].set_index("branch")
+
+        output1 = list(overloads["branch"])
+        expected1 = list(flows.index[flows["loading"] > 100])
+        self.assertEqual(output1, expected1)
+
+        np.testing.assert_allclose(overloads["value"], flows.loc[output1, "s_max"], rtol=1e-6)
+        np.testing.assert_allclose(overloads["limit"], flows.loc[output1, "rating"])
+
+    def test_pool_matches_serial(self):
+        serial_analysis = ContingencyAnalysis(self.circuit, workers=1)
+        serial = serial_analysis.run()
+        pool_analysis = ContingencyAnalysis(self.circuit, workers=2)
+        pool = pool_analysis.run()
+
+        pd.testing.assert_frame_equal(pool, serial)
+        pd.testing.assert_frame_equal(pool_analysis.summary, serial_analysis.summary)
+
+        # Taking out T2 islands Bus7
+        output1 = serial.loc[serial["outage"] == "T2", "violation"].tolist()
+        expected1 = ["islanded"]
+        self.assertEqual(output1, expected1)
+
+if __name__ == '__main__':
+    unittest.main()
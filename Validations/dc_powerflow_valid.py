@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+
+# Import classes
+from dc_powerflow import DCPowerFlow
+from seven_bus_case import LINES, seven_bus_circuit
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.dc = DCPowerFlow(self.circuit)
+
+    def test_ptdf_flows(self):
+        results = self.dc.solve()
+        injections = self.dc.bus_injections()
+
+        np.testing.assert_allclose(self.dc.calc_flows(injections), results["branch_flows"], atol=1e-9)
+        np.testing.assert_allclose(self.dc.ptdf @ injections, results["branch_flows"], atol=1e-9)
+
+        output1 = self.dc.ptdf[:, self.dc.slack_index].tolist()
+        expected1 = [0.0] * len(self.dc.branch_names)
+        self.assertEqual(output1, expected1)
+
+        # The slack bus picks up the load not served by G7
+        output2 = results["slack_injection"]
+        expected2 = 110
+        self.assertAlmostEqual(output2, expected2, places=9)
+
+    def test_lodf_matches_resolve(self):
+        flows = self.dc.solve()["branch_flows"]
+        for name in LINES:
+            k = self.dc.branch_names.index(name)
+            predicted = self.dc.calc_outage_flows(flows, [k])[0]
+
+            resolved = DCPowerFlow(seven_bus_circuit(removed=name))
+            expected = dict(zip(resolved.branch_names, resolved.solve()["branch_flows"]))
+
+            output1 = predicted[k]
+            expected1 = 0.0
+            self.assertEqual(output1, expected1)
+
+            remaining = [branch for branch in self.dc.branch_names if branch != name]
+            np.testing.assert_allclose([predicted[self.dc.branch_names.index(branch)] for branch in remaining],
+                                       [expected[branch] for branch in remaining], atol=1e-8)
+
+    def test_batch_matches_single(self):
+        scale = np.array([[1.0], [0.5], [1.2]])
+        injections = self.dc.bus_injections() * scale
+        injections[:, self.dc.slack_index] = 0.0
+
+        flows = self.dc.calc_flows(injections)
+        outage_flows = self.dc.calc_outage_flows(flows, [2, 7])
+
+        output1 = (flows.shape, outage_flows.shape)
+        expected1 = ((3, 8), (3, 2, 8))
+        self.assertEqual(output1, expected1)
+
+        for k in range(len(injections)):
+            single = self.dc.solve(injections[k])["branch_flows"]
+            np.testing.assert_allclose(flows[k], single, atol=1e-9)
+            np.testing.assert_allclose(outage_flows[k], self.dc.calc_outage_flows(single, [2, 7]), atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
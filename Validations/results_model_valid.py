@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from PyQt6.QtCore import Qt
+
+# Import classes
+from results_model import ResultsTableModel, ResultsFilterProxyModel
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.model = ResultsTableModel(["Bus", "V (pu)"], [None, ".4f"])
+        self.model.set_columns(["Bus1", "Bus2", "Bus3", "Bus10"], np.array([1.0, 0.93, 0.97, np.nan]))
+        self.proxy = ResultsFilterProxyModel()
+        self.proxy.setSourceModel(self.model)
+
+    def test_model(self):
+        output1 = (self.model.rowCount(), self.model.columnCount())
+        expected1 = (4, 2)
+        self.assertEqual(output1, expected1)
+
+        output2 = self.model.index(1, 1).data()
+        expected2 = "0.9300"
+        self.assertEqual(output2, expected2)
+
+        output3 = self.model.headerData(1, Qt.Orientation.Horizontal)
+        expected3 = "V (pu)"
+        self.assertEqual(output3, expected3)
+
+    def test_sort_and_filter(self):
+        self.proxy.sort(1, Qt.SortOrder.AscendingOrder)
+        output1 = [self.proxy.index(row, 0).data() for row in range(3)]
+        expected1 = ["Bus2", "Bus3", "Bus1"]
+        self.assertEqual(output1, expected1)
+
+        # NaN sorts last in both orders
+        output4 = self.proxy.index(3, 0).data()
+        expected4 = "Bus10"
+        self.assertEqual(output4, expected4)
+
+        self.proxy.sort(1, Qt.SortOrder.DescendingOrder)
+        output5 = [self.proxy.index(row, 0).data() for row in range(4)]
+        expected5 = ["Bus1", "Bus3", "Bus2", "Bus10"]
+        self.assertEqual(output5, expected5)
+
+        self.proxy.set_range(1, maximum=0.95)
+        output2 = self.proxy.rowCount()
+        expected2 = 1
+        self.assertEqual(output2, expected2)
+
+        self.proxy.clear_ranges()
+        self.proxy.setFilterFixedString("bus1")
+        output3 = sorted(self.proxy.index(row, 0).data() for row in range(self.proxy.rowCount()))
+        expected3 = ["Bus1", "Bus10"]
+        self.assertEqual(output3, expected3)
+
+if __name__ == '__main__':
+    unittest.main()
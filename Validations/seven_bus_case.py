@@ -0,0 +1,44 @@
+from circuit import Circuit
+
+# Transmission lines of the seven bus case: (from bus, to bus, length in miles)
+LINES = {"L1": ("Bus2", "Bus4", 10), "L2": ("Bus2", "Bus3", 25), "L3": ("Bus3", "Bus5", 20),
+         "L4": ("Bus4", "Bus6", 20), "L5": ("Bus5", "Bus6", 10), "L6": ("Bus4", "Bus5", 35)}
+
+def seven_bus_circuit(removed=None):
+    """
+    Seven bus test system shared by the validations (Y-bus not calculated)
+
+    Parameters:
+        removed: Optional name of a transmission line to leave out
+    """
+    circuit = Circuit("Test Circuit")
+
+    circuit.add_bus("Bus1", 20)
+    circuit.add_bus("Bus2", 230)
+    circuit.add_bus("Bus3", 230)
+    circuit.add_bus("Bus4", 230)
+    circuit.add_bus("Bus5", 230)
+    circuit.add_bus("Bus6", 230)
+    circuit.add_bus("Bus7", 18)
+
+    circuit.buses["Bus1"].bus_type = 'Slack Bus'
+    for name in ["Bus2", "Bus3", "Bus4", "Bus5", "Bus6"]:
+        circuit.buses[name].bus_type = 'PQ Bus'
+    circuit.buses["Bus7"].bus_type = 'PV Bus'
+
+    circuit.add_transformer("T1", "Bus1", "Bus2", 125, 8.5, 10)
+    circuit.add_transformer("T2", "Bus6", "Bus7", 200, 10.5, 12)
+    circuit.add_conductor("C1", 0.642, 0.0217, 0.385, 460)
+    circuit.add_bundle("B1", 2, 1.5, "C1")
+    circuit.add_geometry("G1", 0, 0, 18.5, 0, 37, 0)
+    for name, (bus1, bus2, length) in LINES.items():
+        if name != removed:
+            circuit.add_transmission_line(name, bus1, bus2, "B1", "C1", "G1", length)
+
+    circuit.add_load("Load3", "Bus3", 110, 50)
+    circuit.add_load("Load4", "Bus4", 100, 70)
+    circuit.add_load("Load5", "Bus5", 100, 65)
+
+    circuit.add_generator("G1", "Bus1", 1.0, 0.0, 0.12, 0.14, 0.05, 0)
+    circuit.add_generator("G7", "Bus7", 1.0, 200, 0.12, 0.14, 0.05, 0)
+    return circuit
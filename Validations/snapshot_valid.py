@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+
+# Import classes
+from seven_bus_case import seven_bus_circuit
+from powerflow import PowerFlow
+from batch_powerflow import BatchPowerFlow
+from snapshot import save_snapshot, Snapshot
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.circuit.calc_ybus()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        results = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8)
+        save_snapshot(self.directory.name, self.circuit, results)
+        snapshot = Snapshot(self.directory.name)
+
+        output1 = type(snapshot["bus/real_power"])
+        expected1 = np.memmap
+        self.assertEqual(output1, expected1)
+
+        circuit = snapshot.circuit()
+        np.testing.assert_allclose(circuit.ybus.toarray(), self.circuit.ybus.toarray())
+
+        output2 = circuit.branch_names()
+        expected2 = self.circuit.branch_names()
+        self.assertEqual(output2, expected2)
+
+        flat = PowerFlow(circuit).solve_circuit(circuit, tol=1e-8, initializer="flat")
+        np.testing.assert_allclose(flat["v_mag"], results["v_mag"], atol=1e-10)
+
+        # The saved solved state warm starts the restored circuit
+        restored = snapshot.circuit()
+        output3 = PowerFlow(restored).solve_circuit(restored, tol=1e-8)["iterations"]
+        expected3 = 1
+        self.assertEqual(output3, expected3)
+
+        saved = snapshot.results()
+        output4 = (saved["converged"], saved["iterations"], list(saved["overloads"]["branch"]))
+        expected4 = (True, results["iterations"], ["T1", "T2"])
+        self.assertEqual(output4, expected4)
+        self.assertAlmostEqual(saved["total_losses"], results["total_losses"])
+
+    def test_series_and_version(self):
+        p_base = np.array([bus.real_power for bus in self.circuit.buses.values()])
+        q_base = np.array([bus.reactive_power for bus in self.circuit.buses.values()])
+        scale = np.linspace(0.5, 1.0, 6)[:, None]
+        results = BatchPowerFlow(self.circuit).solve(p_base * scale, q_base * scale, tol=1e-8)
+        save_snapshot(self.directory.name, self.circuit, results)
+
+        v_mag = Snapshot(self.directory.name).results()["v_mag"]
+        output1 = v_mag.shape
+        expected1 = (6, 7)
+        self.assertEqual(output1, expected1)
+        np.testing.assert_allclose(v_mag[2:4, 3], results["v_mag"][2:4, 3])
+
+        manifest_path = os.path.join(self.directory.name, "manifest.json")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest["version"] += 1
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f)
+        with self.assertRaises(ValueError):
+            Snapshot(self.directory.name)
+
+    def test_overwrite(self):
+        path = os.path.join(self.directory.name, "snapshot")
+        results = PowerFlow(self.circuit).solve_circuit(self.circuit, tol=1e-8)
+        results["switched_buses"] = [("Bus7", 80), ("Bus6", 40.5)]
+        results["names"] = ["Bus1", "Bus2"]
+        save_snapshot(path, self.circuit, results)
+
+        saved = Snapshot(path).results()
+        output1 = (saved["switched_buses"], list(saved["names"]))
+        expected1 = ([("Bus7", 80), ("Bus6", 40.5)], ["Bus1", "Bus2"])
+        self.assertEqual(output1, expected1)
+
+        # Saving again replaces the old snapshot as a whole, leaving no stale arrays
+        save_snapshot(path, self.circuit)
+        output2 = (Snapshot(path).results(), os.path.exists(os.path.join(path, "results")))
+        expected2 = ({}, False)
+        self.assertEqual(output2, expected2)
+
+        output3 = os.listdir(self.directory.name)
+        expected3 = ["snapshot"]
+        self.assertEqual(output3, expected3)
+
+        # Directories that hold something else are never replaced
+        other = os.path.join(path, "bus", "notes.txt")
+        os.remove(os.path.join(path, "manifest.json"))
+        open(other, "w").close()
+        with self.assertRaises(ValueError):
+            save_snapshot(path, self.circuit)
+        self.assertTrue(os.path.exists(other))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import numpy as np
+
+# Import classes
+from solution_asymmetric import Solution_Asymmetric_Faults, FAULT_TYPES
+from seven_bus_case import seven_bus_circuit
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.circuit.calc_ybus()
+        self.faults = Solution_Asymmetric_Faults(self.circuit)
+
+        # Dense sequence impedances at Bus3 (no generator there): lines have Z0 = 3 Z1
+        ybus1 = self.circuit.ybus.toarray()
+        ybus2 = ybus1.copy()
+        ybus0 = ybus1.copy()
+        from_index, to_index, yprim = self.circuit.branch_arrays()
+        for k, transformer in enumerate(self.circuit.branches.is_transformer):
+            if not transformer:
+                y_series = -yprim[k, 0, 1]
+                i, j = from_index[k], to_index[k]
+                ybus0[[i, j, i, j], [i, j, j, i]] -= np.array([1, 1, -1, -1]) * y_series * 2 / 3
+        for generator in self.circuit.generators.values():
+            k = self.circuit.bus_index[generator.bus.name]
+            ybus1[k, k] += generator.y_bus_admittance
+            ybus2[k, k] += generator.y2
+            ybus0[k, k] += generator.y0
+        n = self.circuit.bus_index["Bus3"]
+        self.z0, self.z1, self.z2 = [np.linalg.inv(ybus)[n, n] for ybus in (ybus0, ybus1, ybus2)]
+
+    def test_sequence_formulas(self):
+        z0, z1, z2 = self.z0, self.z1, self.z2
+        a = np.exp(2j * np.pi / 3)
+
+        currents = {fault_type: self.faults.calculate_fault("Bus3", fault_type)[0] for fault_type in FAULT_TYPES}
+
+        output1 = currents["LLL"][0]
+        expected1 = 1 / z1
+        self.assertAlmostEqual(output1, expected1, places=8)
+
+        output2 = currents["SLG"]
+        expected2 = [3 / (z1 + z2 + z0), 0, 0]
+        np.testing.assert_allclose(output2, expected2, atol=1e-8)
+
+        output3 = currents["LL"][1]
+        expected3 = -1j * np.sqrt(3) / (z1 + z2)
+        self.assertAlmostEqual(output3, expected3, places=8)
+
+        # Double line to ground: neutral current 3 I0 with I1 = 1 / (Z1 + Z2 || Z0)
+        i1 = 1 / (z1 + z2 * z0 / (z2 + z0))
+        i0 = -i1 * z2 / (z2 + z0)
+        i2 = -i1 * z0 / (z2 + z0)
+        output4 = currents["DLG"]
+        expected4 = [0, i0 + a**2 * i1 + a * i2, i0 + a * i1 + a**2 * i2]
+        np.testing.assert_allclose(output4, expected4, atol=1e-8)
+        self.assertAlmostEqual(np.sum(output4), 3 * i0, places=8)
+
+        # Faulted phases are at zero voltage
+        n = self.circuit.bus_index["Bus3"]
+        self.assertAlmostEqual(abs(self.faults.calculate_fault("Bus3", "SLG")[1][n, 0]), 0, places=10)
+        np.testing.assert_allclose(self.faults.calculate_fault("Bus3", "DLG")[1][n, 1:], 0, atol=1e-10)
+
+    def test_sweep_matches_single(self):
+        results = self.faults.calculate_faults(fault_impedance=0.05j)
+        for fault_type in FAULT_TYPES:
+            output1 = results[fault_type]["phase_voltages"].shape
+            expected1 = (7, 7, 3)
+            self.assertEqual(output1, expected1)
+
+            for k, bus in enumerate(self.circuit.buses.values()):
+                phase_currents, phase_voltages = self.faults.calculate_fault(bus, fault_type, 0.05j)
+                np.testing.assert_allclose(results[fault_type]["phase_currents"][k], phase_currents, atol=1e-12)
+                np.testing.assert_allclose(results[fault_type]["phase_voltages"][k], phase_voltages, atol=1e-12)
+
+        with self.assertRaises(ValueError):
+            self.faults.calculate_faults(fault_types=("LLG",))
+
+    def test_shunts(self):
+        # Bus shunts appear in every sequence network
+        self.circuit.add_shunt("Bus4", 0, 50)
+        self.circuit.calc_ybus()
+        faults = Solution_Asymmetric_Faults(self.circuit)
+        n = self.circuit.bus_index["Bus4"]
+
+        output1 = faults.ybus0[n, n] - self.faults.ybus0[n, n]
+        expected1 = 0.5j
+        self.assertAlmostEqual(output1, expected1, places=12)
+
+        output2 = faults.ybus1[n, n] - self.faults.ybus1[n, n]
+        self.assertAlmostEqual(output2, expected1, places=12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+import numpy as np
+
+# Import classes
+import solution_symmetric
+from solution_symmetric import Solution_Faults
+from seven_bus_case import seven_bus_circuit
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.circuit.calc_ybus()
+        self.faults = Solution_Faults(self.circuit)
+
+        # Dense reference: network Y-bus plus generator admittances, inverted
+        ybus = self.circuit.ybus.toarray()
+        for generator in self.circuit.generators.values():
+            k = self.circuit.bus_index[generator.bus.name]
+            ybus[k, k] += generator.y_bus_admittance
+        self.zbus = np.linalg.inv(ybus)
+
+    def test_zbus_columns(self):
+        output1 = self.faults.calc_zbus_columns([4, 1])
+        expected1 = self.zbus[:, [4, 1]]
+        np.testing.assert_allclose(output1, expected1, atol=1e-12)
+
+        np.testing.assert_allclose(self.faults.zbus, self.zbus, atol=1e-12)
+
+    def test_fault_currents_all(self):
+        fault_currents, voltages = self.faults.calculate_fault_currents_all()
+
+        output1 = fault_currents
+        expected1 = 1 / np.diag(self.zbus)
+        np.testing.assert_allclose(output1, expected1, rtol=1e-10)
+
+        output2 = voltages
+        expected2 = (1 - self.zbus / np.diag(self.zbus)).T
+        np.testing.assert_allclose(output2, expected2, atol=1e-10)
+
+        # The single bus wrapper gives the same row
+        for k, bus in enumerate(self.circuit.buses.values()):
+            current, bus_voltages = self.faults.calculate_fault_currents_2(bus)
+            self.assertAlmostEqual(current, fault_currents[k], places=10)
+            np.testing.assert_allclose(bus_voltages, voltages[k], atol=1e-12)
+
+        output3 = self.faults.calculate_fault_currents_all(["Bus3"], fault_impedance=0.1j)[0]
+        expected3 = 1 / (self.zbus[2, 2] + 0.1j)
+        np.testing.assert_allclose(output3, [expected3], rtol=1e-10)
+
+    def test_blocked_sweep(self):
+        # Blocks of 2 columns split the 7 buses unevenly; results match the single block solve
+        buses = ["Bus7", "Bus2", "Bus5", "Bus1", "Bus4"]
+        fault_currents, voltages = self.faults.calculate_fault_currents_all(buses, fault_impedance=0.05j)
+        with mock.patch.object(solution_symmetric, "FAULT_BLOCK_SIZE", 2):
+            blocked_currents, blocked_voltages = self.faults.calculate_fault_currents_all(buses, fault_impedance=0.05j)
+            diagonal = self.faults.calc_zbus_diagonal(np.arange(7))
+
+        np.testing.assert_allclose(blocked_currents, fault_currents, rtol=1e-12)
+        np.testing.assert_allclose(blocked_voltages, voltages, atol=1e-12)
+        np.testing.assert_allclose(diagonal, np.diag(self.zbus), rtol=1e-10)
+
+    def test_currents_only(self):
+        with mock.patch.object(solution_symmetric, "FAULT_BLOCK_SIZE", 3):
+            fault_currents, voltages = self.faults.calculate_fault_currents_all(voltages=False)
+
+        output1 = voltages
+        expected1 = None
+        self.assertEqual(output1, expected1)
+
+        np.testing.assert_allclose(fault_currents, self.faults.calculate_fault_currents_all()[0], rtol=1e-12)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Import classes
+from solution import Solution, calc_injections
+from seven_bus_case import seven_bus_circuit
+
+def polar_injections(ybus, angles, voltages):
+    # P and Q from the element-wise polar sums over every bus pair
+    n = len(voltages)
+    P = np.zeros(n)
+    Q = np.zeros(n)
+    for i in range(n):
+        for j in range(n):
+            y = ybus[i, j]
+            angle = angles[i] - angles[j] - np.angle(y)
+            P[i] += voltages[i] * voltages[j] * abs(y) * np.cos(angle)
+            Q[i] += voltages[i] * voltages[j] * abs(y) * np.sin(angle)
+    return P, Q
+
+class TestMethods(unittest.TestCase):
+    def setUp(self):
+        self.circuit = seven_bus_circuit()
+        self.circuit.calc_ybus()
+        self.ybus = self.circuit.ybus.toarray()
+
+        rng = np.random.default_rng(0)
+        self.angles = rng.uniform(-0.3, 0.1, size=(3, 7))
+        self.voltages = rng.uniform(0.9, 1.05, size=(3, 7))
+
+    def test_calc_injections(self):
+        bus_names = list(self.circuit.buses.keys())
+        inputs = [self.ybus, pd.DataFrame(self.ybus, index=bus_names, columns=bus_names),
+                  sparse.csr_matrix(self.ybus)]
+        expected = [polar_injections(self.ybus, a, v) for a, v in zip(self.angles, self.voltages)]
+        voltage = self.voltages * np.exp(1j * self.angles)
+
+        for ybus in inputs:
+            P, Q = calc_injections(ybus, voltage[0])
+            np.testing.assert_allclose(P, expected[0][0], atol=1e-10)
+            np.testing.assert_allclose(Q, expected[0][1], atol=1e-10)
+
+            # A (K, N) stack of scenarios gives one row per scenario
+            P, Q = calc_injections(ybus, voltage)
+            output1 = P.shape
+            expected1 = (3, 7)
+            self.assertEqual(output1, expected1)
+            np.testing.assert_allclose(P, [p for p, q in expected], atol=1e-10)
+            np.testing.assert_allclose(Q, [q for p, q in expected], atol=1e-10)
+
+    def test_calc_PQx(self):
+        solution = Solution("Test", list(self.circuit.buses.values()), self.circuit, self.circuit.loads)
+        solution.set_state(self.angles[1], self.voltages[1])
+        Px, Qx = solution.calc_PQx()
+        P, Q = polar_injections(self.ybus, self.angles[1], self.voltages[1])
+
+        output1 = list(Px.keys())
+        expected1 = list(self.circuit.buses.keys())
+        self.assertEqual(output1, expected1)
+
+        np.testing.assert_allclose(list(Px.values()), P, atol=1e-10)
+        np.testing.assert_allclose(list(Qx.values()), Q, atol=1e-10)
+        np.testing.assert_allclose(list(solution.calc_Qx().values()), Q, atol=1e-10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+
+# Import classes
+from synthetic_grid import synthetic_grid
+from powerflow import PowerFlow
+from benchmark import benchmark_case, compare_reports
+
+class TestMethods(unittest.TestCase):
+    def test_topologies(self):
+        radial = synthetic_grid(100, "radial")
+        meshed = synthetic_grid(100, "meshed")
+
+        output1 = (len(radial.buses), len(radial.generators), len(radial.loads))
+        expected1 = (100, 10, 90)
+        self.assertEqual(output1, expected1)
+
+        # A radial grid is a tree: one branch less than buses
+        output2 = len(radial.branches)
+        expected2 = 99
+        self.assertEqual(output2, expected2)
+        self.assertTrue(len(meshed.branches) > len(radial.branches))
+
+        output3 = list(synthetic_grid(100, "meshed").branches.names)
+        expected3 = list(meshed.branches.names)
+        self.assertEqual(output3, expected3)
+
+        with self.assertRaises(ValueError):
+            synthetic_grid(100, "ring")
+
+    def test_powerflow_converges(self):
+        for topology in ["meshed", "radial"]:
+            circuit = synthetic_grid(500, topology, seed=1)
+            circuit.calc_ybus()
+            results = PowerFlow(circuit).solve_circuit(circuit, tol=1e-6, initializer="flat")
+
+            output1 = results["converged"]
+            expected1 = True
+            self.assertEqual(output1, expected1)
+            self.assertTrue(0.9 < np.min(results["v_mag"]) and np.max(results["v_mag"]) < 1.05)
+
+    def test_benchmark_case(self):
+        case = benchmark_case(20, "meshed", repeat=1, fault_buses=5)
+
+        output1 = sorted(case["stages"])
+        expected1 = sorted(["build", "ybus", "mismatch", "jacobian", "jacobian_loop", "factorize", "linear_solve",
+                            "fault_sweep", "powerflow"])
+        self.assertEqual(output1, expected1)
+
+        output2 = (case["faulted_buses"], case["powerflow"]["converged"])
+        expected2 = (5, True)
+        self.assertEqual(output2, expected2)
+
+        # A baseline twice as fast flags every stage
+        baseline = {"cases": [dict(case, stages={stage: {"min": timing["min"] / 2} for stage, timing in case["stages"].items()})]}
+        output3 = len(compare_reports({"cases": [case]}, baseline))
+        expected3 = len(case["stages"])
+        self.assertEqual(output3, expected3)
+
+if __name__ == '__main__':
+    unittest.main()
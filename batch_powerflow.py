@@ -0,0 +1,173 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from circuit import Circuit
+from solution import Solution, calc_injections
+
+class BatchPowerFlow:
+
+    def __init__(self, circuit: Circuit):
+        """
+        Newton-Raphson power flow for many injection scenarios on one network
+
+        The Y-bus, bus types and the Jacobian sparsity pattern are shared by
+        every scenario, so mismatches and Jacobian entries are evaluated as
+        (scenarios x entries) array operations and all active scenarios are
+        solved with one block-diagonal sparse factorization per iteration.
+        """
+        self.circuit = circuit
+        if circuit.ybus is None:
+            circuit.calc_ybus()
+
+        self.solution = Solution("BatchPowerFlowSolution", list(circuit.buses.values()), circuit, circuit.loads)
+        self.solution.calc_bus_indices()
+        self.pvpq_index = self.solution.pvpq_index
+        self.pq_index = self.solution.pq_index
+        self.calc_jacobian_pattern()
+
+    def calc_jacobian_pattern(self):
+        """
+        Precompute where each Y-bus (plus diagonal) entry lands in the four Jacobian blocks
+        """
+        ybus = sparse.csr_matrix(self.circuit.ybus)
+        n = ybus.shape[0]
+        n_theta = len(self.pvpq_index)
+        m = n_theta + len(self.pq_index)
+
+        pattern = (abs(ybus) + sparse.identity(n, format='csr')).tocoo()
+        self.rows = pattern.row
+        self.cols = pattern.col
+        self.y = np.asarray(ybus[self.rows, self.cols]).ravel()
+        self.is_diagonal = self.rows == self.cols
+
+        # Position of each bus in the angle (P) and magnitude (Q) parts of the unknowns
+        angle_position = np.full(n, -1)
+        angle_position[self.pvpq_index] = np.arange(n_theta)
+        magnitude_position = np.full(n, -1)
+        magnitude_position[self.pq_index] = n_theta + np.arange(len(self.pq_index))
+
+        # (row map, column map, derivative, part) for J1..J4
+        blocks = [
+            (angle_position, angle_position, "angle", "real"),
+            (angle_position, magnitude_position, "magnitude", "real"),
+            (magnitude_position, angle_position, "angle", "imag"),
+            (magnitude_position, magnitude_position, "magnitude", "imag")
+        ]
+
+        self.blocks = []
+        j_rows = []
+        j_cols = []
+        for row_map, col_map, derivative, part in blocks:
+            selected = np.flatnonzero((row_map[self.rows] >= 0) & (col_map[self.cols] >= 0))
+            self.blocks.append((selected, derivative, part))
+            j_rows.append(row_map[self.rows[selected]])
+            j_cols.append(col_map[self.cols[selected]])
+
+        self.j_rows = np.concatenate(j_rows)
+        self.j_cols = np.concatenate(j_cols)
+        self.size = m
+
+    def calc_jacobian_data(self, angles, voltages):
+        """
+        Jacobian nonzeros for a stack of scenarios
+
+        Parameters:
+            angles, voltages: Arrays of shape (K, N)
+
+        Returns:
+            data: Array of shape (K, nnz) aligned with self.j_rows / self.j_cols
+        """
+        V = voltages * np.exp(1j * angles)
+        I = calc_current(self.circuit.ybus, V)
+        V_norm = V / np.abs(V)
+
+        V_row = V[:, self.rows]
+        diagonal = self.is_diagonal
+        dS_dangle = 1j * V_row * (diagonal * np.conj(I[:, self.rows]) - np.conj(self.y * V[:, self.cols]))
+        dS_dvoltage = V_row * np.conj(self.y * V_norm[:, self.cols]) + diagonal * np.conj(I[:, self.rows]) * V_norm[:, self.rows]
+
+        parts = []
+        for selected, derivative, part in self.blocks:
+            values = dS_dangle[:, selected] if derivative == "angle" else dS_dvoltage[:, selected]
+            parts.append(values.real if part == "real" else values.imag)
+        return np.concatenate(parts, axis=1)
+
+    def solve(self, p_injections, q_injections, tol=0.001, max_iter=50, initializer="auto"):
+        """
+        Solve K scenarios together
+
+        Parameters:
+            p_injections: Array (K, N) of net real power injections per bus (MW)
+            q_injections: Array (K, N) of net reactive power injections per bus (MVAr)
+            tol: Convergence tolerance on each scenario's maximum mismatch (per unit)
+            max_iter: Maximum number of iterations
+            initializer: Starting point shared by every scenario (see Solution.start)
+
+        Returns:
+            results: Dictionary with per-scenario converged mask, iterations and final
+                     mismatch, and stacked (K, N) v_mag, v_ang, p_calc and q_calc arrays
+        """
+        p_injections = np.atleast_2d(np.asarray(p_injections, dtype=float))
+        q_injections = np.atleast_2d(np.asarray(q_injections, dtype=float))
+        k_scenarios, n = p_injections.shape
+        if q_injections.shape != (k_scenarios, n) or n != len(self.circuit.buses):
+            raise ValueError(f"Injection arrays must both have shape (K, {len(self.circuit.buses)})")
+
+        angles0, voltages0 = self.solution.initial_state(initializer)
+        angles = np.tile(angles0, (k_scenarios, 1))
+        voltages = np.tile(voltages0, (k_scenarios, 1))
+
+        y_spec = np.hstack((p_injections[:, self.pvpq_index], q_injections[:, self.pq_index])) / self.circuit.settings.base_power
+        n_theta = len(self.pvpq_index)
+
+        converged = np.zeros(k_scenarios, dtype=bool)
+        iterations = np.zeros(k_scenarios, dtype=int)
+        final_mismatch = np.full(k_scenarios, np.inf)
+        active = np.arange(k_scenarios)
+
+        for iteration in range(max_iter):
+            P, Q = calc_injections(self.circuit.ybus, voltages[active] * np.exp(1j * angles[active]))
+            mismatch = y_spec[active] - np.hstack((P[:, self.pvpq_index], Q[:, self.pq_index]))
+            max_mismatch = np.max(np.abs(mismatch), axis=1, initial=0.0)
+
+            final_mismatch[active] = max_mismatch
+            iterations[active] = iteration + 1
+            done = max_mismatch < tol
+            converged[active[done]] = True
+
+            active = active[~done]
+            mismatch = mismatch[~done]
+            if len(active) == 0:
+                break
+
+            dx = self.solve_block_diagonal(angles[active], voltages[active], mismatch)
+            angles[active[:, None], self.pvpq_index] += dx[:, :n_theta]
+            voltages[active[:, None], self.pq_index] += dx[:, n_theta:]
+
+        P, Q = calc_injections(self.circuit.ybus, voltages * np.exp(1j * angles))
+
+        return {
+            "converged": converged,
+            "iterations": iterations,
+            "final_mismatch": final_mismatch,
+            "v_mag": voltages,
+            "v_ang": angles,
+            "p_calc": P,
+            "q_calc": Q
+        }
+
+    def solve_block_diagonal(self, angles, voltages, mismatch):
+        # One sparse LU of the block-diagonal Jacobian of every active scenario
+        k_active = angles.shape[0]
+        data = self.calc_jacobian_data(angles, voltages)
+        offsets = (np.arange(k_active) * self.size)[:, None]
+
+        J = sparse.csc_matrix((data.ravel(), ((self.j_rows + offsets).ravel(), (self.j_cols + offsets).ravel())),
+                              shape=(k_active * self.size, k_active * self.size))
+        dx = splu(J, permc_spec="COLAMD").solve(mismatch.ravel())
+        return dx.reshape(k_active, self.size)
+
+
+def calc_current(ybus, voltage):
+    # Bus current injections I = Ybus @ V for a (K, N) stack of voltages
+    return (ybus @ voltage.T).T
@@ -0,0 +1,188 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+import scipy
+from jacobian import Jacobian
+from linear_solver import LinearSolver
+from powerflow import PowerFlow
+from solution import Solution
+from solution_symmetric import Solution_Faults
+from synthetic_grid import TOPOLOGIES, synthetic_grid
+
+# The element-by-element Jacobian is O(N^2) per block, so it is only timed on small systems
+LOOP_JACOBIAN_MAX_BUSES = 200
+
+def time_call(function, repeat):
+    """
+    Time a function call
+
+    Returns:
+        timing: Dictionary with the min and median wall time in seconds
+        result: Return value of the last call
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": float(np.median(times))}, result
+
+def benchmark_case(num_buses, topology="meshed", repeat=3, fault_buses=100, seed=0, solve=True):
+    """
+    Time the solver hot paths on one synthetic grid
+
+    Stages are timed separately at a flat start: Y-bus assembly, the power
+    mismatch, the sparse Jacobian, its LU factorization and one solve, and a
+    fault sweep (augmented Y-bus factorization plus the Zbus columns of
+    fault_buses evenly spaced buses). The full Newton power flow is timed last.
+
+    Parameters:
+        num_buses: Number of buses of the synthetic grid
+        topology: "meshed" or "radial"
+        repeat: Timed calls per stage
+        fault_buses: Number of faulted buses in the fault sweep
+        seed: Seed of the synthetic grid
+        solve: Also time a full power flow solve
+
+    Returns:
+        case: Dictionary with the grid size, stage timings and factorization statistics
+    """
+    build, circuit = time_call(lambda: synthetic_grid(num_buses, topology, seed=seed), 1)
+    ybus, _ = time_call(circuit.calc_ybus, repeat)
+
+    buses = list(circuit.buses.values())
+    solution = Solution("Benchmark", buses, circuit, circuit.loads)
+    solution.start("flat")
+    angles, voltages = solution.state_arrays()
+    stages = {"build": build, "ybus": ybus}
+
+    stages["mismatch"], mismatch = time_call(solution.calc_mismatch, repeat)
+
+    jacobian = Jacobian(circuit)
+    stages["jacobian"], J = time_call(lambda: jacobian.calc_jacobian_sparse(
+        circuit.ybus, angles, voltages, solution.pvpq_index, solution.pq_index), repeat)
+    if num_buses <= LOOP_JACOBIAN_MAX_BUSES:
+        loop = Jacobian(circuit, mode="loop")
+        stages["jacobian_loop"], _ = time_call(lambda: loop.calc_jacobian(
+            buses, circuit.ybus, angles, voltages, solution.pvpq_index, solution.pq_index), repeat)
+
+    solver = LinearSolver(sparse_threshold=0)
+    stages["factorize"], (lu_solve, factorization) = time_call(lambda: solver.factorize(J), repeat)
+    stages["linear_solve"], _ = time_call(lambda: lu_solve(mismatch), repeat)
+
+    bus_names = list(circuit.buses.keys())
+    faulted = [bus_names[k] for k in np.linspace(0, len(bus_names) - 1, min(fault_buses, len(bus_names)), dtype=int)]
+    stages["fault_sweep"], _ = time_call(
+        lambda: Solution_Faults(circuit).calculate_fault_currents_all(faulted), repeat)
+
+    case = {
+        "buses": len(bus_names),
+        "topology": topology,
+        "seed": seed,
+        "branches": len(circuit.branches),
+        "ybus_nnz": int(circuit.ybus.nnz),
+        "faulted_buses": len(faulted),
+        "factorization": {key: factorization[key] for key in ("size", "nnz", "factor_nnz", "fill_in")},
+        "stages": stages
+    }
+
+    if solve:
+        stages["powerflow"], results = time_call(
+            lambda: PowerFlow(circuit).solve_circuit(circuit, initializer="flat"), 1)
+        case["powerflow"] = {"converged": bool(results["converged"]), "iterations": int(results["iterations"])}
+    return case
+
+def run_benchmarks(sizes, topologies=TOPOLOGIES, repeat=3, fault_buses=100, seed=0, solve=True, log=print):
+    """
+    Benchmark every size and topology
+
+    Returns:
+        report: Dictionary with run metadata and one benchmark_case entry per grid
+    """
+    report = {"metadata": run_metadata(), "cases": []}
+    for num_buses in sizes:
+        for topology in topologies:
+            case = benchmark_case(num_buses, topology, repeat, fault_buses, seed, solve)
+            report["cases"].append(case)
+            if log is not None:
+                log(format_case(case))
+    return report
+
+def run_metadata():
+    # Enough context to compare reports from different commits and machines
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform()
+    }
+
+def format_case(case):
+    stages = "  ".join(f"{stage} {timing['min'] * 1000:.2f}" for stage, timing in case["stages"].items())
+    return f"{case['topology']:>6} {case['buses']:>6} buses  [ms]  {stages}"
+
+def compare_reports(report, baseline, tolerance=1.25):
+    """
+    Compare stage times with a baseline report
+
+    Cases are matched on buses, topology and seed; min times are compared.
+
+    Returns:
+        regressions: List of (topology, buses, stage, ratio) with ratio > tolerance
+    """
+    previous = {(case["buses"], case["topology"], case["seed"]): case for case in baseline["cases"]}
+    regressions = []
+    for case in report["cases"]:
+        match = previous.get((case["buses"], case["topology"], case["seed"]))
+        if match is None:
+            continue
+        for stage, timing in case["stages"].items():
+            if stage in match["stages"] and match["stages"][stage]["min"] > 0:
+                ratio = timing["min"] / match["stages"][stage]["min"]
+                if ratio > tolerance:
+                    regressions.append((case["topology"], case["buses"], stage, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the power flow and fault solver stages on synthetic grids")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--topology", choices=TOPOLOGIES + ("both",), default="both")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fault-buses", type=int, default=100, help="Faulted buses in the fault sweep")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-solve", action="store_true", help="Skip the full power flow solve")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON report; exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown ratio against the baseline")
+    args = parser.parse_args(argv)
+
+    topologies = TOPOLOGIES if args.topology == "both" else (args.topology,)
+    report = run_benchmarks(args.sizes, topologies, args.repeat, args.fault_buses, args.seed, not args.no_solve)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        for topology, buses, stage, ratio in regressions:
+            print(f"Regression: {topology} {buses} buses, {stage} {ratio:.2f}x slower")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import numpy as np
+
+TRANSFORMER = 0
+TRANSMISSION_LINE = 1
+
+class BranchTable:
+
+    def __init__(self, capacity: int = 16):
+        """
+        Struct-of-arrays storage for every transformer and transmission line of a circuit
+
+        Each branch is one row of contiguous arrays: from/to bus position, series
+        admittance, total shunt susceptance, off-nominal tap on the from side and
+        thermal rating in MVA (zero when unrated).
+        Branch objects hold their row number and read their yprim from here.
+        """
+        self.names = []
+        self.rows = dict()
+        self.size = 0
+        self._from_index = np.zeros(capacity, dtype=int)
+        self._to_index = np.zeros(capacity, dtype=int)
+        self._y_series = np.zeros(capacity, dtype=complex)
+        self._b_shunt = np.zeros(capacity, dtype=float)
+        self._tap = np.ones(capacity, dtype=float)
+        self._kind = np.zeros(capacity, dtype=int)
+        self._rating = np.zeros(capacity, dtype=float)
+
+    def add(self, name, from_index, to_index, y_series, b_shunt=0.0, tap=1.0, kind=TRANSMISSION_LINE, rating=0.0):
+        """
+        Add a branch, or overwrite the row of an existing branch of the same kind and name
+
+        Branch names are unique across kinds, since results, outages and
+        snapshots refer to branches by name; reusing the name of a branch of
+        the other kind raises ValueError and leaves the table unchanged.
+
+        Returns:
+            row: Position of the branch in the table
+        """
+        row = self.rows.get(name)
+        if row is not None and self._kind[row] != kind:
+            other = "transformer" if self._kind[row] == TRANSFORMER else "transmission line"
+            raise ValueError(f"Branch name {name} is already used by a {other}")
+        if row is None:
+            if self.size == len(self._from_index):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.rows[name] = row
+            self.names.append(name)
+
+        self._from_index[row] = from_index
+        self._to_index[row] = to_index
+        self._y_series[row] = y_series
+        self._b_shunt[row] = b_shunt
+        self._tap[row] = tap
+        self._kind[row] = kind
+        self._rating[row] = rating
+        return row
+
+    def extend(self, names, from_index, to_index, y_series, b_shunt=0.0, tap=1.0, kind=TRANSMISSION_LINE, rating=0.0):
+        """
+        Append many new branches at once; scalar parameters apply to every new row
+
+        Returns:
+            rows: Positions of the new branches in the table
+        """
+        names = list(names)
+        if len(set(names)) != len(names) or any(name in self.rows for name in names):
+            raise ValueError("Branch names must be unique")
+
+        start, stop = self.size, self.size + len(names)
+        while stop > len(self._from_index):
+            self._grow()
+
+        self._from_index[start:stop] = from_index
+        self._to_index[start:stop] = to_index
+        self._y_series[start:stop] = y_series
+        self._b_shunt[start:stop] = b_shunt
+        self._tap[start:stop] = tap
+        self._kind[start:stop] = kind
+        self._rating[start:stop] = rating
+
+        self.rows.update(zip(names, range(start, stop)))
+        self.names.extend(names)
+        self.size = stop
+        return np.arange(start, stop)
+
+    def _grow(self):
+        # Double the capacity of every column
+        for column in ("_from_index", "_to_index", "_y_series", "_b_shunt", "_tap", "_kind", "_rating"):
+            values = getattr(self, column)
+            grown = np.ones(2 * len(values), dtype=values.dtype) if column == "_tap" else np.zeros(2 * len(values), dtype=values.dtype)
+            grown[:len(values)] = values
+            setattr(self, column, grown)
+
+    @property
+    def from_index(self):
+        return self._from_index[:self.size]
+
+    @property
+    def to_index(self):
+        return self._to_index[:self.size]
+
+    @property
+    def y_series(self):
+        return self._y_series[:self.size]
+
+    @property
+    def b_shunt(self):
+        return self._b_shunt[:self.size]
+
+    @property
+    def tap(self):
+        return self._tap[:self.size]
+
+    @property
+    def kind(self):
+        return self._kind[:self.size]
+
+    @property
+    def rating(self):
+        return self._rating[:self.size]
+
+    @property
+    def is_transformer(self):
+        return self.kind == TRANSFORMER
+
+    def yprim(self, rows=None):
+        """
+        Primitive admittance matrices built from the table columns
+
+        Parameters:
+            rows: Optional row positions (defaults to every branch)
+
+        Returns:
+            yprim: Complex array of shape (branches, 2, 2)
+        """
+        if rows is None:
+            rows = slice(0, self.size)
+        y = self._y_series[rows]
+        y_shunt = 1j * self._b_shunt[rows] / 2
+        tap = self._tap[rows]
+
+        yprim = np.empty(np.shape(y) + (2, 2), dtype=complex)
+        yprim[..., 0, 0] = (y + y_shunt) / tap**2
+        yprim[..., 0, 1] = -y / tap
+        yprim[..., 1, 0] = -y / tap
+        yprim[..., 1, 1] = y + y_shunt
+        return yprim
+
+    def __len__(self):
+        return self.size
@@ -0,0 +1,245 @@
+import itertools
+import os
+import re
+import warnings
+import numpy as np
+import pandas as pd
+from branch_table import TRANSFORMER, TRANSMISSION_LINE
+from circuit import Circuit
+from settings import Settings, current_settings
+
+# MATPOWER column positions of the fields used to build a circuit
+BUS_COLUMNS = {"bus_i": 0, "type": 1, "Pd": 2, "Qd": 3, "Gs": 4, "Bs": 5, "Vm": 7, "Va": 8, "baseKV": 9}
+GEN_COLUMNS = {"bus": 0, "Pg": 1, "Qg": 2, "Qmax": 3, "Qmin": 4, "Vg": 5, "status": 7}
+BRANCH_COLUMNS = {"fbus": 0, "tbus": 1, "r": 2, "x": 3, "b": 4, "rateA": 5, "ratio": 8, "angle": 9, "status": 10}
+
+# IEEE common data format columns after the bus name (the number is prepended as column 0)
+CDF_BUS_COLUMNS = {"bus_i": 0, "type": 3, "Vm": 4, "Va": 5, "Pd": 6, "Qd": 7, "Pg": 8, "Qg": 9, "baseKV": 10,
+                   "Vg": 11, "Qmax": 12, "Qmin": 13, "Gs": 14, "Bs": 15}
+CDF_BRANCH_COLUMNS = {"fbus": 0, "tbus": 1, "r": 6, "x": 7, "b": 8, "rateA": 9, "ratio": 14, "angle": 15}
+
+# Values of fields that CSV cases may leave out
+DEFAULTS = {"Gs": 0.0, "Bs": 0.0, "Vm": 1.0, "Va": 0.0, "Qg": 0.0, "Qmax": np.inf, "Qmin": -np.inf, "Vg": 1.0,
+            "status": 1.0, "b": 0.0, "rateA": 0.0, "ratio": 0.0, "angle": 0.0}
+
+BUS_TYPES = {1: 'PQ Bus', 2: 'PV Bus', 3: 'Slack Bus'}
+
+def import_case(path, name=None):
+    """
+    Read a power flow case and build a Circuit from it
+
+    Parameters:
+        path: MATPOWER case file (.m), directory of CSV files (bus.csv, branch.csv and
+              optionally gen.csv with MATPOWER column names) or one of its CSV files,
+              or IEEE common data format file
+        name: Circuit name (defaults to the file name)
+
+    Returns:
+        circuit: Circuit with buses, loads, shunts, generators and branches (Y-bus not calculated)
+    """
+    if path.endswith(".csv"):
+        path = os.path.dirname(os.path.abspath(path))
+    if name is None:
+        name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+    if os.path.isdir(path):
+        case = read_csv_case(os.path.join(path, "bus.csv"), os.path.join(path, "branch.csv"),
+                             os.path.join(path, "gen.csv") if os.path.exists(os.path.join(path, "gen.csv")) else None)
+    elif path.endswith(".m"):
+        case = read_matpower(path)
+    else:
+        case = read_ieee_cdf(path)
+
+    return build_circuit(case, name)
+
+def read_matpower(path):
+    """
+    Read the bus, gen and branch matrices of a MATPOWER case file
+
+    The file is read line by line; each matrix is parsed straight into float
+    arrays, so rows never exist as lists of Python numbers.
+
+    Returns:
+        case: Dictionary with base_power and bus, gen and branch field arrays
+    """
+    sections = {"bus": BUS_COLUMNS, "gen": GEN_COLUMNS, "branch": BRANCH_COLUMNS}
+    case = {"base_power": 100.0}
+
+    with open(path) as f:
+        for line in f:
+            match = re.match(r'\s*mpc\.(\w+)\s*=\s*(.*)', line.split('%', 1)[0])
+            if match is None:
+                continue
+            field, value = match.groups()
+            if field == "baseMVA":
+                case["base_power"] = float(value.strip().rstrip(';'))
+            elif field in sections and value.startswith('['):
+                case[field] = _read_table(_matrix_rows(value[1:], f), sections[field])
+
+    for field in sections:
+        if field not in case:
+            raise ValueError(f"MATPOWER case {path} has no mpc.{field} matrix")
+    return case
+
+def read_ieee_cdf(path):
+    """
+    Read the bus and branch data of an IEEE common data format case
+
+    Generators are taken from the PV and swing bus records. Generation at other
+    buses is netted against their load.
+
+    Returns:
+        case: Dictionary with base_power and bus, gen and branch field arrays
+    """
+    case = {}
+    with open(path) as f:
+        header = next(f)
+        # MVA base in columns 32-37; some archives drop the leading blank of column 1
+        case["base_power"] = float(header[30:37])
+        for line in f:
+            if line.startswith("BUS DATA FOLLOWS"):
+                # The bus name (columns 6-17) may contain spaces, so it is cut out
+                case["bus"] = _read_table((row[:4] + " " + row[18:] for row in _cdf_rows(f)), CDF_BUS_COLUMNS)
+            elif line.startswith("BRANCH DATA FOLLOWS"):
+                case["branch"] = _read_table(_cdf_rows(f), CDF_BRANCH_COLUMNS)
+
+    if "bus" not in case or "branch" not in case:
+        raise ValueError(f"IEEE common data format case {path} needs bus and branch data")
+
+    bus, branch = case["bus"], case["branch"]
+    base_power = case["base_power"]
+
+    # Types 0 and 1 are load buses, 2 generator (PV) buses and 3 the swing bus
+    is_gen = bus["type"] >= 2
+    bus["type"] = np.where(is_gen, bus["type"], 1)
+    bus["Pd"] = bus["Pd"] - np.where(is_gen, 0, bus["Pg"])
+    bus["Qd"] = bus["Qd"] - np.where(is_gen, 0, bus["Qg"])
+    # Shunt conductance and susceptance are given in per unit
+    bus["Gs"] = bus["Gs"] * base_power
+    bus["Bs"] = bus["Bs"] * base_power
+
+    case["gen"] = {
+        "bus": bus["bus_i"][is_gen],
+        "Pg": bus["Pg"][is_gen],
+        "Qg": bus["Qg"][is_gen],
+        "Qmax": bus["Qmax"][is_gen],
+        "Qmin": bus["Qmin"][is_gen],
+        "Vg": np.where(bus["Vg"][is_gen] > 0, bus["Vg"][is_gen], bus["Vm"][is_gen]),
+        "status": np.ones(int(np.sum(is_gen)))
+    }
+    branch["status"] = np.ones(len(branch["fbus"]))
+    return case
+
+def read_csv_case(bus_path, branch_path, gen_path=None, base_power=100.0):
+    """
+    Read a case stored as CSV files with MATPOWER column names as headers
+
+    Required columns are bus_i, type, Pd, Qd, baseKV (buses), fbus, tbus, r, x
+    (branches) and bus, Pg (generators); other fields take MATPOWER defaults.
+
+    Returns:
+        case: Dictionary with base_power and bus, gen and branch field arrays
+    """
+    case = {
+        "base_power": base_power,
+        "bus": _read_csv(bus_path, BUS_COLUMNS, ["bus_i", "type", "Pd", "Qd", "baseKV"]),
+        "branch": _read_csv(branch_path, BRANCH_COLUMNS, ["fbus", "tbus", "r", "x"])
+    }
+    if gen_path is None:
+        case["gen"] = {field: np.empty(0) for field in GEN_COLUMNS}
+    else:
+        case["gen"] = _read_csv(gen_path, GEN_COLUMNS, ["bus", "Pg"])
+    return case
+
+def build_circuit(case, name="Imported Case"):
+    """
+    Build a Circuit from case field arrays (see read_matpower)
+
+    Isolated buses (type 4), out of service generators and branches, and
+    branches to isolated buses are left out. PV buses without a generator are
+    solved as PQ buses, and generators get the default UI machine reactances.
+
+    Returns:
+        circuit: Circuit in the case's base power (Y-bus not calculated)
+    """
+    bus, gen, branch = case["bus"], case["gen"], case["branch"]
+    circuit = Circuit(name, Settings(current_settings().frequency, case["base_power"]))
+
+    numbers = bus["bus_i"].astype(int)
+    types = bus["type"].astype(int)
+    keep = types != 4
+    gen_on = (gen["status"] > 0) & np.isin(gen["bus"], numbers[keep])
+    branch_on = (branch["status"] > 0) & np.isin(branch["fbus"], numbers[keep]) & np.isin(branch["tbus"], numbers[keep])
+    types[(types == 2) & ~np.isin(numbers, gen["bus"][gen_on])] = 1
+
+    # Case bus numbers -> positions in the bus arrays
+    order = np.argsort(numbers)
+    def position(bus_numbers):
+        return order[np.searchsorted(numbers[order], bus_numbers.astype(int))]
+
+    names = np.array([f"Bus{number}" for number in numbers], dtype=object)
+    circuit.add_buses(names[keep], bus["baseKV"][keep], [BUS_TYPES[bus_type] for bus_type in types[keep]])
+    for k in np.flatnonzero(keep):
+        circuit.buses[names[k]].vpu = bus["Vm"][k]
+
+    for k in np.flatnonzero(keep & ((bus["Pd"] != 0) | (bus["Qd"] != 0))):
+        circuit.add_load(f"Load{numbers[k]}", names[k], bus["Pd"][k], bus["Qd"][k])
+
+    for k in np.flatnonzero(keep & ((bus["Gs"] != 0) | (bus["Bs"] != 0))):
+        circuit.add_shunt(names[k], bus["Gs"][k], bus["Bs"][k])
+
+    gen_bus = position(gen["bus"])
+    for k in np.flatnonzero(gen_on):
+        # Equal (e.g. both zero) reactive limits mean the case gives no limits
+        limited = gen["Qmax"][k] > gen["Qmin"][k]
+        bus_name = names[gen_bus[k]]
+        circuit.add_generator(f"Gen{k + 1}", bus_name, gen["Vg"][k], gen["Pg"][k], 0.12, 0.14, 0.05, 0,
+                              gen["Qmin"][k] if limited else None, gen["Qmax"][k] if limited else None)
+        if circuit.buses[bus_name].bus_type == 'PQ Bus':
+            circuit.buses[bus_name].reactive_power += gen["Qg"][k]
+
+    rows = np.flatnonzero(branch_on)
+    from_bus, to_bus = position(branch["fbus"][rows]), position(branch["tbus"][rows])
+    impedance = branch["r"][rows] + 1j * branch["x"][rows]
+    if np.any(impedance == 0):
+        raise ValueError("Zero impedance branches are not supported")
+    if np.any(branch["angle"][rows] != 0):
+        warnings.warn("Phase shifting transformers are imported without their phase shift")
+
+    ratio = branch["ratio"][rows]
+    is_transformer = (ratio != 0) | (bus["baseKV"][from_bus] != bus["baseKV"][to_bus])
+    branch_names = [f"{'T' if transformer else 'L'}{k + 1}" for k, transformer in zip(rows, is_transformer)]
+    circuit.add_branches(branch_names, names[from_bus], names[to_bus], 1 / impedance, branch["b"][rows],
+                         np.where(ratio != 0, ratio, 1.0), np.where(is_transformer, TRANSFORMER, TRANSMISSION_LINE),
+                         branch["rateA"][rows])
+    return circuit
+
+def _read_table(rows, columns):
+    # Parse whitespace separated rows straight into one float array per field
+    data = np.loadtxt(rows, usecols=list(columns.values()), ndmin=2)
+    return {field: data[:, k] for k, field in enumerate(columns)}
+
+def _read_csv(path, columns, required):
+    data = pd.read_csv(path, skipinitialspace=True, usecols=lambda column: column.strip() in columns)
+    data.columns = [column.strip() for column in data.columns]
+    missing = [field for field in required if field not in data.columns]
+    if missing:
+        raise ValueError(f"{path} is missing the columns {missing}")
+    return {field: data[field].to_numpy(dtype=float) if field in data.columns else np.full(len(data), DEFAULTS[field])
+            for field in columns}
+
+def _matrix_rows(first, lines):
+    # Rows of a MATPOWER matrix literal from its opening line up to the closing bracket
+    for line in itertools.chain([first], lines):
+        line = line.split('%', 1)[0]
+        for row in line.split(']', 1)[0].replace(',', ' ').split(';'):
+            if row.strip():
+                yield row
+        if ']' in line:
+            return
+
+def _cdf_rows(lines):
+    # Records of an IEEE common data format section up to its -999 terminator
+    for line in lines:
+        if line.lstrip().startswith("-9"):
+            return
+        yield line
@@ -1,3 +1,4 @@
+from branch_table import BranchTable, TRANSFORMER, TRANSMISSION_LINE
 from bundle import Bundle
 from bus import Bus
 from conductor import Conductor
@@ -5,21 +6,34 @@ from geometry import Geometry
 from transformer import Transformer
 from transmissionline import TransmissionLine
 from load import Load
+from settings import Settings, current_settings, use_settings
 from generator import Generator
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 class Circuit:
-    def __init__(self, name: str):
+    def __init__(self, name: str, settings: Settings = None):
         self.name = name
+        # Each circuit keeps its own base power and frequency (a copy of the active settings by default)
+        if settings is None:
+            active = current_settings()
+            settings = Settings(active.frequency, active.base_power)
+        self.settings = settings
         self.bundles = dict()
         self.buses = dict()
+        self.bus_index = dict()
         self.conductors = dict()
         self.geometries = dict()
         self.transformers = dict()
         self.transmission_lines = dict()
         self.loads = dict()
         self.generators = dict()
+        self.branches = BranchTable()
+        self.shunts = dict()  # {bus name: admittance to ground in per unit}
         self.ybus = None
+        self._ybus_df = None
+        self.solved_state = None
 
     def add_bundle(self, name, num_conductors, spacing, conductor):
         bundle_obj = Bundle(name, num_conductors, spacing, self.conductors[conductor])
@@ -27,7 +41,16 @@ class Circuit:
 
     def add_bus(self, name, base_kv):
         bus_obj = Bus(name, base_kv)
+        # Dense per-circuit numbering; redefining a bus keeps its position
+        bus_obj.index = self.bus_index.setdefault(name, len(self.bus_index))
         self.buses[name] = bus_obj
+
+    def add_buses(self, names, base_kv, bus_types=None):
+        # Bulk form of add_bus for imported cases
+        for k, name in enumerate(names):
+            self.add_bus(name, base_kv[k])
+            if bus_types is not None:
+                self.buses[name].bus_type = bus_types[k]
         
     def add_conductor(self, name, diam, GMR, resistance, ampacity):
         conductor_obj = Conductor(name, diam, GMR, resistance, ampacity)
@@ -38,13 +61,51 @@ class Circuit:
         self.geometries[name] = geometry_obj
     
     def add_transformer(self, name, bus1, bus2, power_rating, impedance_percent, x_over_r_ratio):
-        transformer_obj = Transformer(name, self.buses[bus1], self.buses[bus2], power_rating, impedance_percent, x_over_r_ratio)
+        with use_settings(self.settings):
+            transformer_obj = Transformer(name, self.buses[bus1], self.buses[bus2], power_rating, impedance_percent, x_over_r_ratio)
+        self.add_branch(transformer_obj, transformer_obj.ypu, 0.0, TRANSFORMER, power_rating)
         self.transformers[name] = transformer_obj
     
     def add_transmission_line(self, name, bus1, bus2, bundle, conductor, geometry, length):
-        transmission_line_obj = TransmissionLine(name, self.buses[bus1], self.buses[bus2], self.bundles[bundle], self.conductors[conductor], self.geometries[geometry], length)
+        with use_settings(self.settings):
+            transmission_line_obj = TransmissionLine(name, self.buses[bus1], self.buses[bus2], self.bundles[bundle], self.conductors[conductor], self.geometries[geometry], length)
+        # Thermal rating of the bundle at the line voltage in MVA
+        bundle_obj = self.bundles[bundle]
+        rating = np.sqrt(3) * self.buses[bus1].base_kv * self.conductors[conductor].ampacity * bundle_obj.num_conductors / 1000
+        self.add_branch(transmission_line_obj, transmission_line_obj.ypu, transmission_line_obj.bpu, TRANSMISSION_LINE, rating)
         self.transmission_lines[name] = transmission_line_obj
 
+    def add_branch(self, component, y_series, b_shunt, kind, rating=0.0):
+        # Store the branch parameters in the branch table and point the element at its row
+        row = self.branches.add(component.name, self.bus_index[component.bus1.name], self.bus_index[component.bus2.name],
+                                y_series, b_shunt, kind=kind, rating=rating)
+        component.branch_table = self.branches
+        component.branch_row = row
+
+    def add_branches(self, names, bus1, bus2, y_series, b_shunt=0.0, tap=1.0, kind=TRANSMISSION_LINE, rating=0.0):
+        """
+        Add branches given directly in per unit (e.g. from an imported case) as branch table rows
+
+        No Transformer or TransmissionLine objects are created for these branches.
+
+        Parameters:
+            names: Branch names
+            bus1, bus2: From and to bus names; the off-nominal tap is on the bus1 side
+            y_series: Series admittances (per unit)
+            b_shunt: Total line charging susceptances (per unit)
+            tap: Off-nominal turns ratios
+            kind: TRANSFORMER or TRANSMISSION_LINE (scalar or one per branch)
+            rating: Thermal ratings in MVA (0 when unrated)
+        """
+        from_index = np.array([self.bus_index[name] for name in bus1], dtype=int)
+        to_index = np.array([self.bus_index[name] for name in bus2], dtype=int)
+        self.branches.extend(names, from_index, to_index, y_series, b_shunt, tap, kind, rating)
+
+    def add_shunt(self, bus, conductance, susceptance):
+        # Constant admittance to ground: conductance MW drawn and susceptance MVAr injected at 1 pu voltage
+        admittance = (conductance + 1j * susceptance) / self.settings.base_power
+        self.shunts[bus] = self.shunts.get(bus, 0) + admittance
+
     def add_load(self, name, bus, real_power, reactive_power):
         self.loads[name] = Load(name, self.buses[bus], real_power, reactive_power)
         #needs to update the bus real and reactive power
@@ -52,51 +113,93 @@ class Circuit:
         self.buses[bus].real_power -= real_power
         self.buses[bus].reactive_power -= reactive_power
 
-    def add_generator(self, name, bus, voltage_setpoint, mw_setpoint, x1, x2, x0, zg):
-        self.generators[name] = Generator(name, self.buses[bus], voltage_setpoint, mw_setpoint, x1, x2, x0, zg)
+    def add_generator(self, name, bus, voltage_setpoint, mw_setpoint, x1, x2, x0, zg, q_min=None, q_max=None):
+        self.generators[name] = Generator(name, self.buses[bus], voltage_setpoint, mw_setpoint, x1, x2, x0, zg, q_min, q_max)
         self.buses[bus].real_power += mw_setpoint
 
-    def calc_ybus(self):
-        N = len(self.buses)
-
-        # Initialize ybus matrix
-        Ybus = pd.DataFrame(index=range(N), columns=range(N)).fillna(0 + 0j).infer_objects(copy=False)
+    def branch_names(self):
+        # Branch names in the order used by branch_arrays
+        return list(self.branches.names)
 
-        # Iterate through components
-        for component in list(self.transformers.values()) + list(self.transmission_lines.values()):
-            Yprim = component.yprim
-            bus1_name = component.bus1.name
-            bus2_name = component.bus2.name
+    def branch_arrays(self):
+        """
+        Transformer and transmission line data from the branch table
 
-            if bus1_name in self.buses and bus2_name in self.buses:
-                # Get indices for buses in Ybus DataFrame
-                bus1_index = list(self.buses.keys()).index(bus1_name)
-                bus2_index = list(self.buses.keys()).index(bus2_name)
+        Returns:
+            from_index: Integer array of from-bus positions in self.buses
+            to_index: Integer array of to-bus positions in self.buses
+            yprim: Complex array of shape (branches, 2, 2)
+        """
+        return self.branches.from_index.copy(), self.branches.to_index.copy(), self.branches.yprim()
 
-                # Add self-admittances
-                Ybus.iloc[bus1_index, bus1_index] += Yprim[0, 0]
-                Ybus.iloc[bus2_index, bus2_index] += Yprim[1, 1]
+    def calc_ybus(self):
+        """
+        Assemble the bus admittance matrix as a sparse CSR matrix
+
+        Branch primitives are computed from the branch table columns and
+        scattered into the matrix in a single COO -> CSR pass; duplicate
+        (row, col) entries from parallel branches are summed by the conversion.
+        Bus shunts are added to the diagonal.
+        """
+        N = len(self.buses)
+        from_index, to_index, yprim = self.branch_arrays()
 
-                # Add mutual admittances
-                Ybus.iloc[bus1_index, bus2_index] += Yprim[0, 1]
-                Ybus.iloc[bus2_index, bus1_index] += Yprim[1, 0]
-            else:
-                raise KeyError(f"Buses {bus1_name} or {bus2_name} not found in self.buses.")
+        Ybus = assemble_ybus(N, from_index, to_index, yprim)
+        if self.shunts:
+            Ybus = (Ybus + sparse.diags(self.shunt_admittance())).tocsr()
 
-        for i in range(N):
-            if Ybus.iloc[i, i] == 0:
-                raise ValueError(f"Bus {list(self.buses.keys())[i]} has no self-admittance")
+        isolated = np.flatnonzero(Ybus.diagonal() == 0)
+        if isolated.size:
+            raise ValueError(f"Bus {list(self.buses.keys())[isolated[0]]} has no self-admittance")
 
         self.ybus = Ybus
+        self._ybus_df = None
+
+    def shunt_admittance(self):
+        # Bus shunt admittances (per unit) as an array in bus order
+        admittance = np.zeros(len(self.buses), dtype=complex)
+        for name, shunt in self.shunts.items():
+            admittance[self.bus_index[name]] += shunt
+        return admittance
+
+    @property
+    def ybus_df(self):
+        """Dense DataFrame view of the Y-bus labelled by bus name (built on first access)"""
+        if self.ybus is None:
+            return None
+        if self._ybus_df is None:
+            names = list(self.buses.keys())
+            self._ybus_df = pd.DataFrame(self.ybus.toarray(), index=names, columns=names)
+        return self._ybus_df
 
     def print_ybus(self):
         if self.ybus is not None:
             with pd.option_context('display.max_rows', 50, 'display.max_columns', 50):
                 print("Y-Bus Matrix")
-                print(self.ybus)
+                print(self.ybus_df)
         else:
             print("Y-Bus not calculated")
 
+
+def assemble_ybus(num_buses, from_index, to_index, yprim):
+    """
+    Build a sparse admittance matrix from branch arrays
+
+    Parameters:
+        num_buses: Number of buses (matrix dimension)
+        from_index: Integer array of from-bus indices, one per branch
+        to_index: Integer array of to-bus indices, one per branch
+        yprim: Complex array of shape (branches, 2, 2) with each branch's primitive admittance
+
+    Returns:
+        ybus: scipy.sparse CSR matrix of shape (num_buses, num_buses)
+    """
+    rows = np.concatenate((from_index, to_index, from_index, to_index))
+    cols = np.concatenate((from_index, to_index, to_index, from_index))
+    data = np.concatenate((yprim[:, 0, 0], yprim[:, 1, 1], yprim[:, 0, 1], yprim[:, 1, 0]))
+
+    return sparse.coo_matrix((data, (rows, cols)), shape=(num_buses, num_buses), dtype=complex).tocsr()
+
 if __name__ == '__main__':
     circuit = Circuit("Test Circuit")
 
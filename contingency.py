@@ -0,0 +1,200 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from circuit import Circuit
+from powerflow import PowerFlow, calc_branch_powers
+from solution import Solution
+
+# Base case arrays shared by every outage solved in a worker process
+_base_case = None
+
+
+class ContingencyAnalysis:
+
+    def __init__(self, circuit: Circuit, v_min: float = 0.95, v_max: float = 1.05,
+                 tol: float = 0.001, max_iter: int = 20, workers=None):
+        """
+        N-1 contingency screening over transformers and transmission lines
+
+        Every outage is screened for bus voltage limits and for branch thermal
+        overloads (end MVA above the branch rating; unrated branches are skipped).
+
+        Parameters:
+            circuit: Circuit with its Y-bus calculated
+            v_min, v_max: Bus voltage limits (per unit)
+            tol: Power flow convergence tolerance
+            max_iter: Maximum Newton iterations per outage
+            workers: Number of worker processes (defaults to the CPU count; 1 runs in-process)
+        """
+        self.circuit = circuit
+        self.v_min = v_min
+        self.v_max = v_max
+        self.tol = tol
+        self.max_iter = max_iter
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.base_results = None
+        self.summary = None
+
+    def run(self, outages=None):
+        """
+        Solve the base case, then every single-element outage warm-started from it
+
+        Parameters:
+            outages: Optional list of branch names to take out (defaults to every
+                     transformer and transmission line)
+
+        Returns:
+            violations: DataFrame with one row per violation (outage, element_type, bus,
+                        branch, violation, value, limit); voltage rows give per unit
+                        values, overload rows the branch MVA and rating
+        """
+        if self.circuit.ybus is None:
+            self.circuit.calc_ybus()
+
+        powerflow = PowerFlow(self.circuit)
+        self.base_results = powerflow.solve_circuit(self.circuit, tol=self.tol)
+        if not self.base_results["converged"]:
+            raise RuntimeError("Base case power flow did not converge")
+
+        solution = Solution("ContingencyBase", list(self.circuit.buses.values()), self.circuit, self.circuit.loads)
+        solution.start()
+
+        branch_names = self.circuit.branch_names()
+        from_index, to_index, yprim = self.circuit.branch_arrays()
+        base_case = {
+            "ybus": self.circuit.ybus,
+            "y_spec": solution.y,
+            "v_ang": self.base_results["v_ang"],
+            "v_mag": self.base_results["v_mag"],
+            "pvpq_index": solution.pvpq_index,
+            "pq_index": solution.pq_index,
+            "from_index": from_index,
+            "to_index": to_index,
+            "yprim": yprim,
+            "tol": self.tol,
+            "max_iter": self.max_iter,
+            "base_power": self.circuit.settings.base_power,
+            "sparse_threshold": powerflow.linear_solver.sparse_threshold
+        }
+
+        if outages is None:
+            outages = branch_names
+        positions = [branch_names.index(name) for name in outages]
+
+        if self.workers == 1 or len(positions) < 2:
+            _init_worker(base_case)
+            outcomes = [_solve_outage(k) for k in positions]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(base_case,)) as executor:
+                outcomes = list(executor.map(_solve_outage, positions, chunksize=max(1, len(positions) // (4 * self.workers))))
+
+        return self._tabulate(outages, outcomes)
+
+    def _tabulate(self, outages, outcomes):
+        bus_names = np.array(list(self.circuit.buses.keys()))
+        branch_names = np.array(self.circuit.branch_names())
+        rating = self.circuit.branches.rating
+        summary_rows = []
+        violation_rows = []
+
+        # Imported branches have no element objects, so the branch table gives their kind
+        is_transformer = dict(zip(self.circuit.branch_names(), self.circuit.branches.is_transformer))
+
+        for name, outcome in zip(outages, outcomes):
+            element_type = "Transformer" if is_transformer[name] else "Transmission Line"
+            converged = outcome["converged"]
+            v_mag = outcome["v_mag"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                loading = np.where(rating > 0, 100 * outcome["s_max"] / rating, np.nan)
+
+            summary_rows.append({
+                "outage": name,
+                "element_type": element_type,
+                "converged": converged,
+                "iterations": outcome["iterations"],
+                "min_voltage": np.min(v_mag) if converged else np.nan,
+                "max_voltage": np.max(v_mag) if converged else np.nan,
+                "max_loading": np.nanmax(loading) if converged and np.any(rating > 0) else np.nan
+            })
+
+            if not converged:
+                violation_rows.append({"outage": name, "element_type": element_type, "bus": None, "branch": None,
+                                       "violation": outcome["status"], "value": np.nan, "limit": np.nan})
+                continue
+
+            for k in np.flatnonzero(v_mag < self.v_min):
+                violation_rows.append({"outage": name, "element_type": element_type, "bus": bus_names[k],
+                                       "branch": None, "violation": "low voltage", "value": v_mag[k],
+                                       "limit": self.v_min})
+            for k in np.flatnonzero(v_mag > self.v_max):
+                violation_rows.append({"outage": name, "element_type": element_type, "bus": bus_names[k],
+                                       "branch": None, "violation": "high voltage", "value": v_mag[k],
+                                       "limit": self.v_max})
+            for k in np.flatnonzero(loading > 100):
+                violation_rows.append({"outage": name, "element_type": element_type, "bus": None,
+                                       "branch": branch_names[k], "violation": "overload",
+                                       "value": outcome["s_max"][k], "limit": rating[k]})
+
+        self.summary = pd.DataFrame(summary_rows)
+        return pd.DataFrame(violation_rows,
+                            columns=["outage", "element_type", "bus", "branch", "violation", "value", "limit"])
+
+
+def outage_ybus(ybus, from_index, to_index, yprim):
+    """
+    Rank-2 update removing one branch from a Y-bus
+
+    Parameters:
+        ybus: Base case sparse Y-bus
+        from_index, to_index: Bus positions of the branch ends
+        yprim: The branch's 2 x 2 primitive admittance
+
+    Returns:
+        ybus: Sparse CSR Y-bus without the branch
+    """
+    rows = [from_index, from_index, to_index, to_index]
+    cols = [from_index, to_index, from_index, to_index]
+    data = [yprim[0, 0], yprim[0, 1], yprim[1, 0], yprim[1, 1]]
+    update = sparse.csr_matrix((data, (rows, cols)), shape=ybus.shape, dtype=complex)
+    ybus = (ybus - update).tocsr()
+
+    # Drop the entries cancelled by the update so the sparsity pattern shows the new topology
+    ybus.data[np.abs(ybus.data) < 1e-10] = 0
+    ybus.eliminate_zeros()
+    return ybus
+
+
+def _init_worker(base_case):
+    global _base_case
+    _base_case = base_case
+
+
+def _solve_outage(k):
+    base = _base_case
+    ybus = outage_ybus(base["ybus"], base["from_index"][k], base["to_index"][k], base["yprim"][k])
+
+    no_flows = np.zeros(len(base["from_index"]))
+    n_islands = connected_components(abs(ybus), directed=False, return_labels=False)
+    if n_islands > 1:
+        return {"converged": False, "iterations": 0, "v_mag": base["v_mag"], "s_max": no_flows, "status": "islanded"}
+
+    powerflow = PowerFlow(None, base["sparse_threshold"])
+    try:
+        state = powerflow.newton_raphson(ybus, base["y_spec"], base["v_ang"], base["v_mag"],
+                                         base["pvpq_index"], base["pq_index"], base["tol"], base["max_iter"])
+    except (np.linalg.LinAlgError, RuntimeError, ValueError):
+        return {"converged": False, "iterations": 0, "v_mag": base["v_mag"], "s_max": no_flows, "status": "singular"}
+
+    # Post-outage end MVA of every branch; the outaged branch carries nothing
+    V = state["v_mag"] * np.exp(1j * state["v_ang"])
+    s_from, s_to = calc_branch_powers(V, base["from_index"], base["to_index"], base["yprim"])
+    s_max = np.maximum(np.abs(s_from), np.abs(s_to)) * base["base_power"]
+    s_max[k] = 0.0
+
+    status = "converged" if state["converged"] else "diverged"
+    return {"converged": state["converged"], "iterations": state["iterations"],
+            "v_mag": state["v_mag"], "s_max": s_max, "status": status}
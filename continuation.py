@@ -0,0 +1,190 @@
+import numpy as np
+from scipy import sparse
+from circuit import Circuit
+from powerflow import PowerFlow
+from solution import Solution, calc_injections
+
+class ContinuationPowerFlow:
+
+    def __init__(self, circuit: Circuit, direction=None, sparse_threshold=100):
+        """
+        Predictor-corrector continuation power flow for PV (nose) curves
+
+        Loads in circuit.loads are scaled as P(lambda) = P * (1 + lambda * w) and
+        Q(lambda) = Q * (1 + lambda * w), with the slack bus picking up the change.
+
+        Parameters:
+            circuit: Circuit with its Y-bus calculated
+            direction: Optional {load name: weight w}; loads not listed keep w = 0.
+                       Defaults to w = 1 for every load (uniform load growth)
+            sparse_threshold: Augmented systems with more unknowns than this use sparse LU
+        """
+        self.circuit = circuit
+        if circuit.ybus is None:
+            circuit.calc_ybus()
+
+        self.powerflow = PowerFlow(circuit, sparse_threshold)
+        self.solution = Solution("ContinuationSolution", list(circuit.buses.values()), circuit, circuit.loads)
+        self.solution.start("flat")
+        self.pvpq_index = self.solution.pvpq_index
+        self.pq_index = self.solution.pq_index
+
+        if direction is None:
+            direction = {name: 1.0 for name in circuit.loads}
+        self.direction = self.calc_direction(direction)
+        self.weights = {name: direction.get(name, 0.0) for name in circuit.loads}
+
+    def calc_direction(self, direction):
+        # Change in the specified [P(pvpq); Q(pq)] per unit of lambda
+        n = len(self.circuit.buses)
+        dp = np.zeros(n)
+        dq = np.zeros(n)
+        for name, weight in direction.items():
+            load = self.circuit.loads[name]
+            k = self.circuit.bus_index[load.bus.name]
+            dp[k] -= weight * load.real_power
+            dq[k] -= weight * load.reactive_power
+        base_power = self.circuit.settings.base_power
+        return np.concatenate((dp[self.pvpq_index], dq[self.pq_index])) / base_power
+
+    def trace(self, step_size=0.1, min_step=1e-4, max_step=1.0, tol=1e-6, max_iter=10,
+              max_steps=200, stop_after_nose=True, initializer="auto"):
+        """
+        Trace the PV curve, yielding each point as soon as its corrector converges
+
+        The continuation parameter starts as lambda and switches to the unknown
+        with the largest tangent component near the nose. The step grows after
+        quick corrector convergence and halves after a failed corrector.
+
+        Parameters:
+            step_size: Initial predictor step length
+            min_step, max_step: Step length bounds; the trace stops below min_step
+            tol: Corrector convergence tolerance (per unit mismatch)
+            max_iter: Maximum corrector iterations per point
+            max_steps: Maximum number of points after the base case
+            stop_after_nose: Stop at the first point past the nose; otherwise continue
+                             down the lower branch until lambda returns to zero
+            initializer: Starting point for the base case solve (see Solution.start)
+
+        Yields:
+            point: Dictionary with step, lambda, load_scale ({load name: 1 + lambda * w}),
+                   total_load (MW of all loads at this lambda), v_mag, v_ang, step_size,
+                   corrector_iterations and parameter (index of the continuation unknown,
+                   -1 for lambda)
+        """
+        y_spec = self.solution.y
+
+        angles, voltages = self.solution.initial_state(initializer)
+        base = self.powerflow.newton_raphson(self.circuit.ybus, y_spec, angles, voltages,
+                                             self.pvpq_index, self.pq_index, tol, 50,
+                                             buses=list(self.circuit.buses.values()))
+        if not base["converged"]:
+            raise RuntimeError("Base case power flow did not converge")
+
+        x = np.concatenate((base["v_ang"][self.pvpq_index], base["v_mag"][self.pq_index], [0.0]))
+        angles, voltages = base["v_ang"], base["v_mag"]
+        yield self._point(0, x[-1], angles, voltages, step_size, base["iterations"], -1)
+
+        parameter, sign = len(x) - 1, 1.0
+        column_order = None
+        passed_nose = False
+
+        for step in range(1, max_steps + 1):
+            # Predictor: tangent of F(x, lambda) = 0 with the continuation component set to +/-1
+            A = self._augmented_jacobian(angles, voltages, parameter)
+            solve, _ = self.powerflow.linear_solver.factorize(A, column_order)
+            column_order = self.powerflow.linear_solver.column_order
+            rhs = np.zeros(len(x))
+            rhs[-1] = sign
+            tangent = solve(rhs)
+            tangent /= np.linalg.norm(tangent)
+
+            # Follow the unknown changing fastest; the sign keeps the direction of travel
+            new_parameter = int(np.argmax(np.abs(tangent)))
+            if new_parameter != parameter:
+                parameter = new_parameter
+                column_order = None
+            sign = np.sign(tangent[parameter])
+
+            while True:
+                x_predicted = x + step_size * tangent
+                corrected, iterations = self._correct(x_predicted, parameter, y_spec, tol, max_iter, angles, voltages,
+                                                      column_order)
+                if corrected is not None:
+                    break
+                step_size /= 2
+                if step_size < min_step:
+                    return
+
+            x = corrected
+            angles, voltages = self._state(x, angles, voltages)
+            yield self._point(step, x[-1], angles, voltages, step_size, iterations, parameter)
+
+            if tangent[-1] < 0:
+                passed_nose = True
+            if passed_nose and (stop_after_nose or x[-1] <= 0):
+                return
+
+            if iterations <= 3:
+                step_size = min(step_size * 1.5, max_step)
+
+    def _correct(self, x, parameter, y_spec, tol, max_iter, angles, voltages, column_order=None):
+        # Newton corrector with the continuation component held at its predicted value;
+        # the augmented pattern matches the predictor's, so its column order is reused
+        target = x[parameter]
+        x = x.copy()
+
+        for iteration in range(max_iter):
+            angles, voltages = self._state(x, angles, voltages)
+            P, Q = calc_injections(self.circuit.ybus, voltages * np.exp(1j * angles))
+            mismatch = y_spec + x[-1] * self.direction - np.concatenate((P[self.pvpq_index], Q[self.pq_index]))
+            residual = np.concatenate((mismatch, [target - x[parameter]]))
+            if np.max(np.abs(residual)) < tol:
+                return x, iteration + 1
+
+            A = self._augmented_jacobian(angles, voltages, parameter)
+            try:
+                solve, _ = self.powerflow.linear_solver.factorize(A, column_order)
+            except (np.linalg.LinAlgError, RuntimeError, ValueError):
+                return None, iteration + 1
+            column_order = self.powerflow.linear_solver.column_order
+            dx = solve(residual)
+            if not np.all(np.isfinite(dx)):
+                return None, iteration + 1
+            x += dx
+
+        return None, max_iter
+
+    def _augmented_jacobian(self, angles, voltages, parameter):
+        # [[J, -d], [e_parameter]] with J the power flow Jacobian at the current state
+        J = self.powerflow.jacobian.calc_jacobian_sparse(self.circuit.ybus, angles, voltages,
+                                                         self.pvpq_index, self.pq_index)
+        size = J.shape[0] + 1
+        row = sparse.csr_matrix(([1.0], ([0], [parameter])), shape=(1, size))
+        A = sparse.vstack((sparse.hstack((J, sparse.csr_matrix(-self.direction[:, None]))), row), format='csc')
+        if self.powerflow.linear_solver.use_sparse(size):
+            return A
+        return A.toarray()
+
+    def _state(self, x, angles, voltages):
+        # Scatter the unknown vector back into full bus angle and magnitude arrays
+        n_theta = len(self.pvpq_index)
+        angles = angles.copy()
+        voltages = voltages.copy()
+        angles[self.pvpq_index] = x[:n_theta]
+        voltages[self.pq_index] = x[n_theta:-1]
+        return angles, voltages
+
+    def _point(self, step, lam, angles, voltages, step_size, iterations, parameter):
+        return {
+            "step": step,
+            "lambda": lam,
+            "load_scale": {name: 1 + lam * weight for name, weight in self.weights.items()},
+            "total_load": sum(load.real_power * (1 + lam * self.weights[name])
+                              for name, load in self.circuit.loads.items()),
+            "v_mag": voltages,
+            "v_ang": angles,
+            "step_size": step_size,
+            "corrector_iterations": iterations,
+            "parameter": -1 if parameter == len(self.pvpq_index) + len(self.pq_index) else parameter
+        }
@@ -0,0 +1,152 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from circuit import Circuit
+
+class DCPowerFlow:
+
+    def __init__(self, circuit: Circuit):
+        """
+        Linear (DC) power flow and sensitivity factors for a circuit
+
+        Branch susceptances come from the series part of each branch yprim,
+        ignoring resistance and shunts. PTDF and LODF matrices are computed
+        on first use and cached; build a new DCPowerFlow after changing the
+        network topology.
+        """
+        self.circuit = circuit
+        self.bus_names = list(circuit.buses.keys())
+        self.branch_names = circuit.branch_names()
+        self.from_index, self.to_index, yprim = circuit.branch_arrays()
+
+        y_series = -yprim[:, 0, 1]
+        self.b_branch = 1 / np.imag(1 / y_series)
+
+        slack = [i for i, bus in enumerate(circuit.buses.values()) if bus.bus_type == 'Slack Bus']
+        self.slack_index = slack[0] if slack else 0
+        self.non_slack_index = np.array([i for i in range(len(self.bus_names)) if i != self.slack_index], dtype=int)
+
+        self.bbus, self.bf = self.calc_b_matrices()
+        self._lu = None
+        self._ptdf = None
+        self._lodf = None
+
+    def calc_b_matrices(self):
+        """
+        Returns:
+            bbus: Bus susceptance matrix (N x N, sparse CSR)
+            bf: Branch flow matrix (E x N, sparse CSR) so that branch flows = bf @ angles
+        """
+        n = len(self.bus_names)
+        e = len(self.branch_names)
+        branches = np.arange(e)
+
+        incidence = sparse.coo_matrix(
+            (np.concatenate((np.ones(e), -np.ones(e))),
+             (np.concatenate((branches, branches)), np.concatenate((self.from_index, self.to_index)))),
+            shape=(e, n)).tocsr()
+
+        bf = sparse.diags(self.b_branch) @ incidence
+        bbus = incidence.T @ bf
+        self.incidence = incidence
+
+        return bbus.tocsr(), bf.tocsr()
+
+    @property
+    def lu(self):
+        # Factorization of the slack-reduced B matrix, shared by every solve
+        if self._lu is None:
+            b_reduced = self.bbus[self.non_slack_index][:, self.non_slack_index]
+            self._lu = splu(b_reduced.tocsc())
+        return self._lu
+
+    @property
+    def ptdf(self):
+        """Power transfer distribution factors (E x N), slack bus column is zero"""
+        if self._ptdf is None:
+            rhs = self.bf[:, self.non_slack_index].T.toarray()
+            ptdf = np.zeros((len(self.branch_names), len(self.bus_names)))
+            if rhs.size:
+                ptdf[:, self.non_slack_index] = self.lu.solve(rhs).T
+            self._ptdf = ptdf
+        return self._ptdf
+
+    @property
+    def lodf(self):
+        """
+        Line outage distribution factors (E x E)
+
+        Column k is the change in every branch flow per unit of pre-outage flow
+        on branch k when k is removed. Columns of branches whose outage islands
+        the network are NaN.
+        """
+        if self._lodf is None:
+            h = self.ptdf @ self.incidence.T.toarray()
+            denominator = 1 - np.diag(h)
+            islanding = np.abs(denominator) < 1e-10
+            denominator[islanding] = np.nan
+            lodf = h / denominator
+            np.fill_diagonal(lodf, -1.0)
+            lodf[:, islanding] = np.nan
+            self._lodf = lodf
+        return self._lodf
+
+    def bus_injections(self):
+        # Net real power injection at every bus (MW) from the circuit loads and generators
+        return np.array([bus.real_power for bus in self.circuit.buses.values()], dtype=float)
+
+    def solve(self, injections=None):
+        """
+        Solve the DC power flow for one injection vector
+
+        Parameters:
+            injections: Net bus injections in MW (defaults to the circuit's loads and generators)
+
+        Returns:
+            results: Dictionary with bus angles (radians), branch flows (MW) and slack injection (MW)
+        """
+        if injections is None:
+            injections = self.bus_injections()
+        injections = np.asarray(injections, dtype=float)
+
+        angles = np.zeros(len(self.bus_names))
+        if len(self.non_slack_index):
+            angles[self.non_slack_index] = self.lu.solve(injections[self.non_slack_index] / self.circuit.settings.base_power)
+
+        flows = self.bf @ angles * self.circuit.settings.base_power
+
+        return {
+            "v_ang": angles,
+            "branch_flows": flows,
+            "slack_injection": -np.sum(np.delete(injections, self.slack_index))
+        }
+
+    def calc_flows(self, injections):
+        """
+        Branch flows for many injection scenarios with one matrix multiply
+
+        Parameters:
+            injections: Array of shape (N,) or (K, N) of net bus injections in MW
+
+        Returns:
+            flows: Array of shape (E,) or (K, E) of branch flows in MW
+        """
+        return np.asarray(injections, dtype=float) @ self.ptdf.T
+
+    def calc_outage_flows(self, flows, outages):
+        """
+        Post-contingency branch flows from pre-contingency flows using LODF
+
+        Parameters:
+            flows: Array of shape (E,) or (K, E) of pre-outage branch flows
+            outages: Sequence of branch positions to take out one at a time
+
+        Returns:
+            outage_flows: Array of shape (len(outages), E) or (K, len(outages), E)
+        """
+        flows = np.asarray(flows, dtype=float)
+        outages = np.asarray(outages, dtype=int)
+        lodf = self.lodf[:, outages]
+        outage_flows = flows[..., None, :] + flows[..., outages, None] * lodf.T
+        outage_flows[..., np.arange(len(outages)), outages] = 0.0
+        return outage_flows
@@ -1,10 +1,11 @@
 from numpy.linalg.lapack_lite import zgelsd
 
+import numpy as np
 from bus import Bus
 
 class Generator:
 
-    def __init__(self, name: str, bus: Bus, voltage_setpoint: float, mw_setpoint: float, x1 , x2, x0, zg ):
+    def __init__(self, name: str, bus: Bus, voltage_setpoint: float, mw_setpoint: float, x1 , x2, x0, zg, q_min=None, q_max=None):
         self.name = name
         self.bus = bus
         self.voltage_setpoint = voltage_setpoint
@@ -16,6 +17,9 @@ class Generator:
         self.y_bus_admittance = 1/(1j*x1)
         self.y2 = 1/(1j*x2)
         self.y0 = 1/(1j*x0+3*zg)
+        # Reactive power limits in MVAr (unlimited when not given)
+        self.q_min = -np.inf if q_min is None else q_min
+        self.q_max = np.inf if q_max is None else q_max
 
 if __name__ == '__main__':
     bus = Bus("Bus 1", 20)
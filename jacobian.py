@@ -1,8 +1,9 @@
 import numpy as np
 import pandas as pd
+from scipy import sparse
 from circuit import Circuit
 from bus import Bus
-from solution import Solution
+from solution import Solution, calc_bus_indices
 from settings import s
 from load import Load
 
@@ -12,78 +13,67 @@ class BusType:
     PQ = 3
 
 class Jacobian:
-    def __init__(self, circuit: Circuit):
+    def __init__(self, circuit: Circuit, mode: str = "vectorized"):
+        """
+        Parameters:
+            circuit: Circuit the Jacobian is built for
+            mode: "vectorized" builds the blocks from sparse diag(V), Ybus and diag(I)
+                  products; "loop" uses the element-by-element submatrix routines
+        """
+        if mode not in ("vectorized", "loop"):
+            raise ValueError(f"Unknown Jacobian mode: {mode}")
         self.circuit = circuit
+        self.mode = mode
 
-    def calc_jacobian(self, buses, ybus, angles, voltages):
+    def calc_jacobian(self, buses, ybus, angles, voltages, pvpq_index=None, pq_index=None):
         """
         Calculate the full Jacobian matrix for Newton-Raphson power flow
         
         Parameters:
-            buses: List of Bus objects
-            ybus: Complex admittance matrix (can be numpy array or pandas DataFrame)
+            buses: List of Bus objects (only read when the index sets are not given)
+            ybus: Complex admittance matrix (numpy array, pandas DataFrame or scipy sparse matrix)
             angles: Current voltage angles (radians)
             voltages: Current voltage magnitudes (per unit)
+            pvpq_index: Optional precomputed positions of non-slack buses
+            pq_index: Optional precomputed positions of PQ buses
             
         Returns:
             J: The complete Jacobian matrix with proper 2x2 block structure
         """
-        # Convert pandas DataFrame to numpy array if needed
+        if self.mode == "vectorized":
+            if pvpq_index is None or pq_index is None:
+                pvpq_index, pq_index = calc_bus_indices(buses)
+            return self.calc_jacobian_sparse(ybus, angles, voltages, pvpq_index, pq_index).toarray()
+
+        # Convert pandas DataFrame or sparse matrix to numpy array if needed
         if hasattr(ybus, 'values'):
             ybus = ybus.values
+        elif sparse.issparse(ybus):
+            ybus = ybus.toarray()
         
-        # Map string bus types to numeric types
-        bus_type_map = {
-            "Slack Bus": BusType.SLACK,
-            "PV Bus": BusType.PV,
-            "PQ Bus": BusType.PQ
-        }
-        
-        n = len(buses)
-        
-        # Create mapping between bus indices and their variables
-        p_index = []     # Buses that contribute to P equations (all except slack)
-        q_index = []     # Buses that contribute to Q equations (only PQ buses)
-        theta_index = [] # Buses whose theta is a variable (all except slack)
-        v_index = []     # Buses whose V is a variable (only PQ buses)
-        
-        for i, bus in enumerate(buses):
-            # Convert string bus type to numeric type if needed
-            bus_type = bus_type_map.get(bus.bus_type, bus.bus_type)
-            
-            if bus_type != BusType.SLACK:
-                p_index.append(i)
-                theta_index.append(i)
-            if bus_type == BusType.PQ:
-                q_index.append(i)
-                v_index.append(i)
+        # Unknowns follow the index sets passed in, so a PV bus switched to PQ
+        # under reactive limits gets its Q row and V column
+        if pvpq_index is None or pq_index is None:
+            pvpq_index, pq_index = calc_bus_indices(buses)
+        p_index = theta_index = list(pvpq_index)  # P equations and theta variables (all except slack)
+        q_index = v_index = list(pq_index)        # Q equations and V variables (PQ buses)
         
         # Calculate the size of each submatrix
         n_p = len(p_index)      # Number of P equations
         n_q = len(q_index)      # Number of Q equations
         n_theta = len(theta_index)  # Number of theta variables
-        n_v = len(v_index)      # Number of V variables
         
         # Calculate the total Jacobian size
         j_size = n_p + n_q
         
-        # Verify the dimensions match the expected formula
-        n_slack = sum(1 for bus in buses if bus_type_map.get(bus.bus_type, bus.bus_type) == BusType.SLACK)
-        n_pq = len(q_index)
-        
-        expected_size = (n - n_slack) + n_pq
-        
-        # Verify that our j_size calculation is correct
-        assert j_size == expected_size, f"Jacobian size mismatch: {j_size} != {expected_size}"
-        
         # Initialize the full Jacobian matrix
         J = np.zeros((j_size, j_size))
         
         # Calculate each submatrix using the correct partial derivatives
-        J1 = self._calc_j1(buses, ybus, angles, voltages, p_index, theta_index, bus_type_map)
-        J2 = self._calc_j2(buses, ybus, angles, voltages, p_index, v_index, bus_type_map)
-        J3 = self._calc_j3(buses, ybus, angles, voltages, q_index, theta_index, bus_type_map)
-        J4 = self._calc_j4(buses, ybus, angles, voltages, q_index, v_index, bus_type_map)
+        J1 = self._calc_j1(ybus, angles, voltages, p_index, theta_index)
+        J2 = self._calc_j2(ybus, angles, voltages, p_index, v_index)
+        J3 = self._calc_j3(ybus, angles, voltages, q_index, theta_index)
+        J4 = self._calc_j4(ybus, angles, voltages, q_index, v_index)
         
         # Fill the Jacobian with the submatrices
         # J1 (dP/dδ) - upper left block
@@ -100,6 +90,50 @@ class Jacobian:
         
         return J
     
+    def calc_jacobian_sparse(self, ybus, angles, voltages, pvpq_index, pq_index):
+        """
+        Calculate the Jacobian as a sparse matrix from complex voltage and current products
+
+        With V = |V| e^(j delta), I = Ybus V and diag(.) the sparse diagonal matrix:
+            dS/d delta = j diag(V) conj(diag(I) - Ybus diag(V))
+            dS/d|V|    = diag(V) conj(Ybus diag(V/|V|)) + conj(diag(I)) diag(V/|V|)
+        J1..J4 are the real and imaginary parts sliced by the PV/PQ index arrays, so
+        the cost scales with the number of Y-bus nonzeros instead of N^3.
+
+        Parameters:
+            ybus: Complex admittance matrix (numpy array, pandas DataFrame or scipy sparse matrix)
+            angles: Current voltage angles (radians)
+            voltages: Current voltage magnitudes (per unit)
+            pvpq_index: Positions of non-slack buses (P equations and angle unknowns)
+            pq_index: Positions of PQ buses (Q equations and magnitude unknowns)
+
+        Returns:
+            J: scipy.sparse CSR matrix [[J1, J2], [J3, J4]]
+        """
+        if hasattr(ybus, 'values'):
+            ybus = ybus.values
+        ybus = sparse.csr_matrix(ybus)
+
+        V = voltages * np.exp(1j * angles)
+        I = ybus @ V
+
+        diag_V = sparse.diags(V)
+        diag_I = sparse.diags(I)
+        diag_V_norm = sparse.diags(V / np.abs(V))
+
+        dS_dangle = 1j * diag_V @ (diag_I - ybus @ diag_V).conj()
+        dS_dvoltage = diag_V @ (ybus @ diag_V_norm).conj() + diag_I.conj() @ diag_V_norm
+
+        dS_dangle = dS_dangle.tocsr()
+        dS_dvoltage = dS_dvoltage.tocsr()
+
+        J1 = dS_dangle[pvpq_index][:, pvpq_index].real
+        J2 = dS_dvoltage[pvpq_index][:, pq_index].real
+        J3 = dS_dangle[pq_index][:, pvpq_index].imag
+        J4 = dS_dvoltage[pq_index][:, pq_index].imag
+
+        return sparse.bmat([[J1, J2], [J3, J4]], format='csr')
+
     # def calc_jacobian_with_solution(self, solution):
     #     """
     #     Calculate the Jacobian matrix using the Solution object
@@ -299,7 +333,7 @@ class Jacobian:
         
     #     return solution, iterations, converged
     
-    def _calc_j1(self, buses, ybus, angles, voltages, p_index, theta_index, bus_type_map):
+    def _calc_j1(self, ybus, angles, voltages, p_index, theta_index):
         """
         Calculate J1 submatrix (dP/dδ)
         
@@ -308,16 +342,12 @@ class Jacobian:
         n_p = len(p_index)
         n_theta = len(theta_index)
         j1 = np.zeros((n_p, n_theta))
-        all_buses = [bus for bus in self.circuit.buses.values() if bus.bus_type != 'Slack Bus']
-        bus_names = list(self.circuit.buses.values())
-        for i, bus_i in enumerate(all_buses):
-            k = bus_names.index(bus_i)
-            for j, bus_j in enumerate(all_buses):
-                l = bus_names.index(bus_j)
+        for i, k in enumerate(p_index):
+            for j, l in enumerate(theta_index):
                 if k == l:
                     # Diagonal elements (n = k case)
                     sum_term = 0
-                    for n in range(len(buses)):
+                    for n in range(len(voltages)):
                         if n != k:  # n ≠ k
                             # y_in = ybus[i, n]
                             y_in_abs = abs(ybus[k, n])
@@ -336,7 +366,7 @@ class Jacobian:
         
         return j1
     
-    def _calc_j2(self, buses, ybus, angles, voltages, p_index, v_index, bus_type_map):
+    def _calc_j2(self, ybus, angles, voltages, p_index, v_index):
         """
         Calculate J2 submatrix (dP/dV)
         
@@ -345,13 +375,8 @@ class Jacobian:
         n_p = len(p_index)
         n_v = len(v_index)
         j2 = np.zeros((n_p, n_v))
-        all_buses = [bus for bus in self.circuit.buses.values() if bus.bus_type != 'Slack Bus']
-        pq_buses = [bus for bus in self.circuit.buses.values() if bus.bus_type != 'Slack Bus' and bus.bus_type != "PV Bus"]
-        bus_names = list(self.circuit.buses.values())
-        for i, bus_i in enumerate(all_buses):
-            k = bus_names.index(bus_i)
-            for j, bus_j in enumerate(pq_buses):
-                l = bus_names.index(bus_j)
+        for i, k in enumerate(p_index):
+            for j, l in enumerate(v_index):
                 if k == l:
                     # Diagonal elements (n = k case)
                     sum_term = 0
@@ -361,7 +386,7 @@ class Jacobian:
                     theta_ii = np.angle(y_ii)
                     first_term = voltages[k] * y_ii_abs * np.cos(theta_ii)
 
-                    for n in range(len(buses)):
+                    for n in range(len(voltages)):
                         y_in = ybus[k, n]
                         y_in_abs = abs(y_in)
                         theta_in = np.angle(y_in)
@@ -379,7 +404,7 @@ class Jacobian:
         
         return j2
     
-    def _calc_j3(self, buses, ybus, angles, voltages, q_index, theta_index, bus_type_map):
+    def _calc_j3(self, ybus, angles, voltages, q_index, theta_index):
         """
         Calculate J3 submatrix (dQ/dδ)
         
@@ -388,18 +413,13 @@ class Jacobian:
         n_p = len(q_index)
         n_theta = len(theta_index)
         j3 = np.zeros((n_p, n_theta))
-        all_buses = [bus for bus in self.circuit.buses.values() if bus.bus_type != 'Slack Bus']
-        pq_buses = [bus for bus in self.circuit.buses.values() if bus.bus_type != 'Slack Bus' and bus.bus_type != "PV Bus"]
-        bus_names = list(self.circuit.buses.values())
-        for i, bus_i in enumerate(pq_buses):
-            k = bus_names.index(bus_i)
-            for j, bus_j in enumerate(all_buses):
-                l = bus_names.index(bus_j)
+        for i, k in enumerate(q_index):
+            for j, l in enumerate(theta_index):
                 if k == l:
                     # Diagonal elements (n = k case)
                     sum_term = 0
 
-                    for n in range(len(buses)):
+                    for n in range(len(voltages)):
                         if n != k:  # n ≠ k
                             y_in = ybus[k, n]
                             y_in_abs = abs(y_in)
@@ -418,7 +438,7 @@ class Jacobian:
         
         return j3
     
-    def _calc_j4(self, buses, ybus, angles, voltages, q_index, v_index, bus_type_map):
+    def _calc_j4(self, ybus, angles, voltages, q_index, v_index):
         """
         Calculate J4 submatrix (dQ/dV)
         
@@ -427,12 +447,8 @@ class Jacobian:
         n_p = len(q_index)
         n_v = len(v_index)
         j4 = np.zeros((n_p, n_v))
-        pq_buses = [bus for bus in self.circuit.buses.values() if bus.bus_type != 'Slack Bus' and bus.bus_type != "PV Bus"]
-        bus_names = list(self.circuit.buses.values())
-        for i, bus_i in enumerate(pq_buses):
-            k = bus_names.index(bus_i)
-            for j, bus_j in enumerate(pq_buses):
-                l = bus_names.index(bus_j)
+        for i, k in enumerate(q_index):
+            for j, l in enumerate(v_index):
                 if k == l:
                     # Diagonal elements (n = k case)
                     sum_term = 0
@@ -442,7 +458,7 @@ class Jacobian:
                     theta_ii = np.angle(y_ii)
                     first_term = -voltages[k] * y_ii_abs * np.sin(theta_ii)
 
-                    for n in range(len(buses)):
+                    for n in range(len(voltages)):
                         y_in = ybus[k, n]
                         y_in_abs = abs(y_in)
                         theta_in = np.angle(y_in)
@@ -0,0 +1,58 @@
+import numpy as np
+from bundle import Bundle
+from conductor import Conductor
+from geometry import Geometry
+from settings import s
+
+class LineConstants:
+
+    def __init__(self):
+        """
+        Cache of per-mile series resistance, series reactance and shunt susceptance
+
+        Entries are keyed by the parameter values the constants depend on
+        (conductor resistance, bundle size and radii, geometry Deq) and the
+        active frequency, not by the objects themselves. Lines sharing a
+        construction reuse one set of log terms, a mutated conductor, bundle or
+        geometry or a frequency change never reads stale values, and the cache
+        holds no references to the circuits' objects.
+        """
+        self.cache = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, conductor: Conductor, bundle: Bundle, geometry: Geometry):
+        """
+        Parameters:
+            conductor, bundle, geometry: Line construction
+
+        Returns:
+            r_per_mile: Series resistance (ohms/mile)
+            x_per_mile: Series reactance (ohms/mile)
+            b_per_mile: Shunt susceptance (siemens/mile)
+        """
+        frequency = s.frequency
+        key = (conductor.resistance, bundle.num_conductors, bundle.DSL, bundle.DSC, geometry.Deq, frequency)
+        constants = self.cache.get(key)
+        if constants is None:
+            self.misses += 1
+            constants = self.calc_constants(conductor, bundle, geometry, frequency)
+            self.cache[key] = constants
+        else:
+            self.hits += 1
+        return constants
+
+    def calc_constants(self, conductor: Conductor, bundle: Bundle, geometry: Geometry, frequency: float):
+        omega = 2 * np.pi * frequency
+        r_per_mile = conductor.resistance / bundle.num_conductors
+        x_per_mile = omega * (2 * 10 ** -7) * np.log(geometry.Deq / bundle.DSL) * 1609.34
+        b_per_mile = omega * ((2 * np.pi * 8.854 * 10 ** -12) / (np.log(geometry.Deq / bundle.DSC))) * 1609.34
+        return r_per_mile, x_per_mile, b_per_mile
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+line_constants = LineConstants()
@@ -0,0 +1,79 @@
+import time
+import numpy as np
+import scipy.linalg
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+class LinearSolver:
+
+    def __init__(self, sparse_threshold: int = 100, permc_spec: str = "COLAMD"):
+        """
+        Parameters:
+            sparse_threshold: Systems with more unknowns than this use sparse LU
+            permc_spec: Fill-reducing column ordering passed to SuperLU
+        """
+        self.sparse_threshold = sparse_threshold
+        self.permc_spec = permc_spec
+        self.column_order = None  # Fill-reducing column order of the last sparse factorization
+
+    def use_sparse(self, size):
+        return size > self.sparse_threshold
+
+    def factorize(self, J, column_order=None):
+        """
+        Factorize a Jacobian with dense LAPACK LU or SuperLU depending on its type
+
+        Parameters:
+            J: Square matrix (numpy array or scipy sparse matrix)
+            column_order: Optional column order from an earlier factorization of the
+                          same (or a restricted) sparsity pattern; SuperLU then skips
+                          its own ordering step and factors J[:, column_order] as is
+
+        Returns:
+            solve: Function mapping a right-hand side vector to the solution of J x = b
+            stats: Dictionary with the method, size, nnz, factor nnz, fill-in and factor time
+        """
+        start = time.perf_counter()
+        size = J.shape[0]
+
+        if sparse.issparse(J):
+            J = sparse.csc_matrix(J)
+            if column_order is None:
+                lu = splu(J, permc_spec=self.permc_spec)
+                solve = lu.solve
+                # Pr @ J @ Pc = L @ U, so J[:, argsort(perm_c)] is J with the chosen column order
+                self.column_order = np.argsort(lu.perm_c)
+                ordering = self.permc_spec
+            else:
+                lu = splu(J[:, column_order], permc_spec="NATURAL")
+                self.column_order = np.asarray(column_order)
+
+                def solve(b, lu=lu, order=self.column_order):
+                    x = np.empty_like(b, dtype=float)
+                    x[order] = lu.solve(b)
+                    return x
+                ordering = "reused"
+            method = "sparse_lu"
+            nnz = J.nnz
+            # L has an implicit unit diagonal that SuperLU stores explicitly
+            factor_nnz = lu.L.nnz + lu.U.nnz - size
+        else:
+            lu_piv = scipy.linalg.lu_factor(J)
+            solve = lambda b: scipy.linalg.lu_solve(lu_piv, b)
+            method = "dense_lu"
+            ordering = None
+            self.column_order = None
+            nnz = int(np.count_nonzero(J))
+            factor_nnz = size * size
+
+        stats = {
+            "method": method,
+            "ordering": ordering,
+            "size": size,
+            "nnz": nnz,
+            "factor_nnz": factor_nnz,
+            "fill_in": factor_nnz - nnz,
+            "factor_time": time.perf_counter() - start
+        }
+
+        return solve, stats
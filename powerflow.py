@@ -1,64 +1,552 @@
+import time
 import numpy as np
+import pandas as pd
+from scipy import sparse
+from circuit import assemble_ybus
 from jacobian import Jacobian
-from solution import Solution
+from linear_solver import LinearSolver
+from solution import Solution, calc_injections
 
 class PowerFlow:
-    def __init__(self, circuit):
+    def __init__(self, circuit, sparse_threshold=100, jacobian_reuse=False, refresh_ratio=0.25, step_control=None,
+                 progress_callback=None, cancel_event=None):
+        """
+        Parameters:
+            circuit: Circuit to solve (may be None when only newton_raphson is used)
+            sparse_threshold: Systems with more unknowns than this use sparse LU
+            jacobian_reuse: Keep the factored Jacobian across Newton iterations
+                            ("dishonest" Newton) until convergence slows down
+            refresh_ratio: With jacobian_reuse, refactor once an iteration leaves more
+                           than this fraction of the previous maximum mismatch
+            step_control: None for full Newton steps, "backtracking" to halve the step
+                          until the mismatch norm falls, or "iwamoto" for the optimal
+                          multiplier from the mismatch at the full step
+            progress_callback: Optional function called as progress_callback(iteration, mismatch)
+                               with the maximum mismatch of every iteration as it is computed
+            cancel_event: Optional threading.Event; once set, the solve stops before the
+                          next linear solve and returns the current state as not converged
+        """
+        if step_control not in (None, "backtracking", "iwamoto"):
+            raise ValueError(f"Unknown step control: {step_control}")
         self.circuit = circuit
+        self.step_control = step_control
+        self.jacobian_reuse = jacobian_reuse
+        self.refresh_ratio = refresh_ratio
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
         self.jacobian = Jacobian(circuit)
+        self.linear_solver = LinearSolver(sparse_threshold)
 
-    def solve_circuit(self, circuit, tol=0.001, max_iter=50):
+    def solve_circuit(self, circuit, tol=0.001, max_iter=50, method="newton", initializer="auto", enforce_q_limits=False):
+        """
+        Solve the power flow for a circuit
+
+        Parameters:
+            circuit: Circuit with its Y-bus calculated
+            tol: Convergence tolerance on the maximum power mismatch (per unit)
+            max_iter: Maximum number of iterations
+            method: "newton" for full Newton-Raphson, "fdxb" or "fdbx" for the
+                    XB / BX fast decoupled load flow
+            initializer: Starting point passed to Solution.start ("auto", "flat", "dc",
+                         "previous" or an (angles, voltages) pair)
+            enforce_q_limits: Switch PV buses to PQ at their generators' reactive limits
+                              (and back once the voltage recovers); Newton only
+
+        Returns:
+            results: Dictionary with convergence information, bus voltages, injections,
+                     branch flows, the overloaded branches ranked by loading and
+                     whether the solve was stopped through cancel_event
+        """
         buses = list(circuit.buses.values())
         solution = Solution("PowerFlowSolution", buses, circuit, circuit.loads)
-        solution.start()
+        solution.start(initializer)
+
+        switched_buses = dict()
+        if method == "newton":
+            converged, iteration, mismatch, mismatch_history, factorization_stats, refactorizations_saved, step_lengths = \
+                self._solve_newton(circuit, solution, buses, tol, max_iter, method, enforce_q_limits, switched_buses)
+        elif method in ("fdxb", "fdbx"):
+            if enforce_q_limits:
+                raise ValueError("Reactive limits are only enforced by the Newton solver")
+            converged, iteration, mismatch, mismatch_history, factorization_stats = \
+                self._solve_fast_decoupled(circuit, solution, buses, tol, max_iter, method)
+            refactorizations_saved = 0
+            step_lengths = [1.0] * len(mismatch_history)
+            if converged or self.cancelled():
+                step_lengths[-1] = 0.0
+        else:
+            raise ValueError(f"Unknown power flow method: {method}")
+
+        # Refresh the cached injections for the final state
+        solution.P, solution.Q = solution.calc_PQx()
+
+        final_angles, final_voltages = solution.state_arrays()
+
+        if converged:
+            # Cache the converged state so the next solve of this circuit can warm start
+            circuit.solved_state = {
+                "bus_names": list(circuit.buses.keys()),
+                "v_ang": final_angles.copy(),
+                "v_mag": final_voltages.copy()
+            }
+
+        branch_flows = self.calc_branch_flows(circuit, final_voltages, final_angles)
+        overloads = branch_flows[branch_flows["loading"] > 100].sort_values("loading", ascending=False)
+
+        results = {
+            "converged": converged,
+            "iterations": iteration + 1,
+            "final_mismatch": np.max(np.abs(mismatch)),
+            "v_mag": final_voltages,
+            "v_ang": final_angles,
+            "p_calc": list(solution.P.values()),
+            "q_calc": list(solution.Q.values()),
+            "mismatch_history": mismatch_history,
+            "step_lengths": step_lengths,
+            "factorization_stats": factorization_stats,
+            "refactorizations_saved": refactorizations_saved,
+            "switched_buses": switched_buses,
+            "branch_flows": branch_flows,
+            "total_losses": branch_flows["p_loss"].sum() + 1j * branch_flows["q_loss"].sum(),
+            "overloads": overloads.reset_index(drop=True),
+            "cancelled": not converged and self.cancelled()
+        }
+
+        return results
+
+    def cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _report(self, iteration, mismatch):
+        if self.progress_callback is not None:
+            self.progress_callback(iteration, mismatch)
+
+    def calc_branch_flows(self, circuit, voltages, angles):
+        """
+        Complex power flow at both ends of every branch in one pass over the branch table
+
+        Parameters:
+            circuit: Circuit whose branch table matches the bus voltages
+            voltages: Bus voltage magnitudes (per unit)
+            angles: Bus voltage angles (radians)
+
+        Returns:
+            branch_flows: DataFrame with one row per branch: from-end and to-end P and Q
+                          (MW / MVAr), losses, maximum end MVA, rating (MVA) and
+                          percent loading (NaN for unrated branches)
+        """
+        from_index, to_index, yprim = circuit.branch_arrays()
+        V = np.asarray(voltages) * np.exp(1j * np.asarray(angles))
+        base_power = circuit.settings.base_power
+
+        s_from, s_to = calc_branch_powers(V, from_index, to_index, yprim)
+        s_from = s_from * base_power
+        s_to = s_to * base_power
+        s_loss = s_from + s_to
+        s_max = np.maximum(np.abs(s_from), np.abs(s_to))
+
+        rating = circuit.branches.rating.copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            loading = np.where(rating > 0, 100 * s_max / rating, np.nan)
+
+        bus_names = np.array(list(circuit.buses.keys()))
+        return pd.DataFrame({
+            "branch": circuit.branch_names(),
+            "from_bus": bus_names[from_index],
+            "to_bus": bus_names[to_index],
+            "p_from": s_from.real,
+            "q_from": s_from.imag,
+            "p_to": s_to.real,
+            "q_to": s_to.imag,
+            "p_loss": s_loss.real,
+            "q_loss": s_loss.imag,
+            "s_max": s_max,
+            "rating": rating,
+            "loading": loading
+        })
+
+    def _solve_newton(self, circuit, solution, buses, tol, max_iter, method, enforce_q_limits=False, switched_buses=None):
+        """
+        Newton-Raphson solve, repeated after each round of PV <-> PQ switching when
+        reactive limits are enforced
+
+        A switch only changes the PQ index set (and so the Jacobian pattern); the
+        previous fill-reducing column order is restricted to the new unknowns and
+        reused, so no new symbolic ordering is computed.
+
+        Parameters:
+            switched_buses: Dictionary filled with {bus name: generator Q held (MVAr)}
+                            for buses left at a reactive limit
+        """
+        angles, voltages = solution.state_arrays()
+        pvpq_index, pq_index = solution.pvpq_index, solution.pq_index
+        y_spec = solution.y
+        self.linear_solver.column_order = None
+
+        state = self.newton_raphson(circuit.ybus, y_spec, angles, voltages, pvpq_index, pq_index, tol, max_iter,
+                                    buses=buses)
+        iterations = state["iterations"]
+        mismatch_history = list(state["mismatch_history"])
+        factorization_stats = list(state["factorization_stats"])
+        refactorizations_saved = state["refactorizations_saved"]
+        step_lengths = list(state["step_lengths"])
+
+        if enforce_q_limits:
+            base_power = circuit.settings.base_power
+            n = len(buses)
+            q_min, q_max = self.calc_q_limits(circuit)
+            q_load = np.array([bus.reactive_power for bus in buses], dtype=float) / base_power
+            setpoints = solution.flat_voltages()
+            is_pv = np.array([bus.bus_type == 'PV Bus' for bus in buses], dtype=bool)
+            q_held = np.full(n, np.nan)  # Generator Q (pu) of buses switched to PQ
+
+            # Every PV bus can switch at most twice (out and back), which bounds the rounds
+            for _ in range(2 * int(np.sum(is_pv)) + 1):
+                if not state["converged"] or self.cancelled():
+                    break
+
+                V = state["v_mag"] * np.exp(1j * state["v_ang"])
+                q_gen = calc_injections(circuit.ybus, V)[1] - q_load
+                regulating = is_pv & np.isnan(q_held)
+
+                to_max = regulating & (q_gen > q_max)
+                to_min = regulating & (q_gen < q_min)
+                # A limited bus returns to PV when its voltage is back on the right side of the setpoint
+                held_max = ~np.isnan(q_held) & (q_held >= q_max)
+                held_min = ~np.isnan(q_held) & (q_held <= q_min)
+                back = (held_max & (state["v_mag"] > setpoints)) | (held_min & (state["v_mag"] < setpoints))
+                if not (to_max.any() or to_min.any() or back.any()):
+                    break
+
+                q_held[to_max] = q_max[to_max]
+                q_held[to_min] = q_min[to_min]
+                q_held[back] = np.nan
+                voltages = state["v_mag"].copy()
+                voltages[back] = setpoints[back]
+
+                old_pq_index = pq_index
+                pq_index = np.sort(np.concatenate((solution.pq_index, np.flatnonzero(~np.isnan(q_held)))))
+                q_spec = q_load[pq_index] + np.nan_to_num(q_held[pq_index])
+                y_spec = np.concatenate((y_spec[:len(pvpq_index)], q_spec))
+
+                column_order = None
+                if self.linear_solver.column_order is not None:
+                    column_order = restrict_column_order(self.linear_solver.column_order, n, pvpq_index,
+                                                         old_pq_index, pq_index)
+
+                state = self.newton_raphson(circuit.ybus, y_spec, state["v_ang"], voltages, pvpq_index, pq_index,
+                                            tol, max_iter, column_order, buses)
+                iterations += state["iterations"]
+                mismatch_history.extend(state["mismatch_history"])
+                factorization_stats.extend(state["factorization_stats"])
+                refactorizations_saved += state["refactorizations_saved"]
+                step_lengths.extend(state["step_lengths"])
+
+            if switched_buses is not None:
+                bus_names = list(circuit.buses.keys())
+                for k in np.flatnonzero(~np.isnan(q_held)):
+                    switched_buses[bus_names[k]] = q_held[k] * base_power
+
+        solution.set_state(state["v_ang"], state["v_mag"])
+
+        return (state["converged"], iterations - 1, state["mismatch"],
+                mismatch_history, factorization_stats, refactorizations_saved, step_lengths)
+
+    def calc_q_limits(self, circuit):
+        # Per-bus sums of generator reactive limits in per unit (infinite where unlimited,
+        # including buses without a generator, so enforcement never switches them)
+        q_min = np.zeros(len(circuit.buses))
+        q_max = np.zeros(len(circuit.buses))
+        has_generator = np.zeros(len(circuit.buses), dtype=bool)
+        for generator in circuit.generators.values():
+            k = circuit.bus_index[generator.bus.name]
+            q_min[k] += generator.q_min
+            q_max[k] += generator.q_max
+            has_generator[k] = True
+        q_min[~has_generator] = -np.inf
+        q_max[~has_generator] = np.inf
+        return q_min / circuit.settings.base_power, q_max / circuit.settings.base_power
+
+    def newton_raphson(self, ybus, y_spec, angles, voltages, pvpq_index, pq_index, tol=0.001, max_iter=50,
+                       column_order=None, buses=None):
+        """
+        Newton-Raphson iterations on plain arrays
+
+        Parameters:
+            ybus: Complex admittance matrix
+            y_spec: Specified injections [P(pvpq); Q(pq)] in per unit
+            angles: Initial voltage angles (radians)
+            voltages: Initial voltage magnitudes (per unit)
+            pvpq_index: Positions of non-slack buses
+            pq_index: Positions of PQ buses
+            tol: Convergence tolerance on the maximum power mismatch
+            max_iter: Maximum number of iterations
+            column_order: Optional sparse column order to reuse instead of ordering
+                          the first Jacobian (see LinearSolver.factorize)
+            buses: Optional Bus objects of the case being solved, in Ybus order
+
+        Returns:
+            state: Dictionary with converged, iterations, v_ang, v_mag, mismatch,
+                   mismatch_history, factorization_stats, refactorizations_saved
+                   (iterations that reused the previous factorization) and step_lengths
+                   (the multiplier applied after each mismatch_history entry, 0 where
+                   no step followed)
+        """
+        angles = np.array(angles, dtype=float)
+        voltages = np.array(voltages, dtype=float)
+        n_theta = len(pvpq_index)
 
         mismatch_history = []
+        step_lengths = []
+        factorization_stats = []
+        refactorizations_saved = 0
         converged = False
+        solve = None
+
+        for iteration in range(max_iter):
+            P, Q = calc_injections(ybus, voltages * np.exp(1j * angles))
+            mismatch = y_spec - np.concatenate((P[pvpq_index], Q[pq_index]))
+            mismatch_history.append(np.max(np.abs(mismatch)))
+            self._report(iteration + 1, mismatch_history[-1])
+
+            if np.max(np.abs(mismatch)) < tol:
+                converged = True
+                step_lengths.append(0.0)
+                break
+
+            # Cancellation is only checked between iterations, so the state stays consistent
+            if self.cancelled():
+                step_lengths.append(0.0)
+                break
+
+            # Keep the old factorization while each iteration still cuts the mismatch enough
+            reuse = (self.jacobian_reuse and solve is not None
+                     and mismatch_history[-1] <= self.refresh_ratio * mismatch_history[-2])
+
+            if reuse:
+                refactorizations_saved += 1
+                dx = solve(mismatch)
+            else:
+                J = self.calc_jacobian(buses, ybus, angles, voltages, pvpq_index, pq_index)
+                # The Jacobian pattern is fixed within a solve, so the first ordering is reused
+                solve, stats = self.linear_solver.factorize(J, column_order)
+                column_order = self.linear_solver.column_order
+                start = time.perf_counter()
+                dx = solve(mismatch)
+                stats["solve_time"] = time.perf_counter() - start
+                stats["iteration"] = iteration + 1
+                factorization_stats.append(stats)
+
+            step = self.calc_step_length(ybus, y_spec, angles, voltages, dx, mismatch, pvpq_index, pq_index)
+            step_lengths.append(step)
+            angles[pvpq_index] += step * dx[:n_theta]
+            voltages[pq_index] += step * dx[n_theta:]
+
+        return {
+            "converged": converged,
+            "iterations": iteration + 1,
+            "v_ang": angles,
+            "v_mag": voltages,
+            "mismatch": mismatch,
+            "mismatch_history": mismatch_history,
+            "factorization_stats": factorization_stats,
+            "refactorizations_saved": refactorizations_saved,
+            "step_lengths": step_lengths
+        }
+
+    def calc_step_length(self, ybus, y_spec, angles, voltages, dx, mismatch, pvpq_index, pq_index):
+        """
+        Multiplier for the Newton step dx according to self.step_control
+
+        Iwamoto: with a = mismatch and c = mismatch after the full step, the mismatch
+        along the step is approximately (1 - mu) a + mu^2 c (the Newton step cancels
+        the linear term); mu minimizes its squared norm over (0, 2].
+        Backtracking: halve from 1 until the mismatch norm decreases (at most 5 times).
+        """
+        if self.step_control is None:
+            return 1.0
+
+        n_theta = len(pvpq_index)
+
+        def mismatch_at(step):
+            trial_angles = angles.copy()
+            trial_voltages = voltages.copy()
+            trial_angles[pvpq_index] += step * dx[:n_theta]
+            trial_voltages[pq_index] += step * dx[n_theta:]
+            P, Q = calc_injections(ybus, trial_voltages * np.exp(1j * trial_angles))
+            return y_spec - np.concatenate((P[pvpq_index], Q[pq_index]))
+
+        if self.step_control == "backtracking":
+            norm = np.linalg.norm(mismatch)
+            step = 1.0
+            for _ in range(5):
+                if np.linalg.norm(mismatch_at(step)) < (1 - 1e-4 * step) * norm:
+                    break
+                step /= 2
+            return step
+
+        a = mismatch
+        c = mismatch_at(1.0)
+        aa, ac, cc = a @ a, a @ c, c @ c
+        roots = np.roots([2 * cc, -3 * ac, aa + 2 * ac, -aa])
+        candidates = [root.real for root in roots if abs(root.imag) < 1e-9 and 0 < root.real <= 2]
+        if not candidates:
+            return 1.0
+        residual = lambda mu: np.linalg.norm((1 - mu) * a + mu**2 * c)
+        return min(candidates, key=residual)
+
+    def _solve_fast_decoupled(self, circuit, solution, buses, tol, max_iter, method):
+        """
+        Fast decoupled iterations: B' and B'' are factored once before the loop,
+        then every half iteration is a pair of triangular solves
+        """
+        mismatch_history = []
+        converged = False
+        pvpq_index, pq_index = solution.pvpq_index, solution.pq_index
+        n_theta = len(pvpq_index)
+
+        b_prime, b_double_prime = self.calc_b_matrices(circuit, method)
+        solve_p, stats_p = self.linear_solver.factorize(self._as_solver_matrix(b_prime[pvpq_index][:, pvpq_index]))
+        stats_p.update(iteration=0, matrix="B'")
+        factorization_stats = [stats_p]
+        if len(pq_index):
+            solve_q, stats_q = self.linear_solver.factorize(self._as_solver_matrix(b_double_prime[pq_index][:, pq_index]))
+            stats_q.update(iteration=0, matrix="B''")
+            factorization_stats.append(stats_q)
 
         for iteration in range(max_iter):
             mismatch = solution.calc_mismatch()
             mismatch_history.append(np.max(np.abs(mismatch)))
+            self._report(iteration + 1, mismatch_history[-1])
 
             if np.max(np.abs(mismatch)) < tol:
                 converged = True
                 break
 
-            angles = np.array([solution.delta[bus.name] for bus in buses])
-            voltages = np.array([solution.voltage[bus.name] for bus in buses])
+            if self.cancelled():
+                break
 
-            J = self.jacobian.calc_jacobian(buses, circuit.ybus, angles, voltages)
-            dx = np.linalg.solve(J, mismatch)
+            # P-theta half iteration
+            voltages = solution.state_arrays()[1]
+            d_delta = solve_p(mismatch[:n_theta] / voltages[pvpq_index])
+            solution.apply_update(d_delta, [])
 
-            theta_update = []
-            v_update = []
-            for bus in buses:
-                if bus.bus_type != 'Slack Bus':
-                    theta_update.append(bus.name)
-            for bus in buses:
-                if bus.bus_type == 'PQ Bus':
-                    v_update.append(bus.name)
+            if len(pq_index) == 0:
+                continue
 
-            for i, bus_name in enumerate(theta_update):
-                solution.delta[bus_name] += dx[i]
+            # Q-V half iteration; when the P step already converged, the next
+            # iteration records the mismatch and exits like every other solve
+            mismatch = solution.calc_mismatch()
+            if np.max(np.abs(mismatch)) < tol:
+                continue
 
-            for j, bus_name in enumerate(v_update):
-                solution.voltage[bus_name] += dx[len(theta_update) + j]
+            voltages = solution.state_arrays()[1]
+            d_voltage = solve_q(mismatch[n_theta:] / voltages[pq_index])
+            solution.apply_update([], d_voltage)
 
-            solution.P = solution.calc_Px()
-            solution.Q = solution.calc_Qx()
+        return converged, iteration, mismatch, mismatch_history, factorization_stats
 
-        final_angles = np.array([solution.delta[bus.name] for bus in buses])
-        final_voltages = np.array([solution.voltage[bus.name] for bus in buses])
+    def calc_b_matrices(self, circuit, method="fdxb"):
+        """
+        Build the constant fast decoupled susceptance matrices B' and B''
 
-        results = {
-            "converged": converged,
-            "iterations": iteration + 1,
-            "final_mismatch": np.max(np.abs(mismatch)),
-            "v_mag": final_voltages,
-            "v_ang": final_angles,
-            "p_calc": list(solution.P.values()),
-            "q_calc": list(solution.Q.values()),
-            "mismatch_history": mismatch_history
-        }
+        XB ignores branch resistance in B', BX ignores it in B''. Shunt
+        admittances (line charging and the circuit's bus shunts) only enter B''.
 
-        return results
+        Parameters:
+            circuit: Circuit with transformers and transmission lines
+            method: "fdxb" or "fdbx"
+
+        Returns:
+            b_prime, b_double_prime: Full bus-size sparse CSR matrices equal to -Im(Y')
+        """
+        from_index, to_index, yprim = circuit.branch_arrays()
+        n = len(circuit.buses)
+
+        y_series = -yprim[:, 0, 1]
+        y_shunt_from = yprim[:, 0, 0] - y_series
+        y_shunt_to = yprim[:, 1, 1] - y_series
+        y_reactance_only = 1 / (1j * np.imag(1 / y_series))
+        no_shunt = np.zeros_like(y_series)
+
+        def branch_matrix(y, shunt_from, shunt_to):
+            prim = np.empty_like(yprim)
+            prim[:, 0, 0] = y + shunt_from
+            prim[:, 1, 1] = y + shunt_to
+            prim[:, 0, 1] = -y
+            prim[:, 1, 0] = -y
+            return -assemble_ybus(n, from_index, to_index, prim).imag
+
+        if method == "fdxb":
+            b_prime = branch_matrix(y_reactance_only, no_shunt, no_shunt)
+            b_double_prime = branch_matrix(y_series, y_shunt_from, y_shunt_to)
+        elif method == "fdbx":
+            b_prime = branch_matrix(y_series, no_shunt, no_shunt)
+            b_double_prime = branch_matrix(y_reactance_only, y_shunt_from, y_shunt_to)
+        else:
+            raise ValueError(f"Unknown fast decoupled variant: {method}")
+
+        if circuit.shunts:
+            b_double_prime = (b_double_prime - sparse.diags(circuit.shunt_admittance().imag)).tocsr()
+
+        return b_prime, b_double_prime
+
+    def _as_solver_matrix(self, matrix):
+        # Keep sparse matrices above the solver threshold, densify small ones
+        if self.linear_solver.use_sparse(matrix.shape[0]):
+            return matrix.tocsc()
+        return matrix.toarray()
+
+    def calc_jacobian(self, buses, ybus, angles, voltages, pvpq_index, pq_index):
+        # Sparse Jacobian above the solver's size threshold, dense below it
+        size = len(pvpq_index) + len(pq_index)
+        if not self.linear_solver.use_sparse(size):
+            return self.jacobian.calc_jacobian(buses, ybus, angles, voltages, pvpq_index, pq_index)
+        if self.jacobian.mode == "vectorized":
+            return self.jacobian.calc_jacobian_sparse(ybus, angles, voltages, pvpq_index, pq_index)
+        return sparse.csr_matrix(self.jacobian.calc_jacobian(buses, ybus, angles, voltages, pvpq_index, pq_index))
+
+
+def calc_branch_powers(voltage, from_index, to_index, yprim):
+    """
+    Complex power entering every branch at its two ends
+
+    Parameters:
+        voltage: Complex bus voltages (per unit)
+        from_index, to_index: Bus positions of the branch ends
+        yprim: Branch primitive admittances, shape (E, 2, 2)
+
+    Returns:
+        s_from, s_to: Complex arrays (E,) in per unit
+    """
+    v_from = voltage[from_index]
+    v_to = voltage[to_index]
+    s_from = v_from * np.conj(yprim[:, 0, 0] * v_from + yprim[:, 0, 1] * v_to)
+    s_to = v_to * np.conj(yprim[:, 1, 0] * v_from + yprim[:, 1, 1] * v_to)
+    return s_from, s_to
+
+def restrict_column_order(column_order, num_buses, pvpq_index, old_pq_index, new_pq_index):
+    """
+    Carry a Jacobian column order over to a new PQ index set
+
+    Unknowns are identified by bus: angle of bus k or magnitude of bus k. Unknowns
+    that remain keep their relative order, magnitudes that disappear are dropped and
+    new magnitudes are placed right after the angle of the same bus.
+
+    Returns:
+        column_order: Column order for the Jacobian of the new index sets
+    """
+    n_theta = len(pvpq_index)
+    # Global ids: angle of bus k -> k, magnitude of bus k -> num_buses + k
+    old_ids = np.concatenate((pvpq_index, num_buses + np.asarray(old_pq_index, dtype=int)))
+    new_ids = np.concatenate((pvpq_index, num_buses + np.asarray(new_pq_index, dtype=int)))
+    new_position = {bus_id: i for i, bus_id in enumerate(new_ids)}
+    added = set(new_ids[n_theta:]) - set(old_ids[n_theta:])
+
+    order = []
+    for bus_id in old_ids[column_order]:
+        if bus_id in new_position:
+            order.append(new_position[bus_id])
+        if bus_id < num_buses and num_buses + bus_id in added:
+            order.append(new_position[num_buses + bus_id])
+    return np.array(order, dtype=int)
@@ -0,0 +1,142 @@
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+# Role returning the raw cell value, used for numeric sorting and range filters
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+class ResultsTableModel(QAbstractTableModel):
+
+    def __init__(self, headers, formats=None, parent=None):
+        """
+        Table model over result column arrays
+
+        Cells are formatted only when a view asks for them, so a view draws its
+        visible rows without touching the rest of the table.
+
+        Parameters:
+            headers: Column titles
+            formats: Optional format spec per column (e.g. ".4f"); None shows str(value)
+        """
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.formats = list(formats) if formats is not None else [None] * len(self.headers)
+        self.columns = [np.empty(0) for _ in self.headers]
+
+    def set_columns(self, *columns, headers=None):
+        """
+        Replace the table contents
+
+        Parameters:
+            columns: One equal-length sequence per column
+            headers: Optional new column titles
+        """
+        self.beginResetModel()
+        if headers is not None:
+            self.headers = list(headers)
+        self.columns = [np.asarray(column) for column in columns]
+        self.endResetModel()
+
+    def clear(self):
+        self.set_columns(*[np.empty(0) for _ in self.headers])
+
+    def value(self, row, column):
+        value = self.columns[column][row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self.columns:
+            return 0
+        return len(self.columns[0])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self.value(index.row(), index.column())
+            fmt = self.formats[index.column()]
+            return str(value) if fmt is None else format(value, fmt)
+        if role == SORT_ROLE:
+            return self.value(index.row(), index.column())
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.formats[index.column()] is not None:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return section + 1
+
+    def to_text(self):
+        # Tab separated dump of the whole table (for exports and test logs)
+        lines = ["\t".join(self.headers)]
+        for row in range(self.rowCount()):
+            lines.append("\t".join(self.data(self.index(row, column)) for column in range(self.columnCount())))
+        return "\n".join(lines)
+
+class ResultsFilterProxyModel(QSortFilterProxyModel):
+
+    def __init__(self, parent=None):
+        """
+        Sorts on raw values and filters rows by name text and numeric column ranges
+
+        The name filter (setFilterFixedString) matches the first column; ranges
+        from set_range apply to the raw values, so nothing is recomputed. NaN
+        cells (e.g. loading of unrated branches) sort last in either order.
+        """
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterKeyColumn(0)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.ranges = {}
+
+    def set_range(self, column, minimum=-np.inf, maximum=np.inf):
+        """Keep only rows with minimum <= value <= maximum in column (NaN never matches)"""
+        self._begin_filter_change()
+        self.ranges[column] = (minimum, maximum)
+        self._end_filter_change()
+
+    def clear_ranges(self):
+        self._begin_filter_change()
+        self.ranges = {}
+        self._end_filter_change()
+
+    def _begin_filter_change(self):
+        # Qt 6.9 replaced invalidateFilter with a begin/end pair around the change
+        if hasattr(self, "beginFilterChange"):
+            self.beginFilterChange()
+
+    def _end_filter_change(self):
+        if hasattr(self, "endFilterChange"):
+            self.endFilterChange()
+        else:
+            self.invalidateFilter()
+
+    def lessThan(self, left, right):
+        left_value = left.data(SORT_ROLE)
+        right_value = right.data(SORT_ROLE)
+        left_nan = _is_nan(left_value)
+        right_nan = _is_nan(right_value)
+        if left_nan or right_nan:
+            # Qt reverses lessThan for descending order, so NaN counts as smallest there
+            descending = self.sortOrder() == Qt.SortOrder.DescendingOrder
+            return left_nan and not right_nan if descending else right_nan and not left_nan
+        try:
+            return bool(left_value < right_value)
+        except TypeError:
+            return super().lessThan(left, right)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        for column, (minimum, maximum) in self.ranges.items():
+            if not minimum <= model.value(source_row, column) <= maximum:
+                return False
+        return super().filterAcceptsRow(source_row, source_parent)
+
+def _is_nan(value):
+    return isinstance(value, float) and value != value
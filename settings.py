@@ -1,15 +1,60 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 class Settings:
 
-    def __init__(self):
-        self.frequency = 60
-        self.base_power = 100
+    def __init__(self, frequency=60, base_power=100):
+        self.frequency = frequency
+        self.base_power = base_power
+
+
+# Settings in effect for the current thread / task; falls back to the process default
+_default = Settings()
+_active = ContextVar("settings", default=_default)
+
+
+def current_settings():
+    return _active.get()
+
+
+@contextmanager
+def use_settings(settings=None, **overrides):
+    """
+    Make a Settings object the active one for the current thread or task
+
+    Parameters:
+        settings: Settings to activate (defaults to a copy of the active settings)
+        overrides: Attribute values to change on a copy, e.g. frequency=50
+
+    Yields:
+        settings: The active Settings object inside the block
+    """
+    if settings is None or overrides:
+        base = settings if settings is not None else _active.get()
+        settings = Settings(overrides.get("frequency", base.frequency), overrides.get("base_power", base.base_power))
+    token = _active.set(settings)
+    try:
+        yield settings
+    finally:
+        _active.reset(token)
+
+
+class _ActiveSettings:
+    # Module-level `s` forwards every read and write to the active Settings
+
+    def __getattr__(self, name):
+        return getattr(_active.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(_active.get(), name, value)
 
 
-s = Settings()
+s = _ActiveSettings()
 if __name__ == '__main__':
 
     settings = Settings()
     print(settings.frequency, settings.base_power)
 
-    settings_mod = Settings()
-    print(settings_mod.frequency, settings_mod.base_power)
+    with use_settings(frequency=50, base_power=1000) as settings_mod:
+        print(settings_mod.frequency, settings_mod.base_power)
+        print(s.frequency, s.base_power)
@@ -0,0 +1,280 @@
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from circuit import Circuit
+from settings import Settings
+
+FORMAT = "powerflow-snapshot"
+VERSION = 1
+
+BUS_TYPES = ['Slack Bus', 'PV Bus', 'PQ Bus']
+
+def save_snapshot(path, circuit, results=None):
+    """
+    Write a circuit (and optionally its results) as a snapshot directory
+
+    The directory holds one .npy file per array plus manifest.json with the
+    format version, settings, scalar results and the shape and dtype of every
+    array. Arrays are stored uncompressed so Snapshot can memory-map them.
+    The snapshot is written to a staging directory next to path and moved into
+    place when complete, so an existing snapshot is replaced as a whole and
+    never mixed with the new files.
+
+    Parameters:
+        path: Snapshot directory (created if needed; an existing one must be empty
+              or hold a snapshot)
+        circuit: Circuit to store; the Y-bus is stored in CSR form when calculated
+        results: Optional results of PowerFlow.solve_circuit or BatchPowerFlow.solve
+
+    Returns:
+        manifest: The manifest written to manifest.json
+    """
+    if os.path.isdir(path) and os.listdir(path) and not os.path.exists(os.path.join(path, "manifest.json")):
+        raise ValueError(f"{path} is not empty and holds no snapshot")
+    bus_names = list(circuit.buses.keys())
+    buses = list(circuit.buses.values())
+    loads = list(circuit.loads.values())
+    generators = list(circuit.generators.values())
+    branches = circuit.branches
+
+    arrays = {
+        "bus/names": np.array(bus_names, dtype=str),
+        "bus/base_kv": np.array([bus.base_kv for bus in buses], dtype=float),
+        "bus/type": np.array([BUS_TYPES.index(bus.bus_type) for bus in buses], dtype=np.int8),
+        "bus/vpu": np.array([bus.vpu for bus in buses], dtype=float),
+        "bus/delta": np.array([bus.delta for bus in buses], dtype=float),
+        "bus/real_power": np.array([bus.real_power for bus in buses], dtype=float),
+        "bus/reactive_power": np.array([bus.reactive_power for bus in buses], dtype=float),
+        "shunt/bus": np.array([circuit.bus_index[name] for name in circuit.shunts], dtype=int),
+        "shunt/admittance": np.array(list(circuit.shunts.values()), dtype=complex),
+        "branch/names": np.array(branches.names, dtype=str),
+        "branch/from_index": branches.from_index,
+        "branch/to_index": branches.to_index,
+        "branch/y_series": branches.y_series,
+        "branch/b_shunt": branches.b_shunt,
+        "branch/tap": branches.tap,
+        "branch/kind": branches.kind,
+        "branch/rating": branches.rating,
+        "load/names": np.array(list(circuit.loads.keys()), dtype=str),
+        "load/bus": np.array([circuit.bus_index[load.bus.name] for load in loads], dtype=int),
+        "load/real_power": np.array([load.real_power for load in loads], dtype=float),
+        "load/reactive_power": np.array([load.reactive_power for load in loads], dtype=float),
+        "generator/names": np.array(list(circuit.generators.keys()), dtype=str)
+    }
+    arrays["generator/bus"] = np.array([circuit.bus_index[generator.bus.name] for generator in generators], dtype=int)
+    for field in ("voltage_setpoint", "mw_setpoint", "x1", "x2", "x0", "q_min", "q_max"):
+        arrays[f"generator/{field}"] = np.array([getattr(generator, field) for generator in generators], dtype=float)
+    arrays["generator/zg"] = np.array([generator.zg for generator in generators], dtype=complex)
+
+    if circuit.ybus is not None:
+        ybus = sparse.csr_matrix(circuit.ybus)
+        arrays.update({"ybus/data": ybus.data, "ybus/indices": ybus.indices, "ybus/indptr": ybus.indptr})
+
+    if circuit.solved_state is not None and circuit.solved_state["bus_names"] == bus_names:
+        arrays["solved/v_ang"] = circuit.solved_state["v_ang"]
+        arrays["solved/v_mag"] = circuit.solved_state["v_mag"]
+
+    values = dict()
+    frames = dict()
+    for key, value in (results or {}).items():
+        if isinstance(value, pd.DataFrame):
+            # Data frames are stored column by column
+            frames[key] = [str(column) for column in value.columns]
+            for column in value.columns:
+                arrays[f"results/{key}/{column}"] = _storable(value[column].to_numpy())
+        elif _is_array(value):
+            arrays[f"results/{key}"] = np.asarray(value)
+        else:
+            values[key] = _to_json(value)
+
+    manifest = {
+        "format": FORMAT,
+        "version": VERSION,
+        "name": circuit.name,
+        "settings": {"frequency": circuit.settings.frequency, "base_power": circuit.settings.base_power},
+        "results": values,
+        "frames": frames,
+        "arrays": {}
+    }
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    staging = os.path.join(parent, f".snapshot-{uuid.uuid4().hex}")
+    os.mkdir(staging)
+    try:
+        for name, array in arrays.items():
+            file_name = name + ".npy"
+            os.makedirs(os.path.dirname(os.path.join(staging, file_name)), exist_ok=True)
+            np.save(os.path.join(staging, file_name), np.ascontiguousarray(array), allow_pickle=False)
+            manifest["arrays"][name] = {"file": file_name, "dtype": np.asarray(array).dtype.str,
+                                        "shape": list(np.shape(array))}
+
+        # The manifest is written last, so a snapshot with a manifest is complete
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=1)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    # A directory cannot be renamed over a non-empty one, so the old snapshot moves aside first
+    previous = None
+    if os.path.exists(path):
+        previous = os.path.join(parent, f".snapshot-{uuid.uuid4().hex}")
+        os.replace(path, previous)
+    os.replace(staging, path)
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+class Snapshot:
+
+    def __init__(self, path, mmap_mode="r"):
+        """
+        Open a snapshot directory written by save_snapshot
+
+        Only the manifest is read here; each array is memory-mapped on first
+        access, so slicing a large result set reads just the slice.
+
+        Parameters:
+            path: Snapshot directory
+            mmap_mode: numpy memory-map mode ("r", "r+", "c"), or None to read arrays into memory
+        """
+        self.path = path
+        self.mmap_mode = mmap_mode
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+
+        if self.manifest.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a {FORMAT} directory")
+        if self.manifest.get("version", 0) > VERSION:
+            raise ValueError(f"Snapshot version {self.manifest['version']} is newer than the supported version {VERSION}")
+        self._arrays = dict()
+
+    def __contains__(self, name):
+        return name in self.manifest["arrays"]
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            entry = self.manifest["arrays"][name]
+            # Empty arrays cannot be memory-mapped
+            mmap_mode = self.mmap_mode if np.prod(entry["shape"]) > 0 else None
+            self._arrays[name] = np.load(os.path.join(self.path, entry["file"]), mmap_mode=mmap_mode,
+                                         allow_pickle=False)
+        return self._arrays[name]
+
+    def ybus(self):
+        # Y-bus in CSR form over the mapped arrays (None when it was not calculated)
+        if "ybus/data" not in self:
+            return None
+        n = len(self["bus/names"])
+        return sparse.csr_matrix((self["ybus/data"], self["ybus/indices"], self["ybus/indptr"]), shape=(n, n),
+                                 copy=False)
+
+    def results(self):
+        """
+        Stored results with arrays memory-mapped and data frames rebuilt from their columns
+
+        Returns:
+            results: Dictionary with the same keys as the saved results
+        """
+        results = {key: _from_json(value) for key, value in self.manifest["results"].items()}
+        prefix = "results/"
+        for name in self.manifest["arrays"]:
+            key = name[len(prefix):]
+            if name.startswith(prefix) and key.split("/")[0] not in self.manifest["frames"]:
+                results[key] = self[name]
+        for key, columns in self.manifest["frames"].items():
+            results[key] = pd.DataFrame({column: self[f"{prefix}{key}/{column}"] for column in columns})
+        return results
+
+    def circuit(self):
+        """
+        Rebuild the Circuit
+
+        Buses, shunts, loads, generators, branch table rows, the Y-bus and the
+        solved state are restored. Branches come back as branch table rows (as for
+        imported cases), without their Transformer or TransmissionLine objects.
+
+        Returns:
+            circuit: Circuit equivalent to the saved one for power flow and fault studies
+        """
+        settings = self.manifest["settings"]
+        circuit = Circuit(self.manifest["name"], Settings(settings["frequency"], settings["base_power"]))
+        bus_names = [str(name) for name in self["bus/names"]]
+
+        circuit.add_buses(bus_names, self["bus/base_kv"], [BUS_TYPES[code] for code in self["bus/type"]])
+        for k, bus in enumerate(circuit.buses.values()):
+            bus.vpu = float(self["bus/vpu"][k])
+            bus.delta = float(self["bus/delta"][k])
+
+        for bus, admittance in zip(self["shunt/bus"], self["shunt/admittance"]):
+            circuit.shunts[bus_names[bus]] = complex(admittance)
+
+        for k, name in enumerate(self["load/names"]):
+            circuit.add_load(str(name), bus_names[self["load/bus"][k]], float(self["load/real_power"][k]),
+                             float(self["load/reactive_power"][k]))
+
+        for k, name in enumerate(self["generator/names"]):
+            fields = [float(self[f"generator/{field}"][k]) for field in ("voltage_setpoint", "mw_setpoint", "x1", "x2", "x0")]
+            circuit.add_generator(str(name), bus_names[self["generator/bus"][k]], *fields, complex(self["generator/zg"][k]),
+                                  float(self["generator/q_min"][k]), float(self["generator/q_max"][k]))
+
+        # Net injections are restored as saved, after the loads and generators changed them
+        for k, bus in enumerate(circuit.buses.values()):
+            bus.real_power = float(self["bus/real_power"][k])
+            bus.reactive_power = float(self["bus/reactive_power"][k])
+
+        circuit.branches.extend([str(name) for name in self["branch/names"]], self["branch/from_index"],
+                                self["branch/to_index"], self["branch/y_series"], self["branch/b_shunt"],
+                                self["branch/tap"], self["branch/kind"], self["branch/rating"])
+
+        circuit.ybus = self.ybus()
+        if "solved/v_mag" in self:
+            circuit.solved_state = {"bus_names": bus_names, "v_ang": np.array(self["solved/v_ang"]),
+                                    "v_mag": np.array(self["solved/v_mag"])}
+        return circuit
+
+def _is_array(value):
+    # Arrays and homogeneous lists (all numbers or all strings) are stored as .npy files
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in "biufcU"
+    if not isinstance(value, list) or not value:
+        return False
+    if all(isinstance(item, str) for item in value):
+        return True
+    try:
+        return np.asarray(value).dtype.kind in "biufc"
+    except ValueError:
+        return False
+
+def _storable(array):
+    # Object columns (e.g. branch names) are stored as fixed width strings
+    return array.astype(str) if array.dtype == object else array
+
+def _to_json(value):
+    # Scalars and small containers of the results dictionary in JSON form
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return {"tuple": [_to_json(item) for item in value]}
+    if isinstance(value, (list, np.ndarray)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, (complex, np.complexfloating)):
+        return {"complex": [float(value.real), float(value.imag)]}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if list(value.keys()) == ["complex"]:
+            return complex(*value["complex"])
+        if list(value.keys()) == ["tuple"]:
+            return tuple(_from_json(item) for item in value["tuple"])
+        return {key: _from_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    return value
@@ -1,7 +1,7 @@
 from bus import Bus
 from circuit import Circuit
-from settings import s
 from load import Load
+from dc_powerflow import DCPowerFlow
 import numpy as np
 import pandas as pd
 
@@ -21,77 +21,127 @@ class Solution:
         self.x = None
         self.y = None
         self.mismatch = None
+        self.pvpq_index = None
+        self.pq_index = None
 
-    # Initialize with flat start
-    def start(self):
-        # Use circuit.buses.keys() instead of self.bus.index
-    
-        angle_deg = [0.00, -4.44, -5.46, -4.70, -4.83, -3.95, 2.15]
-        angle_rad = [np.radians(a) for a in angle_deg]
+    def start(self, initializer="auto"):
+        """
+        Set the initial bus angles and voltages, then evaluate the starting injections
 
-        # Voltage magnitudes (per unit)
-        voltage_pu = [1.00000, 0.93692, 0.92049, 0.92980, 0.92672, 0.93968, 0.99999]
-
-        # Bus order (make sure it matches the order in your circuit)
-        bus_names = list(self.circuit.buses.keys())
+        Parameters:
+            initializer: "flat" (0 rad, 1 pu with PV/slack buses at their setpoint),
+                         "dc" (DC power flow angles), "previous" (the circuit's last
+                         converged state), "auto" (previous if available, else flat),
+                         or an (angles, voltages) pair of arrays in circuit bus order
+        """
+        angles, voltages = self.initial_state(initializer)
 
         # Assign values to self.delta and self.voltage
-        self.delta = {name: angle for name, angle in zip(bus_names, angle_rad)}
-        self.voltage = {name: volt for name, volt in zip(bus_names, voltage_pu)}
-        
-        # self.delta = {bus_name: 0 for bus_name in self.circuit.buses.keys()}
-        # self.voltage = {bus_name: 1 for bus_name in self.circuit.buses.keys()}
-        
+        self.set_state(angles, voltages)
+
         # Now calculate the power values
-        self.P = self.calc_Px()
-        self.Q = self.calc_Qx()
+        self.calc_bus_indices()
+        self.P, self.Q = self.calc_PQx()
         self.x = self.initialize_x()
         self.y = self.initialize_y()
         self.mismatch = self.calc_mismatch()
 
+    def initial_state(self, initializer="auto"):
+        # Initial angle and voltage arrays in circuit bus order
+        bus_names = list(self.circuit.buses.keys())
+        n = len(bus_names)
+
+        if isinstance(initializer, str):
+            previous = self.circuit.solved_state
+            if previous is not None and previous["bus_names"] != bus_names:
+                previous = None
+
+            if initializer == "auto":
+                initializer = "previous" if previous is not None else "flat"
+
+            if initializer == "previous":
+                if previous is None:
+                    raise ValueError("No previous converged state is cached for this circuit")
+                # Regulated buses follow the current setpoints rather than the cached values
+                voltages = previous["v_mag"].copy()
+                voltages[self.regulated_mask()] = self.flat_voltages()[self.regulated_mask()]
+                return previous["v_ang"].copy(), voltages
+
+            angles = np.zeros(n)
+            voltages = self.flat_voltages()
+            if initializer == "dc":
+                angles = DCPowerFlow(self.circuit).solve()["v_ang"]
+            elif initializer != "flat":
+                raise ValueError(f"Unknown initializer: {initializer}")
+            return angles, voltages
+
+        angles, voltages = initializer
+        angles = np.asarray(angles, dtype=float)
+        voltages = np.asarray(voltages, dtype=float)
+        if angles.shape != (n,) or voltages.shape != (n,):
+            raise ValueError(f"Initial angles and voltages must both have {n} entries")
+        return angles.copy(), voltages.copy()
+
+    def regulated_mask(self):
+        # True for slack and PV buses, whose voltage magnitude is held at a setpoint
+        return np.array([bus.bus_type == 'Slack Bus' or bus.bus_type == 'PV Bus'
+                         for bus in self.circuit.buses.values()], dtype=bool)
+
+    def flat_voltages(self):
+        # 1.0 pu at PQ buses, generator setpoint (or bus.vpu) at slack and PV buses
+        setpoints = {generator.bus.name: generator.voltage_setpoint for generator in self.circuit.generators.values()}
+        voltages = np.ones(len(self.circuit.buses))
+        for k, (bus_name, bus) in enumerate(self.circuit.buses.items()):
+            if bus.bus_type == 'Slack Bus' or bus.bus_type == 'PV Bus':
+                voltages[k] = setpoints.get(bus_name, bus.vpu)
+        return voltages
+
+    def calc_PQx(self):
+        # Active and reactive power from a single S = V * conj(Ybus @ V) evaluation
+        bus_names = list(self.circuit.buses.keys())
+        P, Q = calc_injections(self.circuit.ybus, self.complex_voltage())
+        Px = dict(zip(bus_names, P))
+        Qx = dict(zip(bus_names, Q))
+        return Px, Qx
+
     def calc_Px(self):
         # Active power calculation
-        # Use circuit.buses.keys() instead of self.bus.index
-        Px = {bus_name: 0 for bus_name in self.circuit.buses.keys()}
-
-        for k, bus_k in enumerate(self.circuit.buses.keys()):
-            V_k = self.voltage[bus_k]
-            delta_k = self.delta[bus_k]
-            P_k = 0  # Initialize power for this bus
-            
-            for j, bus_j in enumerate(self.circuit.buses.keys()):
-                V_j = self.voltage[bus_j]
-                delta_j = self.delta[bus_j]
-                Y_kj = self.circuit.ybus.iloc[k, j] if isinstance(self.circuit.ybus, pd.DataFrame) else self.circuit.ybus[k, j]
-                
-                # ACCUMULATE power with += instead of reassigning
-                P_k += V_k * V_j * abs(Y_kj) * np.cos(delta_k - delta_j - np.angle(Y_kj))
-
-            Px[bus_k] = P_k
-
-        return Px
+        return self.calc_PQx()[0]
 
     def calc_Qx(self):
         # Reactive power calculation
-        # Use circuit.buses.keys() instead of self.bus.index
-        Qx = {bus_name: 0 for bus_name in self.circuit.buses.keys()}
-
-        for k, bus_k in enumerate(self.circuit.buses.keys()):
-            V_k = self.voltage[bus_k]
-            delta_k = self.delta[bus_k]
-            Q_k = 0  # Initialize reactive power for this bus
-            
-            for j, bus_j in enumerate(self.circuit.buses.keys()):
-                V_j = self.voltage[bus_j]
-                delta_j = self.delta[bus_j]
-                Y_kj = self.circuit.ybus.iloc[k, j] if isinstance(self.circuit.ybus, pd.DataFrame) else self.circuit.ybus[k, j]
-                
-                # ACCUMULATE power with += instead of reassigning
-                Q_k += V_k * V_j * abs(Y_kj) * np.sin(delta_k - delta_j - np.angle(Y_kj))
-
-            Qx[bus_k] = Q_k
-
-        return Qx
+        return self.calc_PQx()[1]
+
+    def state_arrays(self):
+        # Bus angles and voltage magnitudes as arrays in circuit bus order
+        n = len(self.circuit.buses)
+        delta = np.fromiter((self.delta[bus_name] for bus_name in self.circuit.buses), dtype=float, count=n)
+        voltage = np.fromiter((self.voltage[bus_name] for bus_name in self.circuit.buses), dtype=float, count=n)
+        return delta, voltage
+
+    def set_state(self, delta, voltage):
+        # Replace the bus angles and voltage magnitudes from arrays in circuit bus order
+        bus_names = list(self.circuit.buses.keys())
+        self.delta = dict(zip(bus_names, np.asarray(delta, dtype=float)))
+        self.voltage = dict(zip(bus_names, np.asarray(voltage, dtype=float)))
+
+    def complex_voltage(self):
+        # Complex bus voltages in circuit bus order
+        delta, voltage = self.state_arrays()
+        return voltage * np.exp(1j * delta)
+
+    def apply_update(self, d_delta, d_voltage):
+        # Add angle increments to the non-slack buses and magnitude increments to the PQ buses
+        bus_names = list(self.circuit.buses.keys())
+        for k, step in zip(self.pvpq_index, d_delta):
+            self.delta[bus_names[k]] += step
+        for k, step in zip(self.pq_index, d_voltage):
+            self.voltage[bus_names[k]] += step
+
+    def calc_bus_indices(self):
+        # Positions of buses with P equations (all except slack) and Q equations (PQ buses only)
+        self.pvpq_index, self.pq_index = calc_bus_indices(self.circuit.buses.values())
+        return self.pvpq_index, self.pq_index
 
     def initialize_x(self):
         # Create state vector from angles and voltages
@@ -130,93 +180,61 @@ class Solution:
         
         # Combine into a single vector
         y = np.concatenate((np.array(real_power), np.array(reactive_power)))
-        y = y / s.base_power
+        y = y / self.circuit.settings.base_power
         
         return y
 
     def calc_mismatch(self):
-        # Calculate mismatch between calculated and specified values
-        # We'll use a more direct approach that handles the Jacobian structure correctly
-        
-        # Get bus type information
-        bus_type_map = {
-            "Slack Bus": 1,  # BusType.SLACK
-            "PV Bus": 2,     # BusType.PV
-            "PQ Bus": 3      # BusType.PQ
-        }
-        
-        # Create mappings for buses with P and Q equations
-        p_buses = []  # P mismatch buses (all except slack)
-        q_buses = []  # Q mismatch buses (only PQ buses)
-        
-        # Identify which buses have P and Q mismatches
-        for bus_name, bus in self.circuit.buses.items():
-            bus_type = bus_type_map.get(bus.bus_type, bus.bus_type)
-            
-            if bus_type != 1:  # Not a slack bus
-                p_buses.append(bus_name)
-            if bus_type == 3:  # PQ bus
-                q_buses.append(bus_name)
-        
-        # Initialize specified power values with zeros
-        P_spec = {bus_name: 0 for bus_name in self.circuit.buses.keys()}
-        Q_spec = {bus_name: 0 for bus_name in self.circuit.buses.keys()}
-        
-        # Add load contributions
-        if hasattr(self.circuit, 'load') and self.circuit.load:
-            # Process all loads in the circuit
-            for load_name, load in self.circuit.load.items():
-                bus_name = load.bus.name if hasattr(load.bus, 'name') else load.bus
-                P_spec[bus_name] -= load.real_power / s.base_power  # Negative for loads
-                Q_spec[bus_name] -= load.reactive_power / s.base_power  # Negative for loads
-        elif isinstance(self.load, dict):
-            for load_name, load in self.load.items():
-                P_spec[bus_name] -= load.real_power / s.base_power
-                Q_spec[bus_name] -= load.reactive_power / s.base_power
-                bus_name = load.bus.name if hasattr(load.bus, 'name') else load.bus
-        elif self.load:
-            # fallback for a single Load object
-            bus_name = self.load.bus.name if hasattr(self.load.bus, 'name') else self.load.bus
-            P_spec[bus_name] -= self.load.real_power / s.base_power
-            Q_spec[bus_name] -= self.load.reactive_power / s.base_power
-        
-        # Add generator contributions if available
-        for bus_name, bus in self.circuit.buses.items():
-            if hasattr(bus, 'p_gen'):
-                P_spec[bus_name] += bus.p_gen / s.base_power
-            if hasattr(bus, 'q_gen'):
-                Q_spec[bus_name] += bus.q_gen / s.base_power
-        
-        # Calculate power mismatches
-        # p_mismatch = [P_spec[bus] - self.P[bus] for bus in p_buses]
-        # q_mismatch = [Q_spec[bus] - self.Q[bus] for bus in q_buses]
-
-        #px_value = list(self.calc_Px().values())
-        #qx_value = list(self.calc_Qx().values())
-        #combined = np.concatenate((px_value, qx_value))
-        px = np.array(list(self.calc_Px().values())).reshape(-1, 1)
-        qx = np.array(list(self.calc_Qx().values())).reshape(-1, 1)
-        combined = np.vstack((px, qx)).flatten()
-
-        y_injected = np.zeros(self.y.size)
-        idx = 0
-
-        bus_list = list(self.circuit.buses.values())
-        for k in range(len(combined)):
-            if k < len(self.circuit.buses):
-                bus = bus_list[k]
-                if bus.bus_type != 'Slack Bus':
-                    y_injected[idx] = combined[k]
-                    idx +=1
-            else:
-                bus = bus_list[k-len(self.circuit.buses)]
-                if bus.bus_type != 'Slack Bus' and bus.bus_type != 'PV Bus':
-                    y_injected[idx] = combined[k]
-                    idx+=1
+        # Calculate mismatch between specified and calculated injections.
+        # P and Q are evaluated once and cached on the solution for the caller.
+        if self.pvpq_index is None:
+            self.calc_bus_indices()
+
+        bus_names = list(self.circuit.buses.keys())
+        P, Q = calc_injections(self.circuit.ybus, self.complex_voltage())
+        self.P = dict(zip(bus_names, P))
+        self.Q = dict(zip(bus_names, Q))
+
+        y_injected = np.concatenate((P[self.pvpq_index], Q[self.pq_index]))
 
         # Combine into a single mismatch vector
         mismatch = self.y - y_injected
-                    #for i in enumerate(p_buses)]
-        #[i[0]]
-        
+
         return mismatch
+
+
+def calc_bus_indices(buses):
+    """
+    Positions of the buses whose angle (all except slack) and magnitude (PQ only) are unknowns
+
+    Parameters:
+        buses: Iterable of Bus objects in Y-bus order
+
+    Returns:
+        pvpq_index, pq_index: Integer index arrays
+    """
+    bus_types = [bus.bus_type for bus in buses]
+    pvpq_index = np.array([k for k, bus_type in enumerate(bus_types) if bus_type != 'Slack Bus'], dtype=int)
+    pq_index = np.array([k for k, bus_type in enumerate(bus_types)
+                         if bus_type != 'Slack Bus' and bus_type != 'PV Bus'], dtype=int)
+    return pvpq_index, pq_index
+
+
+def calc_injections(ybus, voltage):
+    """
+    Calculate bus power injections S = V * conj(Ybus @ V)
+
+    Parameters:
+        ybus: Admittance matrix (numpy array, pandas DataFrame or scipy sparse matrix)
+        voltage: Complex bus voltages (per unit) in Y-bus order, either one vector of
+                 shape (N,) or a stack of scenarios of shape (K, N)
+
+    Returns:
+        P, Q: Real and reactive power injection arrays (per unit) shaped like voltage
+    """
+    if isinstance(ybus, pd.DataFrame):
+        ybus = ybus.to_numpy()
+
+    current = (ybus @ voltage.T).T
+    S = voltage * np.conj(current)
+    return S.real, S.imag
@@ -0,0 +1,174 @@
+from bus import Bus
+from circuit import Circuit, assemble_ybus
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+# Symmetrical component operator and transformation matrix [Ia, Ib, Ic] = A @ [I0, I1, I2]
+a = np.exp(2j * np.pi / 3)
+A = np.array([[1, 1, 1],
+              [1, a**2, a],
+              [1, a, a**2]])
+
+FAULT_TYPES = ("LLL", "SLG", "LL", "DLG")
+
+class Solution_Asymmetric_Faults:
+
+    def __init__(self, circuit: Circuit, line_zero_sequence_ratio: float = 3.0):
+        """
+        Unsymmetrical fault studies on factored positive, negative and zero sequence networks
+
+        Modelling shortcuts, since the circuit holds no zero sequence or winding data:
+            - Transmission lines use Z0 = line_zero_sequence_ratio * Z1 (3 by default)
+              for the series impedance; their shunt charging is left unchanged.
+            - Every transformer is treated as wye-grounded / wye-grounded, passing zero
+              sequence current with its positive sequence impedance.
+            - Branches have equal positive and negative sequence impedance, and all
+              pre-fault voltages are 1 pu.
+            - Bus shunts are grounded and have the same admittance in all three
+              sequence networks.
+
+        Parameters:
+            circuit: Circuit with transformers, transmission lines and generators
+            line_zero_sequence_ratio: Transmission line Z0 / Z1 ratio
+        """
+        self.circuit = circuit
+        self.voltage_pu = 1.0  # Pre-fault voltage in per-unit
+        self.line_zero_sequence_ratio = line_zero_sequence_ratio
+
+        if self.circuit.ybus is None:
+            self.circuit.calc_ybus()
+
+        num_buses = len(self.circuit.buses)
+        self.bus_index = self.circuit.bus_index
+
+        y1 = np.zeros(num_buses, dtype=complex)
+        y2 = np.zeros(num_buses, dtype=complex)
+        y0 = np.zeros(num_buses, dtype=complex)
+        for generator in self.circuit.generators.values():
+            k = self.bus_index[generator.bus.name]
+            y1[k] += generator.y_bus_admittance
+            y2[k] += generator.y2
+            y0[k] += generator.y0
+
+        # Passive branches have equal positive and negative sequence impedance
+        network = sparse.csr_matrix(self.circuit.ybus)
+        self.ybus1 = (network + sparse.diags(y1)).tocsc()
+        self.ybus2 = (network + sparse.diags(y2)).tocsc()
+        self.ybus0 = (self.calc_zero_sequence_network() + sparse.diags(y0)).tocsc()
+
+        # Factor each sequence network once
+        self.lu1 = splu(self.ybus1)
+        self.lu2 = splu(self.ybus2)
+        self.lu0 = splu(self.ybus0)
+
+    def calc_zero_sequence_network(self):
+        # Branch network with line series impedance scaled by the zero sequence ratio, plus bus shunts
+        from_index, to_index, yprim = self.circuit.branch_arrays()
+
+        y_series = -yprim[:, 0, 1]
+        y_shunt_from = yprim[:, 0, 0] - y_series
+        y_shunt_to = yprim[:, 1, 1] - y_series
+
+        scale = np.where(self.circuit.branches.is_transformer, 1.0, 1 / self.line_zero_sequence_ratio)
+        y0_series = y_series * scale
+
+        prim = np.empty_like(yprim)
+        prim[:, 0, 0] = y0_series + y_shunt_from
+        prim[:, 1, 1] = y0_series + y_shunt_to
+        prim[:, 0, 1] = -y0_series
+        prim[:, 1, 0] = -y0_series
+
+        ybus0 = assemble_ybus(len(self.circuit.buses), from_index, to_index, prim)
+        if self.circuit.shunts:
+            ybus0 = (ybus0 + sparse.diags(self.circuit.shunt_admittance())).tocsr()
+        return ybus0
+
+    def calc_zbus_columns(self, columns):
+        """
+        Zero, positive and negative sequence Zbus columns for the given bus positions
+
+        Returns:
+            Z0, Z1, Z2: Complex arrays of shape (N, len(columns))
+        """
+        columns = np.asarray(columns, dtype=int)
+        identity_columns = np.zeros((len(self.circuit.buses), len(columns)), dtype=complex)
+        identity_columns[columns, np.arange(len(columns))] = 1.0
+        return self.lu0.solve(identity_columns), self.lu1.solve(identity_columns), self.lu2.solve(identity_columns)
+
+    def calculate_faults(self, buses=None, fault_types=FAULT_TYPES, fault_impedance=0.0):
+        """
+        Sweep fault types over many buses in vectorized form
+
+        Parameters:
+            buses: Buses to fault (Bus objects or names); defaults to every bus
+            fault_types: Any of "LLL", "SLG", "LL" and "DLG"
+            fault_impedance: Fault impedance in per unit
+
+        Returns:
+            results: Dictionary keyed by fault type; each entry holds
+                     sequence_currents (F, 3) as [I0, I1, I2],
+                     phase_currents (F, 3) as [Ia, Ib, Ic] and
+                     phase_voltages (F, N, 3) for every bus during each fault
+        """
+        if buses is None:
+            columns = np.arange(len(self.circuit.buses))
+        else:
+            columns = np.array([self.bus_index[getattr(bus, 'name', bus)] for bus in buses], dtype=int)
+
+        Z0, Z1, Z2 = self.calc_zbus_columns(columns)
+        fault = np.arange(len(columns))
+        z0 = Z0[columns, fault]
+        z1 = Z1[columns, fault]
+        z2 = Z2[columns, fault]
+        zf = fault_impedance
+        vf = self.voltage_pu
+
+        results = dict()
+        for fault_type in fault_types:
+            if fault_type == "LLL":
+                I1 = vf / (z1 + zf)
+                I2 = np.zeros_like(I1)
+                I0 = np.zeros_like(I1)
+            elif fault_type == "SLG":
+                I0 = vf / (z0 + z1 + z2 + 3 * zf)
+                I1 = I0
+                I2 = I0
+            elif fault_type == "LL":
+                I1 = vf / (z1 + z2 + zf)
+                I2 = -I1
+                I0 = np.zeros_like(I1)
+            elif fault_type == "DLG":
+                z0f = z0 + 3 * zf
+                I1 = vf / (z1 + z2 * z0f / (z2 + z0f))
+                I2 = -I1 * z0f / (z0f + z2)
+                I0 = -I1 * z2 / (z0f + z2)
+            else:
+                raise ValueError(f"Unknown fault type: {fault_type}")
+
+            sequence_currents = np.stack((I0, I1, I2), axis=1)
+
+            # Sequence voltages at every bus for each fault location, shape (F, N)
+            V0 = -(Z0 * I0).T
+            V1 = vf - (Z1 * I1).T
+            V2 = -(Z2 * I2).T
+            sequence_voltages = np.stack((V0, V1, V2), axis=2)
+
+            results[fault_type] = {
+                "sequence_currents": sequence_currents,
+                "phase_currents": sequence_currents @ A.T,
+                "phase_voltages": sequence_voltages @ A.T
+            }
+
+        return results
+
+    def calculate_fault(self, bus: Bus, fault_type: str, fault_impedance: float = 0.0):
+        """
+        Single fault study
+
+        Returns:
+            phase_currents: Complex array [Ia, Ib, Ic] at the fault
+            phase_voltages: Complex array (N, 3) of bus phase voltages during the fault
+        """
+        result = self.calculate_faults([bus], (fault_type,), fault_impedance)[fault_type]
+        return result["phase_currents"][0], result["phase_voltages"][0]
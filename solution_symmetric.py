@@ -4,8 +4,13 @@ from settings import s
 from load import Load
 import numpy as np
 import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import splu
 from generator import Generator
 
+# Zbus columns solved per block, so sweeps over many buses need O(N * FAULT_BLOCK_SIZE) working memory
+FAULT_BLOCK_SIZE = 256
+
 class Solution_Faults:
 
     def __init__(self, circuit: Circuit):
@@ -17,28 +22,62 @@ class Solution_Faults:
         if self.circuit.ybus is None:
             self.circuit.calc_ybus()
         
-        # Convert pandas DataFrame to numpy array for calculations
         num_buses = len(self.circuit.buses)
-        self.ybus = np.zeros((num_buses, num_buses), dtype=complex)
+        self.bus_index = self.circuit.bus_index
 
+        # Add generator subtransient admittances to the network Ybus
+        generator_admittance = np.zeros(num_buses, dtype=complex)
+        for gen_name, generator in generators.items():
+            generator_admittance[self.bus_index[generator.bus.name]] += generator.y_bus_admittance
+        self.ybus = (sparse.csr_matrix(self.circuit.ybus) + sparse.diags(generator_admittance)).tocsc()
 
-        # self.ybus[0,0] = self.ybus[0,0] + generators["G1"].y_bus_admittance
-        # self.ybus[6,6] = self.ybus[6,6] + generators["G7"].y_bus_admittance
-        
-        for i in range(num_buses):
-            for j in range(num_buses):
-                self.ybus[i, j] = self.circuit.ybus.iloc[i, j]
+        # Factor the augmented Ybus once; Zbus columns are obtained by solving against it
+        self.lu = splu(self.ybus)
+        self._zbus = None
 
-        # Add generator contributions dynamically, not hardcoded
-        for gen_name, generator in generators.items():
-            if hasattr(generator, 'bus') and hasattr(generator.bus, 'index'):
-                bus_idx = generator.bus.index
-                if 0 <= bus_idx < num_buses:  # Check index is in bounds
-                    if hasattr(generator, 'y_bus_admittance'):
-                        self.ybus[bus_idx, bus_idx] += generator.y_bus_admittance
-        
-        # Calculate Zbus (inverse of Ybus)
-        self.zbus = np.linalg.inv(self.ybus)
+    @property
+    def zbus(self):
+        # Full Zbus, only formed when explicitly requested
+        if self._zbus is None:
+            self._zbus = self.calc_zbus_columns(np.arange(len(self.circuit.buses)))
+        return self._zbus
+
+    def calc_zbus_columns(self, columns):
+        """
+        Selected Zbus columns from the factored Ybus without forming the inverse
+
+        Parameters:
+            columns: Bus positions of the required columns
+
+        Returns:
+            Z: Complex array of shape (N, len(columns))
+        """
+        columns = np.asarray(columns, dtype=int)
+        identity_columns = np.zeros((len(self.circuit.buses), len(columns)), dtype=complex)
+        identity_columns[columns, np.arange(len(columns))] = 1.0
+        return self.lu.solve(identity_columns)
+
+    def _zbus_blocks(self, columns):
+        # (start, Z) for consecutive blocks of at most FAULT_BLOCK_SIZE Zbus columns
+        for start in range(0, len(columns), FAULT_BLOCK_SIZE):
+            yield start, self.calc_zbus_columns(columns[start:start + FAULT_BLOCK_SIZE])
+
+    def calc_zbus_diagonal(self, columns):
+        """
+        Driving point impedances Znn, solved block by block
+
+        Parameters:
+            columns: Bus positions
+
+        Returns:
+            Znn: Complex array (len(columns),)
+        """
+        columns = np.asarray(columns, dtype=int)
+        diagonal = np.empty(len(columns), dtype=complex)
+        for start, Z in self._zbus_blocks(columns):
+            block = columns[start:start + Z.shape[1]]
+            diagonal[start:start + len(block)] = Z[block, np.arange(len(block))]
+        return diagonal
 
     # def calculate_fault_currents(self, bus: Bus):
     #     num_buses = len(self.circuit.buses)
@@ -75,18 +114,43 @@ class Solution_Faults:
         Will overwrite calculate_fault_currents if correct
         """
         
-        # Get the impedance at the fault bus (Znn)
-        Znn = self.zbus[bus.index, bus.index]
-        
-        # Calculate fault current at the selected bus
-        fault_current = self.voltage_pu / Znn
-        
-        # Calculate bus voltages after fault for all buses
-        num_buses = len(self.circuit.buses)
-        bus_voltages_after_fault = np.zeros(num_buses, dtype=complex)
+        fault_currents, bus_voltages_after_fault = self.calculate_fault_currents_all([bus])
         
-        for k in range(num_buses):
-            # Calculate bus voltage after fault for each bus
-            bus_voltages_after_fault[k] = (1 - (self.zbus[k, bus.index] / Znn)) * self.voltage_pu
-        
-        return fault_current, bus_voltages_after_fault
+        return fault_currents[0], bus_voltages_after_fault[0]
+
+    def calculate_fault_currents_all(self, buses=None, fault_impedance=0.0, voltages=True):
+        """
+        Balanced three-phase fault currents and post-fault voltages for many fault locations
+
+        Zbus columns are solved in blocks of FAULT_BLOCK_SIZE. With voltages=False only
+        Znn is kept, so a sweep over every bus of a large case needs O(N) memory.
+
+        Parameters:
+            buses: Buses to fault (Bus objects or names); defaults to every bus
+            fault_impedance: Fault impedance in per unit
+            voltages: Also return the post-fault voltage matrix (F x N)
+
+        Returns:
+            fault_currents: Complex array (F,) of fault currents in per unit
+            bus_voltages_after_fault: Complex array (F, N); row f holds every bus
+                                      voltage for a fault at the f-th bus (None
+                                      when voltages is False)
+        """
+        if buses is None:
+            columns = np.arange(len(self.circuit.buses))
+        else:
+            columns = np.array([self.bus_index[getattr(bus, 'name', bus)] for bus in buses], dtype=int)
+
+        if not voltages:
+            fault_currents = self.voltage_pu / (self.calc_zbus_diagonal(columns) + fault_impedance)
+            return fault_currents, None
+
+        fault_currents = np.empty(len(columns), dtype=complex)
+        bus_voltages_after_fault = np.empty((len(columns), len(self.circuit.buses)), dtype=complex)
+        for start, Z in self._zbus_blocks(columns):
+            block = slice(start, start + Z.shape[1])
+            Znn = Z[columns[block], np.arange(Z.shape[1])] + fault_impedance
+            fault_currents[block] = self.voltage_pu / Znn
+            bus_voltages_after_fault[block] = (1 - Z / Znn).T * self.voltage_pu
+
+        return fault_currents, bus_voltages_after_fault
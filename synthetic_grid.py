@@ -0,0 +1,94 @@
+import numpy as np
+from circuit import Circuit
+
+TOPOLOGIES = ("meshed", "radial")
+
+# Share of its area load that each PV generator adds to cover line losses
+LOSS_ALLOWANCE = 0.03
+
+# Every SLACK_SPACING-th area generator is a slack bus, so loss errors are absorbed regionally
+SLACK_SPACING = 50
+
+def synthetic_grid(num_buses, topology="meshed", mesh_ratio=0.3, generator_fraction=0.1, load_mw=(5.0, 25.0),
+                   seed=0, name=None):
+    """
+    Build a reproducible synthetic test system with the Circuit add_* methods
+
+    The 230 kV network is split into generator areas of consecutive buses. Each
+    area is a random tree whose root connects to a bus of one of the previous
+    four areas, so the network is radial and every branch stays local in bus
+    order (which keeps LU fill-in low, as in real grids). Meshed systems add
+    mesh_ratio extra lines per network bus between nearby buses. Every network
+    bus carries a load at 0.95 power factor. Each area has one generator on a
+    20 kV bus behind a step-up transformer, scheduled at the area load plus
+    LOSS_ALLOWANCE so that little power crosses area borders. The generator of
+    every SLACK_SPACING-th area (starting with the first) is a slack bus.
+
+    Parameters:
+        num_buses: Total number of buses (at least 3)
+        topology: "meshed" or "radial"
+        mesh_ratio: Extra lines per network bus for meshed systems
+        generator_fraction: Fraction of the buses that are generator buses
+        load_mw: (low, high) range of the uniformly drawn bus loads in MW
+        seed: Random seed; equal arguments always give the same circuit
+        name: Circuit name (defaults to "<topology> <num_buses>")
+
+    Returns:
+        circuit: Circuit with buses Bus1..BusN (network buses first), Y-bus not calculated
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology: {topology}")
+    if num_buses < 3:
+        raise ValueError("A synthetic grid needs at least 3 buses")
+
+    rng = np.random.default_rng(seed)
+    num_generators = min(max(1, int(round(num_buses * generator_fraction))), num_buses // 2)
+    num_network = num_buses - num_generators
+    areas = np.array_split(np.arange(num_network), num_generators)
+
+    circuit = Circuit(name or f"{topology} {num_buses}")
+    circuit.add_conductor("C1", 0.642, 0.0217, 0.385, 460)
+    circuit.add_bundle("B1", 2, 1.5, "C1")
+    circuit.add_geometry("G1", 0, 0, 18.5, 0, 37, 0)
+
+    for k in range(num_network):
+        circuit.add_bus(f"Bus{k + 1}", 230)
+        circuit.buses[f"Bus{k + 1}"].bus_type = 'PQ Bus'
+
+    edges = []
+    for a, area in enumerate(areas):
+        if a > 0:
+            previous = areas[int(rng.integers(max(0, a - 4), a))]
+            edges.append((int(rng.choice(previous)), int(area[0])))
+        for k in range(1, len(area)):
+            edges.append((int(area[rng.integers(0, k)]), int(area[k])))
+
+    if topology == "meshed":
+        # Extra lines reach back at most two areas
+        span = 2 * max(len(area) for area in areas)
+        ends = rng.integers(1, num_network, size=int(round(mesh_ratio * num_network)))
+        starts = np.maximum(ends - rng.integers(1, span + 1, size=len(ends)), 0)
+        existing = set(edges)
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if (start, end) not in existing:
+                existing.add((start, end))
+                edges.append((start, end))
+
+    lengths = rng.uniform(5, 30, size=len(edges))
+    for k, (start, end) in enumerate(edges):
+        circuit.add_transmission_line(f"L{k + 1}", f"Bus{start + 1}", f"Bus{end + 1}", "B1", "C1", "G1", lengths[k])
+
+    loads = rng.uniform(load_mw[0], load_mw[1], size=num_network)
+    reactive = loads * np.tan(np.arccos(0.95))
+    for k in range(num_network):
+        circuit.add_load(f"Load{k + 1}", f"Bus{k + 1}", loads[k], reactive[k])
+
+    for g, area in enumerate(areas):
+        bus_name = f"Bus{num_network + g + 1}"
+        mw = loads[area].sum() * (1 + LOSS_ALLOWANCE)
+        circuit.add_bus(bus_name, 20)
+        circuit.buses[bus_name].bus_type = 'Slack Bus' if g % SLACK_SPACING == 0 else 'PV Bus'
+        circuit.add_transformer(f"T{g + 1}", bus_name, f"Bus{rng.choice(area) + 1}", max(100.0, 1.5 * mw), 10.5, 12)
+        circuit.add_generator(f"G{g + 1}", bus_name, 1.0, 0.0 if g % SLACK_SPACING == 0 else mw, 0.12, 0.14, 0.05, 0)
+
+    return circuit
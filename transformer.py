@@ -17,7 +17,8 @@ class Transformer:
         self.rpu_xfmr = float
         self.zpu = self.calc_impedance()
         self.ypu = self.calc_admittance()
-        self.yprim = self.calc_matrix()
+        self.branch_table = None
+        self.branch_row = None
 
     def calc_impedance(self):
         self.zpu = self.impedance_percent / 100*s.base_power / self.power_rating*np.exp(1j * np.arctan(self.x_over_r_ratio))
@@ -52,9 +53,15 @@ class Transformer:
             return 0.0 + 0.0j
 
     def calc_matrix(self):
-        self.yprim = np.array([[self.ypu, -1*self.ypu],
-                            [-1*self.ypu, self.ypu]])
-        return self.yprim
+        return np.array([[self.ypu, -1*self.ypu],
+                         [-1*self.ypu, self.ypu]])
+
+    @property
+    def yprim(self):
+        # Read from the circuit branch table once registered, otherwise build from this element
+        if self.branch_table is not None:
+            return self.branch_table.yprim(self.branch_row)
+        return self.calc_matrix()
 
 if __name__ == '__main__':
     bus1 = Bus("B1", 180)
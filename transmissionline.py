@@ -3,6 +3,7 @@ from bus import Bus
 from conductor import Conductor
 from geometry import Geometry
 from bundle import Bundle
+from line_constants import line_constants
 from settings import s
 
 class TransmissionLine:
@@ -22,11 +23,13 @@ class TransmissionLine:
         self.zpu, self.ypu = self.calc_series()
         self.bpu : float
         self.bpu = self.calc_admittance()
-        self.yprim = self.calc_matrix()
+        self.branch_table = None
+        self.branch_row = None
 
     def calc_series(self):
-        self.rseries = (self.conductor.resistance/self.bundle.num_conductors)*self.length
-        self.xseries = (2 * np.pi * s.frequency) * (2 * 10 ** -7) * np.log(self.geometry.Deq/self.bundle.DSL) * 1609.34 * self.length
+        r_per_mile, x_per_mile, _ = line_constants.get(self.conductor, self.bundle, self.geometry)
+        self.rseries = r_per_mile*self.length
+        self.xseries = x_per_mile*self.length
         z_base = self.bus1.base_kv**2/s.base_power
 
         self.rpu = self.rseries/z_base
@@ -36,16 +39,23 @@ class TransmissionLine:
         return self.zpu, self.ypu
 
     def calc_admittance(self):
-        bshunt = (2 * np.pi * s.frequency) * ((2 * np.pi * 8.854 * 10 ** -12)/(np.log(self.geometry.Deq/self.bundle.DSC))) * 1609.34 * self.length
+        _, _, b_per_mile = line_constants.get(self.conductor, self.bundle, self.geometry)
+        bshunt = b_per_mile * self.length
         y_base = s.base_power/self.bus1.base_kv**2
         self.bpu = bshunt/ y_base
         return self.bpu
 
     def calc_matrix(self):
         yshunt = 1j * self.bpu
-        self.yprim = np.array([[self.ypu + yshunt/2, -1*self.ypu],
-                            [-1*self.ypu, self.ypu + yshunt/2]])
-        return self.yprim
+        return np.array([[self.ypu + yshunt/2, -1*self.ypu],
+                         [-1*self.ypu, self.ypu + yshunt/2]])
+
+    @property
+    def yprim(self):
+        # Read from the circuit branch table once registered, otherwise build from this element
+        if self.branch_table is not None:
+            return self.branch_table.yprim(self.branch_row)
+        return self.calc_matrix()
 
 if __name__ == '__main__':
     bus1 = Bus("Bus_1", 230)